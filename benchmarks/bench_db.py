@@ -0,0 +1,136 @@
+# Throughput sweep for the two DB write paths, against the local PostgREST stand-in.
+#
+#   python benchmarks/bench_db.py [--rows 5000] [--chunk-sizes 50 100 250 500] [--concurrency 1 2 4 8]
+#   python benchmarks/bench_db.py --latency 0.05 --latency-per-row 0.0002 --connections 4 --json sweep.json
+#
+# upload      upload_players' ChunkUploader: chunk size x requests in flight
+# write-back  the scrapers' BatchWriter: batch size x scraping workers feeding it
+#
+# Every request goes through the real Supabase client over HTTP to a stand-in
+# with injected per-request and per-row latency (and optionally failures and a
+# connection cap), so the numbers move the way a real project's would when the
+# knobs change. Each cell checks that every row arrived.
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from supabase import create_client
+import upload_players
+from uploader import ChunkUploader
+from db_writer import BatchWriter
+from postgrest_stub import PostgrestStub
+from bench_records import make_roster
+
+
+def stand_in(args):
+    return PostgrestStub(fail_rate=args.fail_rate, seed=1, latency=args.latency,
+                         latency_per_row=args.latency_per_row, connections=args.connections)
+
+
+def run_upload(args, roster_path, chunk_size, concurrency):
+    with stand_in(args) as stub:
+        client = create_client(stub.url, 'stub-key')
+        start = time.perf_counter()
+        uploader = ChunkUploader(client, 'players', max_in_flight=concurrency, max_rows=chunk_size,
+                                 max_bytes=upload_players.UPLOAD_CHUNK_BYTES, retries=8, backoff=0.05)
+        for records in upload_players.iter_record_batches(roster_path):
+            uploader.submit(records)
+        uploader.close()
+        elapsed = time.perf_counter() - start
+        ok = len(stub.rows('players')) == args.rows and not uploader.failed
+        return {'seconds': elapsed, 'rows_per_sec': args.rows / elapsed, 'requests': stub.requests, 'ok': ok}
+
+
+def run_write_back(args, batch_size, workers):
+    # workers threads each report form for their share of the roster, like a scraping run
+    with stand_in(args) as stub:
+        stub.load('players', [{'list_sr_no': i} for i in range(1, args.rows + 1)])
+        client = create_client(stub.url, 'stub-key')
+        start = time.perf_counter()
+        writer = BatchWriter(client, batch_size=batch_size, flush_interval=1.0)
+
+        def scrape(first):
+            for pid in range(first, args.rows + 1, workers):
+                writer.put(pid, {'batting_form': ['12', '40*'], 'bowling_form': ['1/20']})
+
+        threads = [threading.Thread(target=scrape, args=(i + 1,)) for i in range(workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        failures = writer.close()
+        elapsed = time.perf_counter() - start
+        written = sum(1 for row in stub.rows('players') if row.get('batting_form'))
+        ok = written == args.rows and not failures
+        return {'seconds': elapsed, 'rows_per_sec': args.rows / elapsed, 'requests': stub.requests, 'ok': ok}
+
+
+def print_grid(title, row_label, col_label, rows, cols, results):
+    print(f"\n{title}: rows/s ({row_label} down, {col_label} across)")
+    print(f"{'':>10}" + ''.join(f"{c:>12}" for c in cols))
+    for r in rows:
+        cells = []
+        for c in cols:
+            res = results[(r, c)]
+            cells.append(f"{res['rows_per_sec']:>11.0f}{'' if res['ok'] else '!'}")
+        print(f"{r:>10}" + ''.join(f"{cell:>12}" for cell in cells))
+    best = max(results.items(), key=lambda kv: kv[1]['rows_per_sec'] if kv[1]['ok'] else 0)
+    print(f"Best: {row_label}={best[0][0]} {col_label}={best[0][1]} "
+          f"({best[1]['rows_per_sec']:.0f} rows/s, {best[1]['requests']} requests)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[50, 100, 250, 500],
+                        help="Upload chunk sizes and write-back batch sizes to try")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help="Upload requests in flight and write-back scraping workers to try")
+    parser.add_argument('--latency', type=float, default=0.03, help="Stand-in seconds per request")
+    parser.add_argument('--latency-per-row', type=float, default=0.0001, help="Stand-in seconds per row")
+    parser.add_argument('--connections', type=int, help="Requests the stand-in serves at once")
+    parser.add_argument('--fail-rate', type=float, default=0.0)
+    parser.add_argument('--paths', nargs='+', choices=['upload', 'write-back'], default=['upload', 'write-back'])
+    parser.add_argument('--json', help="Also write every cell as JSON")
+    args = parser.parse_args()
+
+    report = {'settings': vars(args), 'upload': [], 'write_back': []}
+    with tempfile.TemporaryDirectory() as tmp:
+        roster_path = os.path.join(tmp, 'roster.csv')
+        make_roster(roster_path, args.rows)
+
+        if 'upload' in args.paths:
+            results = {}
+            for size in args.chunk_sizes:
+                for conc in args.concurrency:
+                    results[(size, conc)] = run_upload(args, roster_path, size, conc)
+                    report['upload'].append({'chunk_size': size, 'concurrency': conc, **results[(size, conc)]})
+            print_grid("Upload", 'chunk', 'in flight', args.chunk_sizes, args.concurrency, results)
+
+        if 'write-back' in args.paths:
+            results = {}
+            for size in args.chunk_sizes:
+                for workers in args.concurrency:
+                    results[(size, workers)] = run_write_back(args, size, workers)
+                    report['write_back'].append({'batch_size': size, 'workers': workers, **results[(size, workers)]})
+            print_grid("Write-back", 'batch', 'workers', args.chunk_sizes, args.concurrency, results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if not all(cell['ok'] for cell in report['upload'] + report['write_back']):
+        print("\nCells marked ! lost rows.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
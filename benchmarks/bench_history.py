@@ -0,0 +1,99 @@
+# Build a synthetic multi-year history and time the store's write, compaction
+# and range-query paths against scanning the same history kept as JSON lines.
+#
+#   python benchmarks/bench_history.py [--players 2000] [--days 730] [--queries 50]
+#
+# Every day snapshots every player, as the daily valuation run does. The JSON
+# baseline is one line per player per day, read back in full for each query,
+# which is what keeping history as JSON blobs in a table or file amounts to.
+
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scraper'))
+
+import numpy as np
+import history_store
+from history_store import HistoryStore
+
+
+def make_day(players, rnd):
+    records = np.zeros(players, dtype=history_store.SNAPSHOT_DTYPE)
+    records['list_sr_no'] = np.arange(1, players + 1)
+    records['price'] = rnd.uniform(20, 400, players)
+    records['momentum'] = rnd.normal(0, 0.3, players)
+    records['volatility'] = rnd.uniform(0, 1.5, players)
+    records['batting_runs'] = rnd.integers(-1, 120, (players, history_store.MAX_SCORES))
+    records['bowling_wickets'] = rnd.integers(-1, 5, (players, history_store.MAX_SCORES))
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--players', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=730)
+    parser.add_argument('--queries', type=int, default=50, help="Random player/range queries to time")
+    parser.add_argument('--json-days', type=int, default=60, help="Days written to the JSON baseline (it is slow)")
+    args = parser.parse_args()
+
+    rnd = np.random.default_rng(1)
+    first = datetime.date.today() - datetime.timedelta(days=args.days)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(os.path.join(tmp, 'history'))
+        json_path = os.path.join(tmp, 'history.jsonl')
+
+        start = time.perf_counter()
+        for i in range(args.days):
+            store.append(make_day(args.players, rnd), first + datetime.timedelta(days=i))
+        appended = time.perf_counter() - start
+        print(f"Append: {args.days} days x {args.players} players in {appended:.2f}s "
+              f"({appended / args.days * 1000:.1f} ms/day)")
+
+        start = time.perf_counter()
+        months = store.compact(first + datetime.timedelta(days=args.days))
+        print(f"Compact: {months} months in {time.perf_counter() - start:.2f}s")
+        store.stats()
+
+        picks = random.Random(2)
+        queries = []
+        for _ in range(args.queries):
+            a = picks.randrange(args.days)
+            b = min(args.days - 1, a + picks.randrange(30, 365))
+            queries.append((picks.randint(1, args.players), first + datetime.timedelta(days=a),
+                            first + datetime.timedelta(days=b)))
+
+        start = time.perf_counter()
+        found = sum(len(store.query(pid, a, b)) for pid, a, b in queries)
+        elapsed = time.perf_counter() - start
+        print(f"Query: {args.queries} player ranges in {elapsed:.3f}s "
+              f"({elapsed / args.queries * 1000:.2f} ms each, {found} snapshots)")
+
+        start = time.perf_counter()
+        full = store.query(1)
+        print(f"Full history of one player: {len(full)} days in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        # JSON-lines baseline over a shorter span, scaled per day scanned
+        days = min(args.json_days, args.days)
+        with open(json_path, 'w', encoding='utf-8') as f:
+            for i in range(days):
+                day = (first + datetime.timedelta(days=i)).isoformat()
+                for snap in make_day(args.players, rnd):
+                    f.write(json.dumps({'list_sr_no': int(snap['list_sr_no']), 'day': day,
+                                        'price': float(snap['price']), 'batting_runs': snap['batting_runs'].tolist()}) + '\n')
+        start = time.perf_counter()
+        with open(json_path, encoding='utf-8') as f:
+            hits = [row for row in map(json.loads, f) if row['list_sr_no'] == 1]
+        scan = time.perf_counter() - start
+        print(f"JSON scan baseline: one player over {days} days in {scan * 1000:.0f} ms "
+              f"({len(hits)} rows; ~{scan * args.days / days:.1f}s for the full {args.days} days)")
+
+
+if __name__ == "__main__":
+    main()
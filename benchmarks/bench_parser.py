@@ -0,0 +1,327 @@
+# Speed and accuracy benchmark for the roster line parser (scraper/parse_csv_fix.py).
+#
+#   python benchmarks/bench_parser.py [--lines 100000] [--seed 7] [--json report.json]
+#   python benchmarks/bench_parser.py --write-corpus corpus.jsonl   # freeze a corpus
+#   python benchmarks/bench_parser.py --corpus corpus.jsonl --min-accuracy 0.9
+#   python benchmarks/bench_parser.py --check        # output unchanged vs. EQUIVALENCE_CORPUS
+#
+# Lines are generated from ground-truth players using value pools taken from
+# scraper/players.csv, then rendered with the kinds of damage seen in
+# PDF-extracted auction lists. Reports lines/sec overall and per parser branch
+# (comma path vs. malformed path) and field-level accuracy per damage kind.
+# Speeds are also given as a multiple of a bare line.split() over the same
+# lines, which travels between machines better than lines/sec does.
+#
+# EQUIVALENCE_CORPUS holds the data lines of scraper/players.csv plus generated
+# damaged lines, each with the parser's recorded output; --check fails on any
+# line the current parser reads differently. The checked-in file was recorded
+# with the original regex parser (get_part defined as in the current one), so
+# it pins the rewrite to the old behaviour; re-record it with --write-expected
+# only for an intended change in output.
+
+import argparse
+import csv
+import gzip
+import importlib
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scraper'))
+
+from parse_csv_fix import FIELDS, KNOWN_COUNTRIES, KNOWN_TEAMS
+
+EQUIVALENCE_CORPUS = os.path.join(ROOT, 'benchmarks', 'parser_equivalence.jsonl.gz')
+
+# How each ground-truth player is written out. Add new kinds here as the published format drifts.
+#   csv             21 columns as published (Batting Style, Bowling Style, ...)
+#   csv_no_bowling  20 columns with a single Style column, the layout the parser was written for
+#   dropped_field   21 columns with the empty team or 2025 IPL cell missing
+#   no_commas       every field separated by spaces, empty fields gone
+#   partial_commas  "9, 2 AL1 Deepak Hooda India ..." commas only around the first fields
+DAMAGE_KINDS = {
+    'csv': 0.35,
+    'csv_no_bowling': 0.1,
+    'dropped_field': 0.1,
+    'no_commas': 0.3,
+    'partial_commas': 0.15,
+}
+
+BOWLING_STYLES = [
+    "RIGHT ARM Fast", "RIGHT ARM Fast Medium", "RIGHT ARM Off Spin", "RIGHT ARM Leg Spin",
+    "LEFT ARM Slow Orthodox", "LEFT ARM Fast Medium", "RIGHT ARM Medium", "LEFT ARM Fast",
+    "LEFT ARM Slow Unorthodox", "LEFT ARM Medium",
+]
+
+
+def load_pools():
+    # Real names, states and set codes from the published roster
+    with open(os.path.join(ROOT, 'scraper', 'players.csv'), newline='', encoding='utf-8') as f:
+        rows = [r for r in csv.reader(f)][1:]
+    rows = [r for r in rows if len(r) == 21]
+    return {
+        'first': sorted({r[3] for r in rows if r[3]}),
+        'surname': sorted({r[4] for r in rows if r[4]}),
+        'state': sorted({r[6] for r in rows if r[6]}),
+        'set': sorted({r[2] for r in rows if r[2]}),
+        'country': [r[5] for r in rows] + KNOWN_COUNTRIES,
+    }
+
+
+def make_player(rnd, pools, sr_no):
+    # Ground truth in the parser's output schema, plus the bowling style it does not keep
+    def caps(p_missing, hi):
+        return '' if rnd.random() < p_missing else str(rnd.randint(0, hi))
+
+    country = rnd.choice(pools['country'])
+    specialism = rnd.choice(["BATTER", "BOWLER", "ALL-ROUNDER", "WICKETKEEPER"])
+    plays_ipl = rnd.random() < 0.2
+    capped = rnd.random() < 0.3
+    surname = rnd.choice(pools['surname'])
+    return {
+        "List Sr. No.": str(sr_no),
+        "Set No.": str(rnd.randint(1, 60)),
+        "2026 Set": rnd.choice(pools['set']),
+        "First Name": rnd.choice(pools['first']),
+        "Surname": surname,
+        "Country": country,
+        "State Assoc": rnd.choice(pools['state']) if country == "India" and rnd.random() < 0.9 else '',
+        "DOB": f"{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/{rnd.randint(1985, 2007)}",
+        "Age": str(rnd.randint(18, 40)),
+        "Specialism": specialism,
+        "Style": rnd.choice(["RHB", "RHB", "LHB"]),
+        "Bowling Style": '' if specialism in ("BATTER", "WICKETKEEPER") and rnd.random() < 0.8 else rnd.choice(BOWLING_STYLES),
+        "Test caps": caps(0.6 if not capped else 0.1, 100),
+        "ODI caps": caps(0.5 if not capped else 0.1, 200),
+        "T20 caps": caps(0.4 if not capped else 0.1, 150),
+        "IPL": caps(0.3, 150),
+        "2025 Team": rnd.choice(KNOWN_TEAMS) if plays_ipl else '',
+        "2025 IPL": str(rnd.randint(0, 14)) if plays_ipl else '',
+        "C/U/A": "Capped" if capped else "Uncapped",
+        "Reserve Price": rnd.choice(["30", "30", "40", "50", "75", "100", "150", "200"]),
+        "Surname_End": surname,
+    }
+
+
+def render(player, kind, rnd):
+    fields = [player[k] for k in FIELDS[:11]] + [player["Bowling Style"]] + [player[k] for k in FIELDS[11:]]
+    if kind == 'csv':
+        return ','.join(fields)
+    if kind == 'csv_no_bowling':
+        return ','.join(fields[:11] + fields[12:])
+    if kind == 'dropped_field':
+        # Drop an empty team / 2025 IPL cell if there is one, else an empty cap cell
+        empties = [i for i in (16, 17, 12, 13, 14, 15) if not fields[i]]
+        if empties:
+            del fields[empties[0]]
+        return ','.join(fields)
+    words = [f for f in fields if f]
+    if kind == 'no_commas':
+        return ' '.join(words)
+    if kind == 'partial_commas':
+        n = rnd.randint(1, 3)
+        return ', '.join(words[:n]) + ' ' + ' '.join(words[n:])
+    raise ValueError(f"unknown damage kind: {kind}")
+
+
+def generate(n, seed):
+    rnd = random.Random(seed)
+    pools = load_pools()
+    kinds = list(DAMAGE_KINDS)
+    weights = list(DAMAGE_KINDS.values())
+    corpus = []
+    for i in range(1, n + 1):
+        player = make_player(rnd, pools, i)
+        kind = rnd.choices(kinds, weights)[0]
+        truth = {k: player[k] for k in FIELDS}
+        corpus.append({"kind": kind, "line": render(player, kind, rnd), "truth": truth})
+    return corpus
+
+
+def load_parser(spec):
+    module, _, func = spec.partition(':')
+    return getattr(importlib.import_module(module), func or 'parse_line_full')
+
+
+def time_lines(parse, lines, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            parse(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def roster_lines():
+    with open(os.path.join(ROOT, 'scraper', 'players.csv'), encoding='utf-8') as f:
+        return [line.strip() for line in f][1:]
+
+
+def write_expected(path, parse, lines, seed):
+    # The roster's own lines plus generated ones, each with what parse makes of it (rows as FIELDS lists)
+    cases = [{"kind": 'roster', "line": line} for line in roster_lines() if line]
+    cases += [{"kind": c["kind"], "line": c["line"]} for c in generate(lines, seed)]
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        for case in cases:
+            parsed = parse(case["line"])
+            case["expected"] = [parsed[field] for field in FIELDS] if parsed else None
+            f.write(json.dumps(case, ensure_ascii=False) + '\n')
+    print(f"Recorded {len(cases)} lines to {path}")
+
+
+def check(path, parse, show=10):
+    # Lines whose parse differs from the recorded output
+    mismatches = 0
+    total = 0
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for row in f:
+            case = json.loads(row)
+            total += 1
+            parsed = parse(case["line"])
+            got = [parsed[field] for field in FIELDS] if parsed else None
+            if got == case["expected"]:
+                continue
+            mismatches += 1
+            if mismatches <= show:
+                print(f"Mismatch ({case['kind']}): {case['line']}")
+                if got is None or case["expected"] is None:
+                    print(f"  expected {case['expected']}\n  got      {got}")
+                else:
+                    for field, want, have in zip(FIELDS, case["expected"], got):
+                        if want != have:
+                            print(f"  {field}: expected {want!r}, got {have!r}")
+    print(f"{total - mismatches} of {total} lines identical to {path}")
+    return mismatches
+
+
+def run(corpus, parse, repeat):
+    lines = [c["line"] for c in corpus]
+    report = {"lines": len(lines), "branches": {}, "accuracy": {}}
+    split = time_lines(str.split, lines, repeat)
+
+    # The parser takes its comma path for lines with more than 15 commas
+    branches = {
+        'comma': [l for l in lines if l.count(',') > 15],
+        'malformed': [l for l in lines if l.count(',') <= 15],
+    }
+    total = time_lines(parse, lines, repeat)
+    report["lines_per_sec"] = len(lines) / total if total else 0.0
+    report["split_us_per_line"] = split / len(lines) * 1e6 if lines else 0.0
+    for name, group in branches.items():
+        elapsed = time_lines(parse, group, repeat) if group else 0.0
+        report["branches"][name] = {
+            "lines": len(group),
+            "lines_per_sec": len(group) / elapsed if elapsed else 0.0,
+            "us_per_line": elapsed / len(group) * 1e6 if group else 0.0,
+            "x_split": elapsed / len(group) * 1e6 / report["split_us_per_line"] if group and split else 0.0,
+        }
+
+    # Field-level accuracy, overall and per damage kind
+    correct = defaultdict(Counter)
+    totals = Counter()
+    exact = Counter()
+    unparsed = Counter()
+    for case in corpus:
+        kind = case["kind"]
+        parsed = parse(case["line"]) or {}
+        if not parsed:
+            unparsed[kind] += 1
+        totals[kind] += 1
+        hits = 0
+        for field in FIELDS:
+            if parsed.get(field, None) == case["truth"][field]:
+                correct[kind][field] += 1
+                hits += 1
+        if hits == len(FIELDS):
+            exact[kind] += 1
+
+    for kind in list(DAMAGE_KINDS) + sorted(set(totals) - set(DAMAGE_KINDS)):
+        n = totals[kind]
+        if not n:
+            continue
+        report["accuracy"][kind] = {
+            "lines": n,
+            "exact_lines": exact[kind] / n,
+            "unparsed": unparsed[kind] / n,
+            "fields": {f: correct[kind][f] / n for f in FIELDS},
+        }
+    n_all = sum(totals.values())
+    report["field_accuracy"] = {f: sum(correct[k][f] for k in totals) / n_all for f in FIELDS}
+    report["overall_accuracy"] = sum(report["field_accuracy"].values()) / len(FIELDS)
+    report["exact_lines"] = sum(exact.values()) / n_all
+    return report
+
+
+def print_report(report):
+    print(f"{report['lines']} lines, {report['lines_per_sec']:.0f} lines/s overall "
+          f"(line.split() alone: {report['split_us_per_line']:.2f} us/line)")
+    for name, b in report["branches"].items():
+        print(f"  {name:<10} {b['lines']:>8} lines  {b['lines_per_sec']:>10.0f} lines/s  {b['us_per_line']:6.2f} us/line"
+              f"  {b['x_split']:5.1f}x split")
+
+    kinds = list(report["accuracy"])
+    print()
+    print(f"{'field':<14}" + ''.join(f"{k[:14]:>16}" for k in kinds) + f"{'all':>10}")
+    for field in FIELDS:
+        row = ''.join(f"{report['accuracy'][k]['fields'][field]:>16.1%}" for k in kinds)
+        print(f"{field:<14}{row}{report['field_accuracy'][field]:>10.1%}")
+    print(f"{'exact lines':<14}" + ''.join(f"{report['accuracy'][k]['exact_lines']:>16.1%}" for k in kinds) + f"{report['exact_lines']:>10.1%}")
+    print(f"{'unparsed':<14}" + ''.join(f"{report['accuracy'][k]['unparsed']:>16.1%}" for k in kinds))
+    print()
+    print(f"Overall field accuracy: {report['overall_accuracy']:.2%}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lines', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--repeat', type=int, default=3, help="Timing runs per measurement (best is kept)")
+    parser.add_argument('--parser', default='parse_csv_fix:parse_line_full', help="module:function to benchmark")
+    parser.add_argument('--corpus', help="Read a frozen corpus (JSON lines) instead of generating one")
+    parser.add_argument('--write-corpus', help="Write the generated corpus as JSON lines and exit")
+    parser.add_argument('--json', help="Also write the report as JSON")
+    parser.add_argument('--min-accuracy', type=float, help="Exit non-zero if overall field accuracy is below this")
+    parser.add_argument('--check', nargs='?', const=EQUIVALENCE_CORPUS, metavar='PATH',
+                        help="Compare the parser's output with a recorded corpus and exit non-zero on any difference")
+    parser.add_argument('--write-expected', metavar='PATH',
+                        help="Record the roster lines plus --lines generated ones with the parser's output, and exit")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(1 if check(args.check, load_parser(args.parser)) else 0)
+    if args.write_expected:
+        write_expected(args.write_expected, load_parser(args.parser), args.lines, args.seed)
+        return
+
+    if args.corpus:
+        with open(args.corpus, encoding='utf-8') as f:
+            corpus = [json.loads(line) for line in f if line.strip()]
+    else:
+        corpus = generate(args.lines, args.seed)
+
+    if args.write_corpus:
+        with open(args.write_corpus, 'w', encoding='utf-8') as f:
+            for case in corpus:
+                f.write(json.dumps(case) + '\n')
+        print(f"Wrote {len(corpus)} lines to {args.write_corpus}")
+        return
+
+    report = run(corpus, load_parser(args.parser), args.repeat)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.min_accuracy is not None and report["overall_accuracy"] < args.min_accuracy:
+        print(f"Accuracy {report['overall_accuracy']:.2%} is below --min-accuracy {args.min_accuracy:.2%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
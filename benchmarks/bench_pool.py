@@ -0,0 +1,91 @@
+# Exercise the browser worker pool against the local stand-in site.
+#
+#   python benchmarks/bench_pool.py [--players 60] [--latency 0.3] [--workers 1 2 4 8] [--budget 600]
+#   python benchmarks/bench_pool.py --site-limit 300 --budget 1200 [--adaptive]
+#
+# A plain HTTP client stands in for Chrome, so this measures the pool itself:
+# wall clock vs. worker count, the request rate the site saw vs. the budget,
+# and driver recycling (every --recycle-every pages, and after injected crashes).
+# --site-limit makes the site answer 429 above that rate; with --adaptive the
+# budget is only a ceiling and the pool has to find the site's rate itself.
+
+import argparse
+import os
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scraper'))
+
+from browser_pool import BrowserPool, DomainBudgets
+from matches_table import extract_scores
+from standin_site import StandinSite
+
+
+class HttpDriver:
+    # The slice of the WebDriver API the pool and extraction use
+    created = 0
+
+    def __init__(self, crash_every=0):
+        HttpDriver.created += 1
+        self.crash_every = crash_every
+        self.current_url = None
+        self.page_source = ''
+        self.gets = 0
+
+    def get(self, url):
+        self.gets += 1
+        if self.crash_every and self.gets % self.crash_every == 0:
+            raise RuntimeError("simulated browser crash")
+        with urllib.request.urlopen(url) as r:
+            self.page_source = r.read().decode('utf-8')
+        self.current_url = url
+
+    def quit(self):
+        pass
+
+
+def run(site, players, workers, budget, recycle_every, crash_every, adaptive=False):
+    HttpDriver.created = 0
+    site.hits.clear()
+    site.throttled = 0
+    scores = {}
+
+    def handle(driver, p):
+        pid = p['list_sr_no']
+        driver.get(f"{site.url}/player/{pid}")
+        driver.get(f"{site.url}/player/{pid}/matches")
+        scores[pid] = extract_scores(driver.page_source)
+
+    budgets = DomainBudgets({'127.0.0.1': budget} if budget else {}, adaptive=adaptive)
+    pool = BrowserPool(lambda: HttpDriver(crash_every), handle, workers=workers, recycle_every=recycle_every, budgets=budgets)
+    start = time.monotonic()
+    failures = pool.run(players)
+    elapsed = time.monotonic() - start
+    print(f"workers={workers:<3} {elapsed:6.2f}s  {len(players) / elapsed * 60:7.0f} players/min  "
+          f"site peak {site.max_rate():6.0f} req/min  429s {site.throttled:<4} drivers started {HttpDriver.created}  failed {len(failures)}")
+    if adaptive:
+        budgets.report()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--players', type=int, default=60)
+    parser.add_argument('--latency', type=float, default=0.3, help="Seconds per page at the stand-in site")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--budget', type=int, default=0, help="Requests/minute allowed for the site (0 = unlimited)")
+    parser.add_argument('--recycle-every', type=int, default=20)
+    parser.add_argument('--crash-every', type=int, default=0, help="Make each driver fail on every Nth page")
+    parser.add_argument('--site-limit', type=float, help="Site answers 429 above this many requests/minute")
+    parser.add_argument('--adaptive', action='store_true', help="Treat --budget as a ceiling and adapt to the site")
+    args = parser.parse_args()
+
+    players = [{'list_sr_no': i, 'first_name': 'Player', 'surname': str(i)} for i in range(1, args.players + 1)]
+    with StandinSite(latency=args.latency, rate_limit=args.site_limit) as site:
+        for workers in args.workers:
+            run(site, players, workers, args.budget, args.recycle_every, args.crash_every, args.adaptive)
+
+
+if __name__ == "__main__":
+    main()
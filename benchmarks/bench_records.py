@@ -0,0 +1,111 @@
+# Compare the legacy iterrows record builder against the vectorized, chunked one.
+#
+#   python benchmarks/bench_records.py [--rows 50000]
+#
+# The synthetic roster is scraper/players.csv repeated until it has --rows rows,
+# with List Sr. No. renumbered so every row is distinct.
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+import upload_players
+
+
+def legacy_build_records(df):
+    # The original upload_players() loop, kept verbatim as the baseline
+    def safe_int(val):
+        if pd.isna(val) or val == '':
+            return None
+        try:
+            return int(float(val))
+        except (ValueError, TypeError):
+            return None
+
+    records = []
+    for index, row in df.iterrows():
+        first_name = str(row['First Name']).strip() if pd.notna(row['First Name']) else ''
+        surname = str(row['Surname']).strip() if pd.notna(row['Surname']) else ''
+        name = f"{first_name} {surname}".strip()
+
+        record = {
+            "list_sr_no": safe_int(row['List Sr. No.']),
+            "set_no": safe_int(row['Set No.']),
+            "set_2026": row['2026 Set'] if pd.notna(row['2026 Set']) else None,
+            "first_name": first_name,
+            "surname": surname,
+            "country": row['Country'] if pd.notna(row['Country']) else None,
+            "state_assoc": row['State Assoc'] if pd.notna(row['State Assoc']) else None,
+            "dob": row['DOB'] if pd.notna(row['DOB']) else None,
+            "age": safe_int(row['Age']),
+            "specialism": row['Specialism'] if pd.notna(row['Specialism']) else None,
+            "batting_style": row['Batting Style'] if pd.notna(row['Batting Style']) else None,
+            "bowling_style": row['Bowling Style'] if pd.notna(row['Bowling Style']) else None,
+            "test_caps": safe_int(row['Test caps']),
+            "odi_caps": safe_int(row['ODI caps']),
+            "t20_caps": safe_int(row['T20 caps']),
+            "ipl": safe_int(row['IPL']),
+            "team_2025": row['2025 Team'] if pd.notna(row['2025 Team']) else None,
+            "ipl_2025": safe_int(row['2025 IPL']),
+            "cua": row['C/U/A'] if pd.notna(row['C/U/A']) else None,
+            "reserve_price": row['Reserve Price'] if pd.notna(row['Reserve Price']) else None,
+            "name": name
+        }
+        records.append(record)
+    return records
+
+
+def make_roster(path, rows):
+    base = pd.read_csv(os.path.join(ROOT, upload_players.CSV_PATH), dtype=str, keep_default_na=False)
+    reps = -(-rows // len(base))
+    df = pd.concat([base] * reps, ignore_index=True).iloc[:rows]
+    df['List Sr. No.'] = [str(i) for i in range(1, rows + 1)]
+    # pandas would write the duplicate header as 'Surname.1'; restore the original header
+    df.columns = list(base.columns[:-1]) + ['Surname']
+    df.to_csv(path, index=False)
+
+
+def measure(label, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<12} {count:>8} rows  {elapsed:8.3f}s  {count / elapsed:>10.0f} rows/s  peak {peak / 2**20:7.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--chunk-rows', type=int, default=upload_players.CSV_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    # Both builders must agree on the real roster before timing anything
+    real = pd.read_csv(os.path.join(ROOT, upload_players.CSV_PATH))
+    if legacy_build_records(real) != upload_players.build_records(real):
+        print("Mismatch between legacy and vectorized records on players.csv")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'roster.csv')
+        make_roster(path, args.rows)
+
+        # Legacy path: whole file in memory, iterrows, full record list
+        measure('legacy', lambda: len(legacy_build_records(pd.read_csv(path))))
+
+        # New path: chunked read, records released once each batch is consumed
+        def streaming():
+            return sum(len(batch) for batch in upload_players.iter_record_batches(path, args.chunk_rows))
+        measure('vectorized', streaming)
+
+
+if __name__ == "__main__":
+    main()
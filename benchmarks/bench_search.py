@@ -0,0 +1,89 @@
+# Build the autocomplete index over a large synthetic roster and time lookups
+# against the substring scan the search route used to make the database do.
+#
+#   python benchmarks/bench_search.py [--rows 50000] [--queries 2000]
+#
+# The roster is scraper/players.csv repeated (see bench_records.make_roster), with
+# each copy's names suffixed so they stay distinct. Queries are prefixes, surnames
+# and one-letter typos of random players' names, the way people type them.
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import upload_players
+import search_index
+from bench_records import make_roster
+
+
+def make_queries(records, n, seed=1):
+    rnd = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        record = rnd.choice(records)
+        name = record['name']
+        kind = rnd.randrange(3)
+        if kind == 0:
+            queries.append(name[:rnd.randint(2, len(name))])
+        elif kind == 1:
+            queries.append(record['surname'] or name)
+        else:
+            i = rnd.randrange(len(name))
+            queries.append(name[:i] + rnd.choice('aeiou') + name[i + 1:])
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        roster = os.path.join(tmp, 'roster.csv')
+        make_roster(roster, args.rows)
+        records = [r for batch in upload_players.iter_record_batches(roster) for r in batch]
+        for r in records:
+            # Repeated copies of the CSV get distinct names
+            suffix = f" {r['list_sr_no'] // 350}" if r['list_sr_no'] > 350 else ''
+            r['surname'] = f"{r['surname']}{suffix}"
+            r['name'] = f"{r['name']}{suffix}"
+
+        start = time.perf_counter()
+        index = search_index.build_index(records, aliases={})
+        built = time.perf_counter() - start
+        path = os.path.join(tmp, 'search_index.json')
+        search_index.write_index(index, path)
+        start = time.perf_counter()
+        with open(path, encoding='utf-8') as f:
+            index = json.load(f)
+        loaded = time.perf_counter() - start
+        print(f"Build {built:.2f}s, load {loaded * 1000:.0f} ms")
+
+        queries = make_queries(records, args.queries)
+        start = time.perf_counter()
+        hits = sum(1 for q in queries if search_index.search(index, q))
+        indexed = time.perf_counter() - start
+        print(f"Index: {args.queries} queries in {indexed * 1000:.0f} ms "
+              f"({indexed / args.queries * 1e6:.0f} us each, {hits} with results)")
+
+        names = [r['name'].lower() for r in records]
+        start = time.perf_counter()
+        hits = 0
+        for q in queries:
+            term = q.lower()
+            hits += any(term in name for name in names)
+        scanned = time.perf_counter() - start
+        print(f"Substring scan: {args.queries} queries in {scanned * 1000:.0f} ms "
+              f"({scanned / args.queries * 1e6:.0f} us each, {hits} with results)")
+
+
+if __name__ == "__main__":
+    main()
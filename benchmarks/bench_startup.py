@@ -0,0 +1,57 @@
+# Cold-start time of the playerstock commands: each command line is run as a
+# fresh interpreter several times and the median wall time reported, next to an
+# interpreter that only imports what every script used to load up front
+# (pandas, the Supabase client, undetected_chromedriver and selenium's waits).
+#
+#   python benchmarks/bench_startup.py [--repeat 5]
+#
+# Supabase variables are removed from the environment, so the --dry-run
+# commands also show that none of them needs the network.
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EAGER_IMPORTS = ("import sys; sys.path.insert(0, 'scraper'); "
+                 "import pandas, supabase, undetected_chromedriver, selenium.webdriver.support.ui")
+
+COMMANDS = [
+    ('python (empty)', ['-c', 'pass']),
+    ('eager imports', ['-c', EAGER_IMPORTS]),
+    ('playerstock -h', ['playerstock.py', '-h']),
+    ('parse --dry-run', ['playerstock.py', 'parse', '--dry-run']),
+    ('upload --dry-run', ['playerstock.py', 'upload', '--dry-run']),
+    ('form --dry-run', ['playerstock.py', 'form', '--dry-run']),
+    ('news --dry-run', ['playerstock.py', 'news', '--dry-run']),
+    ('valuate --dry-run', ['playerstock.py', 'valuate', '--dry-run']),
+    ('valuate -h', ['playerstock.py', 'valuate', '-h']),
+]
+
+
+def time_command(args, repeat, env):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    env = {k: v for k, v in os.environ.items() if not k.startswith(('SUPABASE_', 'NEXT_PUBLIC_SUPABASE_'))}
+    for label, command in COMMANDS:
+        print(f"{label:<20} {time_command(command, args.repeat, env) * 1000:>7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Run the concurrent chunk uploader against the local PostgREST stand-in.
+#
+#   python benchmarks/bench_upload.py [--rows 20000] [--concurrency 8] [--fail-rate 0.1]
+#
+# Uploads a synthetic roster through the real Supabase client, with injected
+# 503s, then checks every row arrived exactly once.
+
+import argparse
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from supabase import create_client
+import upload_players
+from uploader import ChunkUploader
+from postgrest_stub import PostgrestStub
+from bench_records import make_roster
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--concurrency', type=int, default=upload_players.UPLOAD_CONCURRENCY)
+    parser.add_argument('--chunk-size', type=int, default=upload_players.UPLOAD_CHUNK_SIZE)
+    parser.add_argument('--chunk-bytes', type=int, default=upload_players.UPLOAD_CHUNK_BYTES)
+    parser.add_argument('--fail-rate', type=float, default=0.1)
+    parser.add_argument('--max-body-bytes', type=int, default=None, help="Make the stand-in reject larger requests with 413")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            PostgrestStub(fail_rate=args.fail_rate, max_body_bytes=args.max_body_bytes, seed=1) as stub:
+        path = os.path.join(tmp, 'roster.csv')
+        make_roster(path, args.rows)
+
+        client = create_client(stub.url, 'stub-key')
+        uploader = ChunkUploader(client, 'players', max_in_flight=args.concurrency, max_rows=args.chunk_size,
+                                 max_bytes=args.chunk_bytes, retries=8, backoff=0.05)
+        for records in upload_players.iter_record_batches(path):
+            uploader.submit(records)
+        uploader.close()
+
+        stored = stub.rows('players')
+        print(f"Stand-in: {stub.requests} requests, {stub.injected_failures} injected failures, {len(stored)} rows stored.")
+        if len(stored) != args.rows or uploader.failed:
+            print("Row count mismatch or failed chunks.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
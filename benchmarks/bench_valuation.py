@@ -0,0 +1,100 @@
+# Time the valuation engine over a synthetic roster, and optionally a full
+# load -> value -> write round trip against the local PostgREST stand-in.
+#
+#   python benchmarks/bench_valuation.py [--players 5000] [--repeat 5] [--raw-share 0.2] [--round-trip]
+#
+# Players get random caps, reserve prices from the auction slabs and up to ten
+# innings of each discipline; --raw-share of them only have the raw form strings,
+# like rows scraped before the typed columns existed, so the fallback parse is timed too.
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scraper'))
+
+import valuation
+from form_records import typed_form
+
+SLABS = ['30', '50', '75', '100', '125', '150', '200', None]
+
+
+def make_players(n, raw_share, seed=1):
+    rnd = random.Random(seed)
+    players = []
+    for pid in range(1, n + 1):
+        bat = [f"{rnd.randint(0, 120)}{'*' if rnd.random() < 0.15 else ''}" if rnd.random() < 0.9 else 'DNB'
+               for _ in range(rnd.randint(0, 10))]
+        bowl = [f"{rnd.randint(0, 5)}/{rnd.randint(5, 60)}" if rnd.random() < 0.8 else '-'
+                for _ in range(rnd.randint(0, 10))]
+        row = {
+            'list_sr_no': pid,
+            'reserve_price': rnd.choice(SLABS),
+            'test_caps': rnd.choice([None, 0, rnd.randint(0, 150)]),
+            'odi_caps': rnd.choice([None, rnd.randint(0, 250)]),
+            't20_caps': rnd.randint(0, 120),
+            'ipl': rnd.randint(0, 250),
+            'batting_form': bat or None,
+            'bowling_form': bowl or None,
+        }
+        if rnd.random() >= raw_share:
+            row.update(typed_form(bat, bowl))
+        players.append(row)
+    return players
+
+
+def time_compute(players, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = valuation.valuate(players)
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def round_trip(players):
+    from supabase import create_client
+    from postgrest_stub import PostgrestStub
+
+    with PostgrestStub(latency=0.03, latency_per_row=0.0001) as stub:
+        stub.load('players', players)
+        client = create_client(stub.url, 'stub-key')
+        start = time.perf_counter()
+        rows = valuation.load_roster(client)
+        loaded = time.perf_counter()
+        results = valuation.valuate(rows)
+        valued = time.perf_counter()
+        valuation.write(client, results)
+        written = time.perf_counter()
+        priced = sum(1 for row in stub.rows('players') if row.get('price') is not None)
+    print(f"Round trip: load {loaded - start:.2f}s, compute {valued - loaded:.3f}s, "
+          f"write {written - valued:.2f}s ({stub.requests} requests, {priced}/{len(players)} priced)")
+    return priced == len(players)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--players', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--raw-share', type=float, default=0.2, help="Share of players without typed form columns")
+    parser.add_argument('--round-trip', action='store_true', help="Also load and write through the PostgREST stand-in")
+    args = parser.parse_args()
+
+    players = make_players(args.players, args.raw_share)
+    seconds, results = time_compute(players, args.repeat)
+    print(f"Valued {len(results)} players in {seconds * 1000:.1f} ms "
+          f"(best of {args.repeat}, {len(results) / seconds:,.0f} players/s)")
+
+    typed_only = [row for row in players if 'batting_runs' in row or 'bowling_wickets' in row]
+    seconds, _ = time_compute(typed_only, args.repeat)
+    print(f"Typed-only subset: {len(typed_only)} players in {seconds * 1000:.1f} ms")
+
+    if args.round_trip and not round_trip(players):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# Local HTTP stand-in for the sites the scrapers visit, for offline benchmarks.
+#
+#   /player/<id>           profile page
+#   /player/<id>/matches   Recent Matches table (Bat / Bowl columns)
+#   /search?q=...          search results page linking to a profile
+#
+# latency adds a fixed delay per response; every request's arrival time is
+# recorded so a benchmark can check the rate the site actually saw. With
+# rate_limit (requests/minute over a sliding 10 s window) requests above the
+# limit get a 429 with Retry-After, like a throttling site.
+
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+
+def matches_page(player_id, rows=12):
+    rnd = random.Random(player_id)
+    body = ''.join(
+        f"<tr><td>{rnd.randint(0, 120)}{'*' if rnd.random() < 0.2 else ''}</td>"
+        f"<td>Match {i}</td><td>{rnd.randint(0, 4)}/{rnd.randint(10, 60)}</td></tr>"
+        for i in range(rows)
+    )
+    return (
+        "<html><body><span>Recent Matches - Player</span>"
+        "<table><thead><tr><th>Bat</th><th>Match</th><th>Bowl</th></tr></thead>"
+        f"<tbody>{body}</tbody></table></body></html>"
+    )
+
+
+class StandinSite:
+    def __init__(self, latency=0.0, host='127.0.0.1', port=0, rate_limit=None, retry_after=2):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.throttled = 0
+        self.hits = []  # (monotonic time, path)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.site = self
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, name='standin-site', daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def record(self, path):
+        # Returns False when the request is over the rate limit
+        now = time.monotonic()
+        with self._lock:
+            if self.rate_limit:
+                recent = sum(1 for t, _ in self.hits[-int(self.rate_limit) - 1:] if t > now - 10.0)
+                if recent >= self.rate_limit / 6.0:
+                    self.throttled += 1
+                    return False
+            self.hits.append((now, path))
+            return True
+
+    def max_rate(self, window=10.0):
+        # Highest number of requests seen in any window, scaled to per minute
+        with self._lock:
+            times = sorted(t for t, _ in self.hits)
+        best = 0
+        j = 0
+        for i, t in enumerate(times):
+            while times[j] < t - window:
+                j += 1
+            best = max(best, i - j + 1)
+        return best * 60.0 / window
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        site = self.server.site
+        if not site.record(self.path):
+            self.send_response(429)
+            self.send_header('Retry-After', str(site.retry_after))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if site.latency:
+            time.sleep(site.latency)
+
+        parts = urlsplit(self.path)
+        segments = [s for s in parts.path.split('/') if s]
+        if segments[:1] == ['player'] and len(segments) >= 2 and segments[1].isdigit():
+            pid = int(segments[1])
+            if segments[2:] == ['matches']:
+                html = matches_page(pid)
+            else:
+                html = f"<html><body><h1>Player {pid}</h1></body></html>"
+        elif segments == ['search']:
+            q = parse_qs(parts.query).get('q', [''])[0]
+            html = f"<html><body><div id='rso'><a href='/player/1'><h3>{q}</h3></a></div></body></html>"
+        else:
+            self.send_error(404)
+            return
+
+        body = html.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
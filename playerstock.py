@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+import argparse
+import importlib
+import os
+import sys
+
+# One command for the whole pipeline. Each subcommand is a module's main(argv),
+# imported only once the subcommand is known, so `playerstock.py -h` and the
+# local commands never load pandas, selenium or the Supabase client, and each
+# command only loads what it uses. Everything after the subcommand goes to it:
+#
+#   python playerstock.py upload --delta
+#   python playerstock.py form --workers 2 --dry-run
+#   python playerstock.py valuate -h
+#
+# The scripts still run on their own (python scraper/valuation.py ...).
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# name -> (module whose main(argv) runs it, help)
+COMMANDS = {
+    'parse': ('parse_csv_fix', "Repair the PDF-extracted auction list into a CSV"),
+    'upload': ('upload_players', "Upload the roster CSV to the players table"),
+    'form': ('form', "Scrape recent batting and bowling form"),
+    'news': ('news', "Scrape recent news headlines"),
+    'crawl': ('crawl', "Scrape form and news in one pass"),
+    'valuate': ('valuation', "Price every player and add the day to the history store"),
+    'stats': ('stats_docs', "Precompute the /api/stats documents"),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='playerstock', description="Player-as-a-stock data pipeline.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n" + '\n'.join(f"  {name:<9} {help}" for name, (_, help) in COMMANDS.items()) +
+               "\n\nRun 'playerstock.py COMMAND -h' for a command's options.")
+    parser.add_argument('command', nargs='?', choices=COMMANDS, metavar='COMMAND', help="One of the commands below")
+    parser.add_argument('args', nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+
+    module, _ = COMMANDS[args.command]
+    sys.path.insert(0, os.path.join(ROOT, 'scraper'))
+    sys.path.insert(0, ROOT)
+    # Subcommand help and errors read 'playerstock COMMAND'
+    sys.argv[0] = f"playerstock {args.command}"
+    importlib.import_module(module).main(argv=args.args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
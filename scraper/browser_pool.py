@@ -0,0 +1,346 @@
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+import run_metrics
+
+# Runs a per-player function over a shared queue with N browser workers.
+# Each worker owns one driver; every driver.get() first takes a token from the
+# budget for that URL's domain, so the combined request rate of all workers
+# stays inside the configured limits. A worker throws its driver away and
+# starts a fresh one after an error or after recycle_every pages.
+#
+# With adaptive budgets the configured numbers are ceilings: each domain starts
+# at half its ceiling, creeps up while pages come back quickly and cleanly, slows
+# down when responses get slower than usual, and drops hard on errors, 429s and
+# block pages (holding off entirely for Retry-After or BLOCK_COOLDOWN seconds).
+
+# Requests per minute allowed per domain, across all workers.
+# Domains match the hostname and its subdomains.
+DEFAULT_BUDGETS = {
+    "google.com": 12,
+    "espncricinfo.com": 20,
+}
+
+# Adaptive rate tuning
+FLOOR_FRACTION = 0.05     # never below this share of the ceiling
+INCREASE_FRACTION = 0.01  # per clean, normal-speed response
+SLOW_FACTOR = 2.0         # a response this many times the usual latency counts as slow
+SLOW_DECREASE = 0.8
+ERROR_DECREASE = 0.5
+BLOCK_DECREASE = 0.25
+BLOCK_COOLDOWN = 60.0
+LATENCY_SMOOTHING = 0.2   # weight of the newest sample in the usual-latency average
+
+
+class TokenBucket:
+    def __init__(self, per_minute, burst=1):
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveBucket(TokenBucket):
+    # Token bucket whose rate follows what the domain's responses look like,
+    # between FLOOR_FRACTION of the ceiling and the ceiling itself
+
+    def __init__(self, ceiling_per_minute, burst=1):
+        super().__init__(ceiling_per_minute / 2.0, burst)
+        self.ceiling = ceiling_per_minute / 60.0
+        self.floor = self.ceiling * FLOOR_FRACTION
+        self.blocked_until = 0.0
+        self.latency = {}  # backend kind -> usual latency (s)
+        self.slowdowns = 0
+        self.errors = 0
+        self.blocks = 0
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                hold = self.blocked_until - time.monotonic()
+            if hold <= 0:
+                break
+            time.sleep(hold)
+        super().acquire()
+
+    def observe(self, latency=None, ok=True, blocked=False, retry_after=None, kind='http'):
+        with self.lock:
+            if blocked:
+                self.blocks += 1
+                self.rate *= BLOCK_DECREASE
+                cooldown = retry_after if retry_after is not None else BLOCK_COOLDOWN
+                self.blocked_until = max(self.blocked_until, time.monotonic() + cooldown)
+                # Nothing saved up may be spent straight after the hold
+                self.tokens = min(self.tokens, 0.0)
+            elif not ok:
+                self.errors += 1
+                self.rate *= ERROR_DECREASE
+            elif latency is not None:
+                usual = self.latency.get(kind)
+                if usual is not None and latency > usual * SLOW_FACTOR:
+                    self.slowdowns += 1
+                    self.rate *= SLOW_DECREASE
+                else:
+                    self.rate += self.ceiling * INCREASE_FRACTION
+                self.latency[kind] = latency if usual is None else usual + LATENCY_SMOOTHING * (latency - usual)
+            self.rate = min(self.ceiling, max(self.floor, self.rate))
+
+
+class DomainBudgets:
+    def __init__(self, budgets=None, burst=1, adaptive=False):
+        budgets = DEFAULT_BUDGETS if budgets is None else budgets
+        bucket = AdaptiveBucket if adaptive else TokenBucket
+        self.buckets = {domain: bucket(per_minute, burst) for domain, per_minute in budgets.items()}
+
+    def bucket_for(self, url):
+        host = (urlsplit(url).hostname or '').lower()
+        for domain, bucket in self.buckets.items():
+            if host == domain or host.endswith('.' + domain):
+                return bucket
+        return None
+
+    def acquire(self, url):
+        bucket = self.bucket_for(url)
+        if bucket:
+            with run_metrics.span('rate_wait'):
+                bucket.acquire()
+
+    def observe(self, url, **outcome):
+        # Feed a response back to an adaptive bucket (see AdaptiveBucket.observe)
+        bucket = self.bucket_for(url)
+        if isinstance(bucket, AdaptiveBucket):
+            bucket.observe(**outcome)
+
+    def report(self):
+        for domain, bucket in self.buckets.items():
+            if isinstance(bucket, AdaptiveBucket):
+                print(f"Rate {domain}: {bucket.rate * 60:.1f}/min (ceiling {bucket.ceiling * 60:.0f}), "
+                      f"{bucket.slowdowns} slow, {bucket.errors} errors, {bucket.blocks} blocks.")
+
+
+class PageBlocked(Exception):
+    # A block page (Access Denied, unusual traffic) came back instead of the content
+    pass
+
+
+_driver_start_lock = threading.Lock()
+
+
+class BudgetedDriver:
+    # Thin proxy over a WebDriver: get() waits for the domain budget and counts pages,
+    # everything else goes straight to the wrapped driver. The browser itself is only
+    # started on first use, so a player served without it never pays for a launch.
+
+    def __init__(self, make_driver, budgets):
+        self._make_driver = make_driver
+        self._driver = None
+        self._budgets = budgets
+        self.pages = 0
+
+    @property
+    def started(self):
+        return self._driver is not None
+
+    def _ensure_driver(self):
+        if self._driver is None:
+            # undetected_chromedriver patches the chromedriver binary on startup; starting
+            # several at once races on that file, so drivers are created one at a time
+            with _driver_start_lock, run_metrics.span('browser_start'):
+                self._driver = self._make_driver()
+        return self._driver
+
+    def get(self, url):
+        self._budgets.acquire(url)
+        self.pages += 1
+        run_metrics.page('browser')
+        driver = self._ensure_driver()
+        started = time.monotonic()
+        try:
+            result = driver.get(url)
+        except Exception:
+            self._budgets.observe(url, ok=False, kind='browser')
+            raise
+        self._budgets.observe(url, latency=time.monotonic() - started, kind='browser')
+        return result
+
+    def mark_blocked(self, url):
+        # The page loaded but is a block page (Access Denied, unusual traffic)
+        self._budgets.observe(url, blocked=True, kind='browser')
+
+    def quit(self):
+        if self._driver is not None:
+            driver, self._driver = self._driver, None
+            driver.quit()
+
+    def __getattr__(self, name):
+        return getattr(self._ensure_driver(), name)
+
+
+def is_alive(driver):
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+class _Worker(threading.Thread):
+    def __init__(self, pool, index):
+        super().__init__(name=f"browser-{index}", daemon=True)
+        self.pool = pool
+        self.driver = None
+
+    def _start_driver(self):
+        self.driver = BudgetedDriver(self.pool.make_driver, self.pool.budgets)
+
+    def _stop_driver(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+    def run(self):
+        pool = self.pool
+        try:
+            while True:
+                if pool.out_of_time():
+                    return
+                player = pool.next_player()
+                if player is None:
+                    return
+
+                if self.driver is None:
+                    # A browser that fails to launch surfaces as an error on this player
+                    self._start_driver()
+
+                try:
+                    pool.handle(self.driver, player)
+                    pool.record_done()
+                except Exception as e:
+                    print(f"[{self.name}] Error on player {player.get('list_sr_no')}: {e}")
+                    pool.retry_or_fail(player, e)
+                    # A failed page may have left the browser in any state; start clean
+                    self._stop_driver()
+                    continue
+
+                if self.driver.pages >= pool.recycle_every or (self.driver.started and not is_alive(self.driver)):
+                    self._stop_driver()
+
+                if pool.pause:
+                    time.sleep(pool.pause())
+        finally:
+            self._stop_driver()
+
+
+class BrowserPool:
+    def __init__(self, make_driver, handle, workers=1, recycle_every=50, budgets=None, pause=None, retries=1,
+                 time_budget=None):
+        # make_driver() -> new WebDriver; handle(driver, player) does the per-player work.
+        # pause() -> seconds a worker rests between players (optional).
+        # A player whose handler raises goes back on the queue up to retries times.
+        # After time_budget seconds workers finish their current player and take no new ones;
+        # players are taken in the order given, so put the important ones first.
+        # run() accepts any iterable and pulls from it only as workers free up, so a
+        # generator (e.g. roster pages still being fetched) feeds the pool lazily.
+        # If the iterable raises, no further players are taken and source_error holds it.
+        self.make_driver = make_driver
+        self.handle = handle
+        self.workers = max(1, workers)
+        self.recycle_every = recycle_every
+        self.budgets = budgets if isinstance(budgets, DomainBudgets) else DomainBudgets(budgets)
+        self.pause = pause
+        self.retries = retries
+        self.time_budget = time_budget
+        self.deadline = None
+
+        self.players = queue.Queue()  # players waiting for a retry
+        self.taken = 0
+        self.done = 0
+        self.failures = []  # (player, error message)
+        self.source_error = None  # what stopped the player source early, if anything
+        self._attempts = {}
+        self._lock = threading.Lock()
+        self._source = None
+        self._source_lock = threading.Lock()
+
+    def next_player(self):
+        # A player due a retry, else the next one from the source; None once both are used up
+        try:
+            return self.players.get_nowait()
+        except queue.Empty:
+            pass
+        with self._source_lock:
+            if self._source is None:
+                return None
+            try:
+                player = next(self._source, None)
+            except Exception as e:
+                # e.g. a roster page request that failed; the players already taken still
+                # finish, and the caller finds the error in source_error
+                print(f"Player source failed: {e}")
+                self.source_error = e
+                player = None
+            if player is None:
+                self._source = None
+            else:
+                self.taken += 1
+            return player
+
+    def record_done(self):
+        with self._lock:
+            self.done += 1
+
+    def record_failure(self, player, error):
+        with self._lock:
+            self.failures.append((player, str(error)))
+
+    def out_of_time(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def retry_or_fail(self, player, error):
+        with self._lock:
+            key = id(player)
+            self._attempts[key] = self._attempts.get(key, 0) + 1
+            if self._attempts[key] <= self.retries:
+                self.players.put(player)
+                return
+        self.record_failure(player, error)
+
+    def run(self, players):
+        total = len(players) if hasattr(players, '__len__') else None
+        self._source = iter(players)
+
+        started = time.monotonic()
+        if self.time_budget:
+            self.deadline = started + self.time_budget
+        threads = [_Worker(self, i + 1) for i in range(self.workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        elapsed = time.monotonic() - started
+        print(f"Browser pool: {self.done} players done, {len(self.failures)} failed, "
+              f"{self.workers} workers, {elapsed / 60:.1f} min.")
+        if self.out_of_time() and (self._source is not None or not self.players.empty()):
+            if total is not None:
+                print(f"Time budget used up; {total - self.taken + self.players.qsize()} players left for the next run.")
+            else:
+                print("Time budget used up; the rest of the roster is left for the next run.")
+        return self.failures
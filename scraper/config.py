@@ -0,0 +1,54 @@
+import os
+import sys
+
+# Settings shared by every command. Supabase credentials come from the
+# environment, with .env and .env.local (in the working directory, then the
+# repo root) filling in whatever is unset; the first variable set in each list
+# below wins, so the service role key is used for writes whenever it exists.
+#
+# Nothing heavy is imported here: dotenv is read and the Supabase client library
+# loaded on the first get_client(), so commands that never touch the database
+# (--help, --dry-run, local maintenance) start without paying for either.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_FILES = ('.env', '.env.local')
+
+URL_VARS = ('SUPABASE_PROJECT_URL', 'NEXT_PUBLIC_SUPABASE_URL')
+KEY_VARS = ('SUPABASE_SERVICE_ROLE_KEY', 'SUPABASE_ANON_KEY', 'NEXT_PUBLIC_SUPABASE_ANON_KEY')
+
+_env_loaded = False
+
+
+def load_env():
+    global _env_loaded
+    if _env_loaded:
+        return
+    from dotenv import load_dotenv
+    for directory in dict.fromkeys((os.getcwd(), ROOT)):
+        for name in ENV_FILES:
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                # Never overrides variables that are already set
+                load_dotenv(path)
+    _env_loaded = True
+
+
+def _first_set(names):
+    return next((os.environ[n] for n in names if os.environ.get(n)), None)
+
+
+def supabase_settings():
+    # (url, key), either None when it is not configured anywhere
+    load_env()
+    return _first_set(URL_VARS), _first_set(KEY_VARS)
+
+
+def get_client():
+    url, key = supabase_settings()
+    if not url or not key:
+        print(f"Error: Supabase URL or Key not found (set one of {', '.join(URL_VARS)} "
+              f"and one of {', '.join(KEY_VARS)}).")
+        sys.exit(1)
+
+    from supabase import create_client
+    return create_client(url, key)
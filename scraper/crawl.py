@@ -0,0 +1,355 @@
+import argparse
+import sys
+import threading
+import time
+from config import get_client
+from browser_pool import BrowserPool, DomainBudgets, DEFAULT_BUDGETS
+from refresh_schedule import RefreshSchedule, plan, due_stages
+from roster import iter_roster, iter_csv_roster, parse_where, PAGE_SIZE, CSV_PATH
+from run_journal import RunJournal, DEFAULT_WINDOW_HOURS
+from profile_cache import ProfileCache, DEFAULT_TTL_DAYS
+from form_records import typed_form, TYPED_COLUMNS
+from search_results import normalize_link
+import run_metrics
+import form
+import news
+
+# One pass over the roster for every per-player scrape.
+# The roster is fetched once (in keyset pages, optionally filtered server-side
+# with --where), each worker keeps one browser for all stages, and whatever the
+# stages collect for a player goes out as a single DB write. With --stream the
+# workers start on the first page and visit players in list order; otherwise the
+# whole roster is ranked first so the most overdue players go first.
+#
+#   python scraper/crawl.py                      # every stage
+#   python scraper/crawl.py --stages form        # same as python scraper/form.py
+#
+# A stage is built with (args, fetcher) and has a name, collect(driver, player, name)
+# -> (result, updates) and close(). result is what the refresh schedule compares
+# between runs (None when the page loaded with nothing on it); updates are the players
+# columns to write, all of them listed in the stage's columns. collect raises when the
+# page could not be scraped (an error, a timeout, a block page): that stage is not a
+# visit, so it stays due, and the player is retried for just the stages that failed. Those columns are read with the roster,
+# and only the ones whose fresh value differs from the stored one are written.
+# Stages try each page over plain HTTP first (fetcher, None with --no-http) and only
+# use the browser when the response lacks the markup they need; the driver starts
+# its browser on first use, so a run served entirely over HTTP never launches Chrome.
+#
+# --dry-run prints the plan from the roster CSV and the local refresh state
+# instead: no database, no HTTP, no browser, and nothing saved.
+
+
+class FormStage:
+    name = 'form'
+    columns = ('batting_form', 'bowling_form') + TYPED_COLUMNS
+
+    def __init__(self, args, fetcher):
+        self.cache = None if args.no_profile_cache else ProfileCache(ttl_days=args.profile_ttl)
+        self.fetcher = fetcher
+
+    def collect(self, driver, player, name):
+        bat_scores, bowl_scores = form.scrape_scores(driver, name, player['list_sr_no'], self.cache, self.fetcher)
+        if bat_scores is None:
+            return None, {}
+
+        updates = {}
+        if bat_scores:
+            updates['batting_form'] = bat_scores
+        if bowl_scores:
+            updates['bowling_form'] = bowl_scores
+        # Parsed once here so readers get numbers next to the raw strings
+        updates.update(typed_form(bat_scores, bowl_scores))
+        return [bat_scores, bowl_scores], updates
+
+    def close(self):
+        if self.cache:
+            self.cache.save()
+            self.cache.report()
+
+
+class NewsStage:
+    name = 'news'
+    columns = ('news',)
+
+    def __init__(self, args, fetcher):
+        self.fetcher = fetcher
+
+    def collect(self, driver, player, name):
+        items = news.scrape_news(driver, name, self.fetcher)
+        if not items:
+            print(f"No news found for {name}.")
+            return None, {}
+        print(f"Found {len(items)} news items for {name}.")
+        # 'news' column is JSONB
+        return items, {'news': items}
+
+    def close(self):
+        pass
+
+
+# Stages in the order they run for a player; add new ones here
+STAGES = {
+    'form': FormStage,
+    'news': NewsStage,
+}
+
+ROSTER_COLUMNS = ('list_sr_no', 'first_name', 'surname', 'team_2025', 'ipl_2025')
+
+
+def _comparable(column, value):
+    # Stored and fresh values in a form where equal means nothing to write.
+    # News is compared as a set of (link, headline) with links normalized, so a
+    # reshuffle of the same stories or a tracking parameter is not a change.
+    if column == 'news':
+        return frozenset((normalize_link(item.get('link')), item.get('headline')) for item in value or [])
+    return value or None
+
+
+def stream_queue(players, schedules, include_all=False, skip=()):
+    # Lazy counterpart of plan(): players in list_sr_no order as the roster pages
+    # arrive, each with the stages due for them, without ranking the whole roster
+    now = time.time()
+    for p in players:
+        if p['list_sr_no'] in skip:
+            continue
+        due = due_stages(p, schedules, include_all, now)
+        if due:
+            yield {**p, 'stages': due}
+
+
+def changed_columns(updates, stored):
+    return {col: value for col, value in updates.items()
+            if _comparable(col, value) != _comparable(col, stored.get(col))}
+
+
+def roster_error(e):
+    print(f"Supabase error: {e}")
+    if '42703' in str(e):
+        # Undefined column: the table predates a migration the stages read
+        print("The players table is missing a column; apply supabase/migrations/ (see README).")
+
+
+def preview(names, csv_path=CSV_PATH, include_all=False, top=10):
+    # The plan a run would follow, from the roster CSV instead of the table
+    players = list(iter_csv_roster(csv_path, ROSTER_COLUMNS))
+    schedules = {n: RefreshSchedule(n) for n in names}
+    planned = plan(players, schedules, include_all=include_all)
+    for n in names:
+        print(f"  {n}: {sum(1 for _, due in planned if n in due)} players due")
+    for p, due in planned[:top]:
+        print(f"  {p['list_sr_no']:>5}  {p['first_name']} {p['surname']}  ({', '.join(due)})")
+    return planned
+
+
+def main(stages=None, description="Scrape form and news for every player in one pass.", argv=None):
+    parser = argparse.ArgumentParser(description=description)
+    if stages is None:
+        parser.add_argument('--stages', default=','.join(STAGES), help=f"Comma-separated stages to run ({', '.join(STAGES)})")
+    parser.add_argument('--workers', type=int, default=1, help="Browser sessions running in parallel")
+    parser.add_argument('--recycle-every', type=int, default=50, help="Restart a worker's browser after this many pages")
+    parser.add_argument('--budget-minutes', type=float, help="Stop taking new players after this long (highest priority go first)")
+    parser.add_argument('--all', action='store_true', help="Visit every player, not just those due for a refresh")
+    parser.add_argument('--stream', action='store_true',
+                        help="Start on the first roster page and visit players in list order instead of ranking the whole roster first")
+    parser.add_argument('--where', action='append', default=[], metavar='COLUMN=OP.VALUE',
+                        help="Server-side roster filter (repeatable), e.g. team_2025=not.is.null or 'or=valued_at.is.null,valued_at.lt.2026-10-01'")
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE, help="Players per roster page request")
+    parser.add_argument('--resume', action='store_true', help="Skip players already done in the current run window")
+    parser.add_argument('--window-hours', type=float, default=DEFAULT_WINDOW_HOURS, help="How far back --resume looks in the journal")
+    parser.add_argument('--profile-ttl', type=float, default=DEFAULT_TTL_DAYS, help="Days a cached profile URL is trusted")
+    parser.add_argument('--no-profile-cache', action='store_true', help="Always search for the profile URL")
+    parser.add_argument('--no-http', action='store_true', help="Load every page in the browser, skipping the plain HTTP fast path")
+    parser.add_argument('--max-rate', action='append', default=[], metavar='DOMAIN=PER_MINUTE',
+                        help="Request rate ceiling for a domain (repeatable; defaults: " +
+                             ', '.join(f"{d}={r}" for d, r in DEFAULT_BUDGETS.items()) + ")")
+    parser.add_argument('--force-write', action='store_true', help="Write every result, even when it matches what is stored")
+    parser.add_argument('--metrics', default=run_metrics.METRICS_PATH, help="Where to write the run's timing summary (JSON)")
+    parser.add_argument('--profile', metavar='PATH', help="Also write cProfile stats for the run to PATH")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Print the plan from the roster CSV and local refresh state; no network, nothing saved")
+    parser.add_argument('--csv', default=CSV_PATH, help="Roster CSV read by --dry-run")
+    args = parser.parse_args(argv)
+
+    ceilings = dict(DEFAULT_BUDGETS)
+    for spec in args.max_rate:
+        domain, _, rate = spec.partition('=')
+        try:
+            ceilings[domain.strip().lower()] = float(rate)
+        except ValueError:
+            parser.error(f"--max-rate expects DOMAIN=PER_MINUTE, got {spec!r}")
+
+    names = stages or [n.strip() for n in args.stages.split(',') if n.strip()]
+    unknown = [n for n in names if n not in STAGES]
+    if unknown or not names:
+        parser.error(f"unknown stages: {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+    # Keep the registry order whatever order they were asked for in
+    names = [n for n in STAGES if n in names]
+
+    try:
+        where = [parse_where(spec) for spec in args.where]
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.dry_run:
+        if where:
+            print("Note: --where filters are applied by the database and are ignored in a dry run.")
+        preview(names, args.csv, include_all=args.all)
+        return
+
+    # The writer (postgrest) and the HTTP session (requests) load only for a real run
+    from db_writer import BatchWriter
+    from fetch import HttpFetcher
+
+    metrics = run_metrics.reset()
+    profiler = run_metrics.ThreadProfiler() if args.profile else None
+    supabase = get_client()
+
+    # Players for every stage, with what the stages last stored for them, in keyset pages
+    stored_columns = [c for n in names for c in STAGES[n].columns]
+    roster = iter_roster(supabase, ', '.join(ROSTER_COLUMNS + tuple(stored_columns)), where, page_size=args.page_size)
+    schedules = {n: RefreshSchedule(n) for n in names}
+    # Every finished player is journaled, so an interrupted run can be resumed
+    journal = RunJournal('_'.join(names), window_hours=args.window_hours)
+
+    if args.stream:
+        # Workers pull players as pages arrive; the rest of the roster is fetched as they go
+        print("Streaming players from Supabase...")
+        queue = stream_queue(roster, schedules, include_all=args.all, skip=journal.completed() if args.resume else ())
+    else:
+        print("Fetching players from Supabase...")
+        try:
+            with run_metrics.span('roster'):
+                players = list(roster)
+        except Exception as e:
+            roster_error(e)
+            journal.close()
+            sys.exit(1)
+
+        if not players:
+            print("No players found in Supabase.")
+            journal.close()
+            return
+
+        print(f"Found {len(players)} players.")
+
+        # Most overdue first; each player only gets the stages due for them
+        queue = [{**p, 'stages': due} for p, due in plan(players, schedules, include_all=args.all)]
+        if args.resume:
+            queue = journal.skip_completed(queue)
+
+    # Browsers and plain HTTP requests share the per-domain request budgets, whose
+    # rates follow each site's responses up to the configured ceilings
+    budgets = DomainBudgets(ceilings, adaptive=True)
+    fetcher = None if args.no_http else HttpFetcher(budgets)
+    runners = {n: STAGES[n](args, fetcher) for n in names}
+    # A visit only counts in the refresh schedules once its data is stored: stage
+    # results of players with a write pending wait here until the writer confirms
+    # it, so a failed write leaves the player due on the next run
+    unwritten = {}
+    # Players with a failed stage: a write of their other stages must not mark them
+    # done in the journal, or --resume would skip the stage that still has to run
+    incomplete = set()
+
+    def record_visit(pid, results):
+        for stage_name, result in results:
+            schedules[stage_name].record(pid, result)
+
+    def written(pids):
+        journal.record_written([pid for pid in pids if pid not in incomplete])
+        for pid in pids:
+            record_visit(pid, unwritten.pop(pid, ()))
+
+    writer = BatchWriter(supabase, on_written=written)
+    diff = {'changed': 0, 'unchanged': 0, 'columns_skipped': 0}
+    diff_lock = threading.Lock()
+
+    def process_player(driver, p):
+        try:
+            with run_metrics.span('player'):
+                if profiler:
+                    with profiler.profiled():
+                        visit_player(driver, p)
+                else:
+                    visit_player(driver, p)
+        except Exception as e:
+            run_metrics.failure(f"player:{type(e).__name__}")
+            raise
+        metrics.player_done()
+
+    def visit_player(driver, p):
+        pid = p['list_sr_no']
+        name = f"{p['first_name']} {p['surname']}".strip()
+
+        print(f"Processing {name} ({', '.join(p['stages'])})...")
+        updates = {}
+        results = []
+        failed = []
+        for stage_name in p['stages']:
+            try:
+                result, stage_updates = runners[stage_name].collect(driver, p, name)
+            except Exception as e:
+                failed.append((stage_name, e))
+                continue
+            results.append((stage_name, result))
+            updates.update(stage_updates)
+
+        if failed:
+            incomplete.add(pid)
+        else:
+            incomplete.discard(pid)
+        changed = {}
+        if updates:
+            changed = updates if args.force_write else changed_columns(updates, p)
+            with diff_lock:
+                diff['changed' if changed else 'unchanged'] += 1
+                diff['columns_skipped'] += len(updates) - len(changed)
+        if changed:
+            # One combined write per player, batched by the background writer
+            unwritten.setdefault(pid, []).extend(results)
+            writer.put(pid, changed)
+            print(f"Queued {name} for DB update ({', '.join(changed)}).")
+        else:
+            record_visit(pid, results)
+
+        if failed:
+            # The stages that did load are kept; the pool retries the rest, then journals the player as failed
+            p['stages'] = [stage_name for stage_name, _ in failed]
+            raise RuntimeError('; '.join(f"{stage_name}: {e}" for stage_name, e in failed)) from failed[0][1]
+        if not updates:
+            journal.record(pid, 'no_data')
+        elif not changed:
+            print(f"{name} unchanged, nothing to write.")
+            journal.record(pid, 'unchanged')
+
+    # Workers share the player queue; the domain budgets pace their requests
+    budget = args.budget_minutes * 60 if args.budget_minutes else None
+    pool = BrowserPool(form.get_driver, process_player, workers=args.workers, recycle_every=args.recycle_every,
+                       time_budget=budget, budgets=budgets)
+    try:
+        failures = pool.run(queue)
+        for p, err in failures:
+            journal.record(p['list_sr_no'], 'failed', err)
+    finally:
+        print(f"Stored data: {diff['changed']} players changed, {diff['unchanged']} unchanged "
+              f"({diff['columns_skipped']} column writes skipped).")
+        print("Flushing pending DB updates...")
+        for pid, err in writer.close():
+            journal.record(pid, 'failed', err)
+        journal.close()
+        for n in names:
+            schedules[n].save()
+            runners[n].close()
+        if fetcher:
+            fetcher.report()
+        budgets.report()
+        metrics.report(metrics.write(args.metrics))
+        print(f"Wrote run metrics to {args.metrics}")
+        if profiler:
+            profiler.save(args.profile)
+    if pool.source_error is not None:
+        # A roster page failed mid-stream: the rest of the roster was never visited
+        roster_error(pool.source_error)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import queue
+import random
+import threading
+import time
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+from uploader import is_transient
+import run_metrics
+
+# Sentinel telling the background thread to flush and exit
+_STOP = object()
+
+
+class BatchWriter:
+    # Write-behind queue for per-player updates.
+    # The scraping loop calls put() and moves on; a background thread merges
+    # updates per player and sends them as bulk upserts keyed on list_sr_no,
+    # either when batch_size players are pending or when the oldest pending
+    # update has waited flush_interval seconds.
+    # on_written(pids), if given, is called from the writer thread once those
+    # players' rows are in the database.
+    # Transient errors (see uploader.is_transient) are retried with the same
+    # jittered exponential backoff as ChunkUploader, for the bulk upsert and for
+    # each row of the row-by-row fallback it drops to when the server rejects the
+    # bulk upsert. Rows still failing after that end up in failures, as do whole
+    # batches that fail any other way (see is_transient: only connection errors
+    # and the listed API codes are retried).
+
+    def __init__(self, client, table='players', key='list_sr_no', batch_size=50, flush_interval=30.0,
+                 on_written=None, retries=5, backoff=0.5, max_backoff=30.0):
+        self.client = client
+        self.table = table
+        self.key = key
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_written = on_written
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.rows_written = 0
+        self.requests_sent = 0
+        self.retried = 0
+        self.failures = []  # (pid, error message)
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def put(self, pid, updates):
+        if updates:
+            self._queue.put((pid, dict(updates)))
+
+    def close(self):
+        # Final flush, then print what happened
+        self._queue.put(_STOP)
+        self._thread.join()
+        self.report()
+        return self.failures
+
+    def report(self):
+        print(f"DB writer: {self.rows_written} rows written in {self.requests_sent} requests "
+              f"({self.retried} retries), {len(self.failures)} failed.")
+        for pid, err in self.failures:
+            print(f"  Failed list_sr_no={pid}: {err}")
+
+    def _run(self):
+        pending = {}
+        oldest = None
+
+        while True:
+            if pending:
+                timeout = max(0.0, self.flush_interval - (time.monotonic() - oldest))
+            else:
+                timeout = None
+
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._flush(pending)
+                return
+
+            if item is not None:
+                pid, updates = item
+                if not pending:
+                    oldest = time.monotonic()
+                # Later updates for the same player win column by column
+                pending.setdefault(pid, {}).update(updates)
+
+            if pending and (len(pending) >= self.batch_size or time.monotonic() - oldest >= self.flush_interval):
+                self._flush(pending)
+                pending = {}
+
+    def _flush(self, pending):
+        if not pending:
+            return
+
+        # PostgREST fills missing keys with NULL in a bulk upsert, so rows are
+        # grouped by their column set. Otherwise a player with only batting
+        # form would have their bowling form wiped.
+        groups = {}
+        for pid, updates in pending.items():
+            row = {self.key: pid, **updates}
+            groups.setdefault(frozenset(row), []).append(row)
+
+        for rows in groups.values():
+            try:
+                self._execute(lambda: self.client.table(self.table).upsert(
+                    rows, on_conflict=self.key, returning=ReturnMethod.minimal).execute())
+                self.rows_written += len(rows)
+            except APIError as e:
+                # The server rejected the batch; find the rows it objects to
+                print(f"Bulk upsert of {len(rows)} rows failed ({e}), retrying row by row...")
+                self._write_rows_individually(rows)
+            except Exception as e:
+                # Out of retries on the connection, or a bug: every row would fail the same way
+                print(f"Bulk upsert of {len(rows)} rows failed ({e}).")
+                self.failures.extend((row[self.key], str(e)) for row in rows)
+                run_metrics.failure('db_write')
+            else:
+                self._written([row[self.key] for row in rows])
+
+    def _write_rows_individually(self, rows):
+        for row in rows:
+            updates = {k: v for k, v in row.items() if k != self.key}
+            try:
+                self._execute(lambda: self.client.table(self.table).update(
+                    updates, returning=ReturnMethod.minimal).eq(self.key, row[self.key]).execute())
+                self.rows_written += 1
+            except Exception as e:
+                self.failures.append((row[self.key], str(e)))
+                run_metrics.failure('db_write')
+            else:
+                self._written([row[self.key]])
+
+    def _execute(self, request):
+        # One write, retried on transient errors; the last error is raised
+        attempt = 0
+        while True:
+            try:
+                self.requests_sent += 1
+                with run_metrics.span('db_write'):
+                    return request()
+            except Exception as e:
+                if attempt >= self.retries or not is_transient(e):
+                    raise
+                # Jitter keeps the writer from retrying in step with other clients
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                attempt += 1
+                self.retried += 1
+                time.sleep(delay)
+
+    def _written(self, pids):
+        if self.on_written:
+            self.on_written(pids)
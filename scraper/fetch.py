@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import Counter
+import requests
+from requests.adapters import HTTPAdapter
+import run_metrics
+
+# Plain HTTP fast path for pages whose data is already in the server's HTML.
+# Callers try fetcher.get(url) first and parse the response; only when that
+# fails (error status, block page, or the expected table/results markup is
+# missing) do they load the page in the browser. Each worker thread gets its own
+# keep-alive requests.Session, so repeat visits to a host reuse the connection.
+# Requests take tokens from the same per-domain budgets as the browsers, and each
+# response's latency and status is fed back to them (see browser_pool.AdaptiveBucket).
+
+# Same browser identity as the Chrome sessions
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+HTTP_TIMEOUT = 15
+# Connections kept open per host, per worker
+POOL_SIZE = 4
+# After this many pages of a kind in a row needed the browser anyway, stop trying
+# that kind over HTTP, apart from one probe every PROBE_EVERY pages
+MAX_MISSES = 5
+PROBE_EVERY = 50
+
+
+def _retry_after(response):
+    # Seconds from a Retry-After header; HTTP dates are rare enough to ignore
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpFetcher:
+    def __init__(self, budgets=None, timeout=HTTP_TIMEOUT):
+        self.budgets = budgets
+        self.timeout = timeout
+        self.served = Counter()  # (page kind, 'http' | 'browser') -> pages
+        self.misses = Counter()  # page kind -> browser-served pages in a row
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._local.session = session
+        return session
+
+    def get(self, url):
+        # Page HTML, or None when the page did not come back as a plain 200
+        if self.budgets:
+            self.budgets.acquire(url)
+        run_metrics.page('http')
+        started = time.monotonic()
+        try:
+            response = self._session().get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"HTTP fetch failed for {url}: {e}")
+            run_metrics.failure(f"http:{type(e).__name__}")
+            self._observe(url, ok=False)
+            return None
+
+        status = response.status_code
+        if status == 429:
+            self._observe(url, blocked=True, retry_after=_retry_after(response))
+        elif status == 403:
+            # Plain clients refused; says nothing about the browser's welcome, so no rate signal
+            pass
+        elif status >= 500:
+            self._observe(url, ok=False)
+        else:
+            self._observe(url, latency=time.monotonic() - started)
+        if status != 200:
+            print(f"HTTP {status} for {url}")
+            run_metrics.failure(f"http_{status}")
+            return None
+        return response.text
+
+    def _observe(self, url, **outcome):
+        if self.budgets:
+            self.budgets.observe(url, kind='http', **outcome)
+
+    def wants(self, kind):
+        # Whether the HTTP path is still worth a request for this kind of page
+        misses = self.misses[kind]
+        return misses < MAX_MISSES or misses % PROBE_EVERY == 0
+
+    def record(self, kind, backend):
+        # Which backend served a page; kinds are 'search', 'matches', 'news'
+        with self._lock:
+            self.served[(kind, backend)] += 1
+            self.misses[kind] = 0 if backend == 'http' else self.misses[kind] + 1
+        print(f"Served {kind} page via {backend}.")
+
+    def report(self):
+        kinds = sorted({kind for kind, _ in self.served})
+        parts = [f"{kind} {self.served[(kind, 'http')]} http / {self.served[(kind, 'browser')]} browser" for kind in kinds]
+        print(f"Fetch backends: {', '.join(parts) or 'no pages'}.")
@@ -1,29 +1,18 @@
-import os
 import time
 import random
-from supabase import create_client, Client
-from dotenv import load_dotenv
-import undetected_chromedriver as uc
+from urllib.parse import quote_plus
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from matches_table import TABLES_SCRIPT, extract_scores
+from search_results import first_result_link
+from browser_pool import PageBlocked
+import run_metrics
 
-# Load environment variables
-load_dotenv('.env')
-
-url: str = os.environ.get("SUPABASE_PROJECT_URL") or os.environ.get("SUPABASE_PROJECT_URL")
-key: str = os.environ.get("SUPABASE_ANON_KEY") or os.environ.get("SUPABASE_ANON_KEY")
-service_key: str = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-
-if not url or not key:
-    print("Error: Supabase URL or Key not found.")
-    exit(1)
-
-# Initialize Supabase
-supabase: Client = create_client(url, service_key if service_key else key)
+# undetected_chromedriver and selenium's waits take most of a second to import,
+# so they are imported where a browser is actually driven, not with this module
 
 def get_driver():
+    import undetected_chromedriver as uc
     options = uc.ChromeOptions()
     options.add_argument("--start-maximized")
     # options.add_argument("--headless=new") # Headless often triggers detection, use with caution
@@ -36,139 +25,161 @@ def get_driver():
     driver = uc.Chrome(options=options, use_subprocess=True) 
     return driver
 
-def scrape_scores(driver, player_name):
+def _check_unusual_traffic(driver):
+    # Google's "unusual traffic" page lives under /sorry/; slow the domain down
+    if "/sorry/" in driver.current_url and hasattr(driver, 'mark_blocked'):
+        print("Google unusual-traffic page detected.")
+        run_metrics.failure('unusual_traffic')
+        driver.mark_blocked(driver.current_url)
+
+def _is_profile_url(url):
+    return "espncricinfo.com/player/" in url or "espncricinfo.com/cricketers/" in url
+
+def find_profile_url(driver, player_name, fetcher=None):
     # 1. Google Search
     print(f"Searching for: {player_name} espncricinfo")
-    driver.get("https://google.com")
-    
-    try:
+    if fetcher and fetcher.wants('search'):
+        # Fast path: the plain results page, when it has the result links
+        with run_metrics.span('search.http'):
+            html = fetcher.get("https://www.google.com/search?hl=en&q=" + quote_plus(f"{player_name} espncricinfo"))
+            profile_url = first_result_link(html) if html else None
+        if profile_url:
+            fetcher.record('search', 'http')
+            if not _is_profile_url(profile_url):
+                print(f"Skipping: First result not ESPNcricinfo ({profile_url})")
+                run_metrics.failure('not_espncricinfo')
+                return None
+            print(f"Found profile: {profile_url}")
+            return profile_url
+
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    with run_metrics.span('search.navigation'):
+        driver.get("https://google.com")
+
         # Wait for search box using standard Selenium waits
         # uc uses standard selenium syntax once initialized
         search_box = WebDriverWait(driver, 15).until(
             EC.presence_of_element_located((By.NAME, "q"))
         )
-        # Type slowly?
+    # Type slowly?
+    with run_metrics.span('search.typing'):
         for char in f"{player_name} espncricinfo":
             search_box.send_keys(char)
             time.sleep(random.uniform(0.05, 0.15))
             
         time.sleep(0.5)
         search_box.send_keys(Keys.RETURN)
-        
-        # 2. Click First Result
-        # Wait for results
-        first_result = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "h3"))
-        )
-        
-        # Check link
-        parent_link = first_result.find_element(By.XPATH, "./..")
-        profile_url = parent_link.get_attribute("href")
-        
-        if "espncricinfo.com/player/" not in profile_url and "espncricinfo.com/cricketers/" not in profile_url:
-             print(f"Skipping: First result not ESPNcricinfo ({profile_url})")
-             return None, None
-
-        print(f"Found profile: {profile_url}")
-        
-        # 3. Go to /matches
-        matches_url = profile_url.rstrip('/') + "/matches"
+    
+    # 2. Click First Result
+    # Wait for results
+    try:
+        with run_metrics.span('search.results_wait'):
+            first_result = WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "h3"))
+            )
+    except Exception:
+        _check_unusual_traffic(driver)
+        raise
+    
+    # Check link
+    parent_link = first_result.find_element(By.XPATH, "./..")
+    profile_url = parent_link.get_attribute("href")
+    if fetcher:
+        fetcher.record('search', 'browser')
+    
+    if not _is_profile_url(profile_url):
+         print(f"Skipping: First result not ESPNcricinfo ({profile_url})")
+         run_metrics.failure('not_espncricinfo')
+         return None
+
+    print(f"Found profile: {profile_url}")
+    return profile_url
+
+def scrape_matches(driver, profile_url, fetcher=None):
+    # Returns ((bat_scores, bowl_scores), denied); the scores are None when the page has no table
+    # 3. Go to /matches
+    matches_url = profile_url.rstrip('/') + "/matches"
+    if fetcher and fetcher.wants('matches'):
+        # Fast path: the table is in the server-rendered page
+        with run_metrics.span('matches.http'):
+            html = fetcher.get(matches_url)
+        with run_metrics.span('extraction'):
+            result = extract_scores(html) if html else None
+        if result is not None:
+            fetcher.record('matches', 'http')
+            return result, False
+        print("No scores table in the HTTP response, loading the page in the browser...")
+
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    with run_metrics.span('matches.navigation'):
         driver.get(matches_url)
-        
-        # Random sleep to mimic user reading
-        time.sleep(random.uniform(2, 4))
-        
-        # 4. Scrape Batting Scores
-        # Wait for "Recent Matches - Player"
-        # Sometimes header structure changes, try catch
-        try:
+    
+    # 4. Scrape Batting Scores
+    # Wait for "Recent Matches - Player"
+    # Sometimes header structure changes, try catch
+    try:
+        with run_metrics.span('matches.table_wait'):
              WebDriverWait(driver, 15).until(
                 EC.presence_of_element_located((By.XPATH, "//span[contains(text(), 'Recent Matches - Player')]"))
             )
-        except:
-            print("Could not find Recent Matches table header. Checking page source...")
-            # Detect Access Denied text
-            if "Access Denied" in driver.page_source:
-                print("ACCESS DENIED detected.")
+    except:
+        print("Could not find Recent Matches table header. Checking page source...")
+        # Detect Access Denied text
+        if "Access Denied" in driver.page_source:
+            print("ACCESS DENIED detected.")
+            run_metrics.failure('access_denied')
+            # Slow the whole domain down, not just this worker
+            if hasattr(driver, 'mark_blocked'):
+                driver.mark_blocked(matches_url)
+            return None, True
+        else:
+             pass # Fallback to looking for table
+    
+    # Locate table
+    # Grab every table's HTML in a single script call and parse the
+    # table with 'Bat' and 'Match' headers locally (see matches_table.py)
+    with run_metrics.span('extraction'):
+        tables_html = driver.execute_script(TABLES_SCRIPT) or ""
+        result = extract_scores(tables_html)
+    if result is None:
+        print("Could not locate Recent Matches table with 'Bat' column.")
+        run_metrics.failure('no_scores_table')
+    elif fetcher:
+        fetcher.record('matches', 'browser')
+    return result, False
+
+def scrape_scores(driver, player_name, pid=None, cache=None, fetcher=None):
+    # (bat_scores, bowl_scores), or (None, None) when the pages loaded but hold no
+    # profile or scores table. Errors and block pages raise: that is no visit.
+    try:
+        result = None
+        cached_url = cache.get(pid) if cache else None
+        if cached_url:
+            # Known player: skip the search and go straight to /matches
+            print(f"Cached profile: {cached_url}")
+            result, denied = scrape_matches(driver, cached_url, fetcher)
+            if denied:
+                raise PageBlocked(f"Access Denied on {cached_url}")
+            if result is None:
+                # The stored URL no longer leads to a scores table; forget it and search again
+                cache.invalidate(pid)
+
+        if result is None:
+            profile_url = find_profile_url(driver, player_name, fetcher)
+            if not profile_url:
                 return None, None
-            else:
-                 pass # Fallback to looking for table
-        
-        # Locate table
-        # Attempt to find the table that has 'Bat' column header
-        tables = driver.find_elements(By.TAG_NAME, "table")
-        target_table = None
-        bat_index = -1
-        
-        for tbl in tables:
-            headers = tbl.find_elements(By.TAG_NAME, "th")
-            texts = [h.text.strip() for h in headers]
-            if "Bat" in texts and "Match" in texts:
-                target_table = tbl
-                bat_index = texts.index("Bat")
-                break
-        
-        if not target_table:
-            print("Could not locate Recent Matches table with 'Bat' column.")
-            return None, None
-            
-        rows = target_table.find_elements(By.CSS_SELECTOR, "tbody tr")
-        
-        # Determine Bowl index
-        bowl_index = -1
-        if "Bowl" in texts:
-             bowl_index = texts.index("Bowl")
-        
-        bat_scores = []
-        bowl_scores = []
-        
-        for row in rows:
-            cols = row.find_elements(By.TAG_NAME, "td")
-            
-            # Batting
-            if len(cols) > bat_index:
-                val = cols[bat_index].text.strip()
-                if val and val != '--':
-                    if '&' in val:
-                        parts = val.split('&')
-                        for p in parts:
-                            p_clean = p.strip()
-                            if p_clean and p_clean != '--':
-                                bat_scores.append(p_clean)
-                    else:
-                        bat_scores.append(val)
-            
-            # Bowling
-            if bowl_index != -1 and len(cols) > bowl_index:
-                val = cols[bowl_index].text.strip()
-                if val and val != '--':
-                    if '&' in val:
-                        parts = val.split('&')
-                        for p in parts:
-                            p_clean = p.strip()
-                            if p_clean and p_clean != '--':
-                                bowl_scores.append(p_clean)
-                    else:
-                        bowl_scores.append(val)
-            
-            # Limit to 10? Logic implies 10 matches, but splitting test matches increases count.
-            # Let's limit based on matches scraped (rows) or scores count?
-            # User said "come back to supabase to store them in an array called batting_form"
-            # It's safer to just take everything from the recent table (which is usually small) or top 10 rows.
-            # But earlier code limited len(scores) >= 10.
-            # If we want synchronous arrays (Bat/Bowl for same match), we should rely on row count.
-            # However, test matches split scores (e.g. 2 inns bat, maybe 2 inns bowl).
-            # It's hard to keep them aligned if we flatten.
-            # User request "consider those as 0,37, with the rest of the array".
-            # Implies flattening is fine.
-            
-            if len(bat_scores) >= 10: 
-                 bat_scores = bat_scores[:10]
-            if len(bowl_scores) >= 10:
-                 bowl_scores = bowl_scores[:10]
-            
-            if len(bat_scores) >= 10 and len(bowl_scores) >= 10:
-                break
+            result, denied = scrape_matches(driver, profile_url, fetcher)
+            if denied:
+                raise PageBlocked(f"Access Denied on {profile_url}")
+            if result is None:
+                return None, None
+            if cache:
+                cache.put(pid, profile_url)
+
+        # Flattened innings scores, at most 10 each (Test matches split into two innings)
+        bat_scores, bowl_scores = result
                 
         print(f"Bat Scores: {bat_scores}")
         print(f"Bowl Scores: {bowl_scores}")
@@ -176,54 +187,13 @@ def scrape_scores(driver, player_name):
 
     except Exception as e:
         print(f"Error scraping {player_name}: {e}")
-        return None, None
-
-def main():
-    # Fetch players
-    print("Fetching players from Supabase...")
-    try:
-        response = supabase.table('players').select('list_sr_no, first_name, surname').order('list_sr_no', desc=False).execute()
-        players = response.data
-    except Exception as e:
-        print(f"Supabase error: {e}")
-        return # Exit if DB fails
-    
-    if not players:
-        print("No players found in Supabase.")
-        return
+        run_metrics.failure(f"form:{type(e).__name__}")
+        raise
 
-    print(f"Found {len(players)} players.")
-    
-    driver = get_driver()
-    
-    try:
-        for p in players:
-            pid = p['list_sr_no']
-            name = f"{p['first_name']} {p['surname']}".strip()
-            
-            print(f"Processing {name}...")
-            bat_scores, bowl_scores = scrape_scores(driver, name)
-            
-            updates = {}
-            if bat_scores:
-                updates['batting_form'] = bat_scores
-            if bowl_scores:
-                updates['bowling_form'] = bowl_scores
-                
-            if updates:
-                # Update Supabase
-                try:
-                    data, count = supabase.table('players').update(updates).eq('list_sr_no', pid).execute()
-                    print(f"Updated {name} in DB.")
-                except Exception as e:
-                    print(f"Error updating DB: {e}")
-            
-            # Sleep between players
-            time.sleep(random.uniform(3, 7))
-            
-    finally:
-        print("Closing driver...")
-        driver.quit()
+def main(argv=None):
+    # The crawler fetches the roster, runs the browsers and writes the results
+    import crawl
+    crawl.main(stages=['form'], description="Scrape recent batting/bowling form for every player.", argv=argv)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,94 @@
+import re
+import argparse
+import json
+import sys
+
+# Typed form, parsed once when the scores are scraped so nothing downstream has
+# to re-read strings like '37*' or '2/31'. Stored next to the raw arrays as
+# parallel integer arrays, one entry per innings that was actually played:
+#
+#   batting_form  ['37*', '5', 'DNB', '102']  ->  batting_runs    [37, 5, 102]
+#                                                 batting_not_out [1, 0, 0]
+#   bowling_form  ['2/31', '-', '0/12']       ->  bowling_wickets [2, 0]
+#                                                 bowling_runs    [31, 12]
+#
+# Entries that are not an innings (DNB, TDNB, absent, sub, '-') are left out, so
+# the arrays stay aligned with each other but not with the raw strings.
+# players columns: batting_runs, batting_not_out, bowling_wickets, bowling_runs int[]
+#
+#   python scraper/form_records.py '["37*", "5", "DNB"]' '["2/31", "-"]'   # show the parse
+#   python scraper/form_records.py --backfill                            # fill rows scraped before this
+
+_BAT_RE = re.compile(r'^(\d+)(\*?)$')
+_BOWL_RE = re.compile(r'^(\d+)/(\d+)$')
+
+TYPED_COLUMNS = ('batting_runs', 'batting_not_out', 'bowling_wickets', 'bowling_runs')
+
+
+def parse_batting(scores):
+    runs = []
+    not_out = []
+    for score in scores or []:
+        m = _BAT_RE.match(score.strip())
+        if m:
+            runs.append(int(m.group(1)))
+            not_out.append(1 if m.group(2) else 0)
+    return runs, not_out
+
+
+def parse_bowling(figures):
+    wickets = []
+    conceded = []
+    for figure in figures or []:
+        m = _BOWL_RE.match(figure.strip())
+        if m:
+            wickets.append(int(m.group(1)))
+            conceded.append(int(m.group(2)))
+    return wickets, conceded
+
+
+def typed_form(bat_scores=None, bowl_scores=None):
+    # The typed columns for whichever raw arrays were scraped
+    updates = {}
+    if bat_scores:
+        updates['batting_runs'], updates['batting_not_out'] = parse_batting(bat_scores)
+    if bowl_scores:
+        updates['bowling_wickets'], updates['bowling_runs'] = parse_bowling(bowl_scores)
+    return updates
+
+
+def backfill():
+    # Typed columns for every player that has raw form, from what is already stored
+    from config import get_client
+    from db_writer import BatchWriter
+    from roster import iter_roster
+
+    supabase = get_client()
+    written = 0
+    with BatchWriter(supabase) as writer:
+        for row in iter_roster(supabase, 'list_sr_no, batting_form, bowling_form'):
+            updates = typed_form(row.get('batting_form'), row.get('bowling_form'))
+            if updates:
+                writer.put(row['list_sr_no'], updates)
+                written += 1
+    if writer.failures:
+        print(f"Typed form failed for {len(writer.failures)} of {written} players.")
+        sys.exit(1)
+    print(f"Backfilled typed form for {written} players.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse raw form strings into typed integer arrays.")
+    parser.add_argument('batting', nargs='?', default='[]', help="JSON array of batting scores")
+    parser.add_argument('bowling', nargs='?', default='[]', help="JSON array of bowling figures")
+    parser.add_argument('--backfill', action='store_true', help="Write typed columns for every player with raw form")
+    args = parser.parse_args(argv)
+
+    if args.backfill:
+        backfill()
+    else:
+        print(json.dumps(typed_form(json.loads(args.batting), json.loads(args.bowling)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import re
+import numpy as np
+from matches_table import MAX_SCORES
+from form_records import typed_form, TYPED_COLUMNS
+
+# Append-only daily history of every player's valuation and form, so charts and
+# backtests can read years of it without the players table (which only holds the
+# latest scrape). Columnar NumPy partitions on disk, opened memory-mapped:
+#
+#   scraper/.history/daily/2026-10-18.npy    one day, sorted by list_sr_no
+#   scraper/.history/monthly/2026-08.npy     a compacted month, sorted by list_sr_no then day
+#
+# Each partition is one structured array with fixed-width fields (SNAPSHOT_DTYPE),
+# form padded to MAX_SCORES with -1. A day is written once per run; writing the
+# same day again merges into it, the newer snapshot of a player winning. Months
+# that ended more than COMPACT_AFTER_DAYS ago are compacted into one monthly
+# partition, so a player's range query does a binary search per file instead of
+# opening a file per day.
+#
+# The durable copy is the Supabase Storage bucket HISTORY_BUCKET, same layout
+# (daily/..., monthly/...; created by supabase/migrations/). The files on disk
+# are only a read cache of it: each run pulls the partitions it needs, appends
+# and compacts locally, then pushes what changed and removes the remote dailies
+# it compacted. remote.json next to the partitions remembers what was last
+# synced, so only changed files move. A lost cache is rebuilt from the bucket.
+#
+#   python scraper/history_store.py query --player 12 --since 2026-01-01
+#   python scraper/history_store.py compact
+#   python scraper/history_store.py stats
+#   python scraper/history_store.py sync [--since 2026-01-01]
+
+HISTORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.history')
+COMPACT_AFTER_DAYS = 35
+HISTORY_BUCKET = 'player-history'
+REMOTE_MANIFEST = 'remote.json'
+# Stands for a missing innings in the padded form fields
+PAD = -1
+
+SNAPSHOT_DTYPE = np.dtype([
+    ('list_sr_no', '<i4'),
+    ('day', '<i4'),  # days since 1970-01-01
+    ('price', '<f4'),
+    ('momentum', '<f4'),
+    ('volatility', '<f4'),
+    ('batting_runs', '<i2', (MAX_SCORES,)),
+    ('batting_not_out', 'i1', (MAX_SCORES,)),
+    ('bowling_wickets', 'i1', (MAX_SCORES,)),
+    ('bowling_runs', '<i2', (MAX_SCORES,)),
+    ('news_count', '<i2'),
+])
+
+_EPOCH = datetime.date(1970, 1, 1)
+_DAILY_RE = re.compile(r'^(\d{4}-\d{2}-\d{2})\.npy$')
+_MONTHLY_RE = re.compile(r'^(\d{4}-\d{2})\.npy$')
+
+
+def day_number(date):
+    # date, or 'YYYY-MM-DD' -> days since the epoch
+    if isinstance(date, str):
+        date = datetime.date.fromisoformat(date)
+    return (date - _EPOCH).days
+
+
+def day_date(number):
+    return _EPOCH + datetime.timedelta(days=int(number))
+
+
+def _month_end(month_start):
+    return (month_start + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(days=1)
+
+
+def _fill(field, values):
+    values = list(values or [])[:MAX_SCORES]
+    field[:len(values)] = values
+
+
+def snapshots(rows, day):
+    # players rows (typed form, news and the valuation columns) -> one snapshot array
+    records = np.zeros(len(rows), dtype=SNAPSHOT_DTYPE)
+    for name in ('batting_runs', 'batting_not_out', 'bowling_wickets', 'bowling_runs'):
+        records[name] = PAD
+    records['day'] = day_number(day)
+    for record, row in zip(records, rows):
+        record['list_sr_no'] = row['list_sr_no']
+        for name in ('price', 'momentum', 'volatility'):
+            record[name] = np.nan if row.get(name) is None else row[name]
+        # Rows scraped before the typed columns existed read them back as None: parse the strings
+        form = typed_form(row.get('batting_form'), row.get('bowling_form'))
+        form.update({name: row[name] for name in TYPED_COLUMNS if row.get(name) is not None})
+        for name in ('batting_runs', 'batting_not_out', 'bowling_wickets', 'bowling_runs'):
+            _fill(record[name], form.get(name))
+        record['news_count'] = len(row.get('news') or [])
+    return records
+
+
+def _merge(old, new):
+    # Union of two snapshot arrays, one entry per (player, day), new winning; sorted by player then day
+    both = np.concatenate([old, new])
+    order = np.lexsort((both['day'], both['list_sr_no']))
+    both = both[order[::-1]]
+    # After reversing, the first of each (player, day) run is the latest written
+    key = both['list_sr_no'].astype(np.int64) << 32 | both['day'].astype(np.int64) & 0xFFFFFFFF
+    _, first = np.unique(key, return_index=True)
+    return both[np.sort(first)][::-1]
+
+
+class HistoryStore:
+    def __init__(self, root=HISTORY_DIR):
+        self.root = root
+        self.daily_dir = os.path.join(root, 'daily')
+        self.monthly_dir = os.path.join(root, 'monthly')
+
+    def _daily_path(self, date):
+        return os.path.join(self.daily_dir, f"{date.isoformat()}.npy")
+
+    def _monthly_path(self, month):
+        return os.path.join(self.monthly_dir, f"{month}.npy")
+
+    def _partitions(self, directory, pattern):
+        if not os.path.isdir(directory):
+            return {}
+        found = {}
+        for name in os.listdir(directory):
+            m = pattern.match(name)
+            if m:
+                found[m.group(1)] = os.path.join(directory, name)
+        return dict(sorted(found.items()))
+
+    def daily(self):
+        return self._partitions(self.daily_dir, _DAILY_RE)
+
+    def monthly(self):
+        return self._partitions(self.monthly_dir, _MONTHLY_RE)
+
+    def _load(self, path):
+        return np.load(path, mmap_mode='r')
+
+    def _save(self, path, records):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.save(f, records)
+        os.replace(tmp, path)
+
+    def append(self, records, date=None):
+        # Add one day's snapshots; a month that is already compacted takes them directly
+        date = date or datetime.date.today()
+        month = date.strftime('%Y-%m')
+        records = records.copy()
+        records['day'] = day_number(date)
+        path = self._monthly_path(month)
+        if not os.path.exists(path):
+            path = self._daily_path(date)
+        if os.path.exists(path):
+            records = _merge(self._load(path), records)
+        else:
+            records = records[np.argsort(records['list_sr_no'], kind='stable')]
+        self._save(path, records)
+        return path
+
+    def query(self, pid=None, start=None, end=None):
+        # Snapshots for one player (or everyone) between two dates inclusive, sorted by player then day
+        first = day_number(start) if start else None
+        last = day_number(end) if end else None
+        months = self.monthly()
+        parts = []
+        for month, path in months.items():
+            month_start = datetime.date.fromisoformat(f"{month}-01")
+            month_end = _month_end(month_start)
+            if (last is not None and day_number(month_start) > last) or (first is not None and day_number(month_end) < first):
+                continue
+            parts.append(self._select(self._load(path), pid, first, last))
+        for date, path in self.daily().items():
+            # A daily file of a compacted month is a leftover of an interrupted compaction
+            if date[:7] in months:
+                continue
+            number = day_number(date)
+            if (first is not None and number < first) or (last is not None and number > last):
+                continue
+            parts.append(self._select(self._load(path), pid, first, last))
+        if not parts:
+            return np.zeros(0, dtype=SNAPSHOT_DTYPE)
+        found = np.concatenate(parts)
+        return found[np.lexsort((found['day'], found['list_sr_no']))]
+
+    def _select(self, part, pid, first, last):
+        # Partitions are sorted by list_sr_no, so a player is one contiguous slice
+        if pid is not None:
+            ids = part['list_sr_no']
+            part = part[np.searchsorted(ids, pid, 'left'):np.searchsorted(ids, pid, 'right')]
+        days = part['day']
+        keep = np.ones(len(part), dtype=bool)
+        if first is not None:
+            keep &= days >= first
+        if last is not None:
+            keep &= days <= last
+        return np.array(part[keep])
+
+    def compact(self, today=None, after_days=COMPACT_AFTER_DAYS):
+        # Fold the daily partitions of every month that ended over after_days ago into one file per month
+        cutoff = (today or datetime.date.today()) - datetime.timedelta(days=after_days)
+        by_month = {}
+        for date, path in self.daily().items():
+            month_start = datetime.date.fromisoformat(date).replace(day=1)
+            if _month_end(month_start) < cutoff:
+                by_month.setdefault(date[:7], []).append(path)
+
+        for month, paths in by_month.items():
+            target = self._monthly_path(month)
+            merged = self._load(target) if os.path.exists(target) else np.zeros(0, dtype=SNAPSHOT_DTYPE)
+            # The daily files win over anything the month already holds for the same days
+            merged = _merge(merged, np.concatenate([self._load(path) for path in paths]))
+            self._save(target, merged)
+            # Only once the month is safely on disk
+            for path in paths:
+                os.remove(path)
+            print(f"Compacted {len(paths)} days of {month} into {len(merged)} snapshots.")
+        return len(by_month)
+
+    def stats(self):
+        daily, monthly = self.daily(), self.monthly()
+        size = sum(os.path.getsize(p) for p in list(daily.values()) + list(monthly.values()))
+        rows = sum(len(self._load(p)) for p in list(daily.values()) + list(monthly.values()))
+        print(f"History: {len(daily)} daily and {len(monthly)} monthly partitions, "
+              f"{rows} snapshots, {size / 1e6:.1f} MB in {self.root}")
+
+
+def _sha1(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class RemoteHistory:
+    # The partitions in a Storage bucket, mirrored into a HistoryStore
+    def __init__(self, client, bucket=HISTORY_BUCKET, page_size=1000):
+        self.bucket = client.storage.from_(bucket)
+        self.page_size = page_size
+
+    def list(self):
+        # 'daily/2026-10-18.npy' -> updated_at, for every partition in the bucket
+        found = {}
+        for folder, pattern in (('daily', _DAILY_RE), ('monthly', _MONTHLY_RE)):
+            offset = 0
+            while True:
+                page = self.bucket.list(folder, {'limit': self.page_size, 'offset': offset,
+                                                 'sortBy': {'column': 'name', 'order': 'asc'}})
+                for item in page:
+                    if pattern.match(item['name']):
+                        found[f"{folder}/{item['name']}"] = item.get('updated_at')
+                if len(page) < self.page_size:
+                    break
+                offset += len(page)
+        return found
+
+    def _manifest_path(self, store):
+        return os.path.join(store.root, REMOTE_MANIFEST)
+
+    def _load_manifest(self, store):
+        try:
+            with open(self._manifest_path(store)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, store, manifest):
+        os.makedirs(store.root, exist_ok=True)
+        path = self._manifest_path(store)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=0, sort_keys=True)
+        os.replace(path + '.tmp', path)
+
+    def pull(self, store, since=None):
+        # Download every daily partition, and the monthly ones ending on or after since
+        # (plus any month that still has dailies, which compaction needs), when they
+        # changed since the last sync. A partition edited locally but never pushed is
+        # merged with the remote one, the local snapshots winning.
+        remote = self.list()
+        manifest = self._load_manifest(store)
+        months_with_dailies = {rel[len('daily/'):][:7] for rel in remote if rel.startswith('daily/')}
+        pulled = 0
+        for rel, updated in remote.items():
+            if rel.startswith('monthly/') and since is not None:
+                month = rel[len('monthly/'):][:7]
+                month_end = _month_end(datetime.date.fromisoformat(f"{month}-01"))
+                if month_end < datetime.date.fromisoformat(str(since)) and month not in months_with_dailies:
+                    continue
+            path = os.path.join(store.root, rel)
+            known = manifest.get(rel, {})
+            exists = os.path.exists(path)
+            if exists and known.get('updated_at') == updated:
+                continue
+            data = self.bucket.download(rel)
+            tmp = path + '.tmp'
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            if exists and _sha1(path) != known.get('sha1'):
+                store._save(path, _merge(np.load(tmp), store._load(path)))
+                os.remove(tmp)
+            else:
+                os.replace(tmp, path)
+            manifest[rel] = {'sha1': hashlib.sha1(data).hexdigest(), 'updated_at': updated}
+            pulled += 1
+        for rel in [rel for rel in manifest if rel not in remote]:
+            # Gone from the bucket (compacted by another run): drop the local copy unless
+            # it has changes of its own, which the next push uploads again
+            path = os.path.join(store.root, rel)
+            if os.path.exists(path) and _sha1(path) == manifest[rel]['sha1']:
+                os.remove(path)
+            del manifest[rel]
+        self._save_manifest(store, manifest)
+        if pulled:
+            print(f"Pulled {pulled} history partitions from storage.")
+        return pulled
+
+    def push(self, store):
+        # Upload the local partitions that changed since the last sync, then remove the
+        # remote dailies whose month this store has compacted
+        manifest = self._load_manifest(store)
+        local = {f"daily/{date}.npy": path for date, path in store.daily().items()}
+        local.update({f"monthly/{month}.npy": path for month, path in store.monthly().items()})
+        sent = {}
+        for rel, path in local.items():
+            digest = _sha1(path)
+            if manifest.get(rel, {}).get('sha1') == digest:
+                continue
+            with open(path, 'rb') as f:
+                self.bucket.upload(rel, f.read(), {'upsert': 'true', 'content-type': 'application/octet-stream'})
+            sent[rel] = digest
+        compacted = [rel for rel in manifest
+                     if rel.startswith('daily/') and rel not in local and f"monthly/{rel[6:13]}.npy" in local]
+        if compacted:
+            self.bucket.remove(compacted)
+            for rel in compacted:
+                del manifest[rel]
+        if sent:
+            remote = self.list()
+            for rel, digest in sent.items():
+                manifest[rel] = {'sha1': digest, 'updated_at': remote.get(rel)}
+        self._save_manifest(store, manifest)
+        if sent or compacted:
+            print(f"Pushed {len(sent)} history partitions to storage, removed {len(compacted)} compacted days.")
+        return len(sent)
+
+
+def record_day(rows, date=None, root=HISTORY_DIR, remote=None):
+    # Snapshot the given players rows as today's history and compact old months,
+    # syncing with the remote copy first and after when one is given
+    store = HistoryStore(root)
+    date = date or datetime.date.today()
+    if remote is not None:
+        remote.pull(store, since=date)
+    path = store.append(snapshots(rows, date), date)
+    print(f"Recorded {len(rows)} snapshots for {date.isoformat()} in {os.path.relpath(path, root)}.")
+    store.compact(date)
+    if remote is not None:
+        remote.push(store)
+    return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query and maintain the daily player history.")
+    parser.add_argument('--root', default=HISTORY_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    query = sub.add_parser('query', help="Print a player's snapshots in a date range")
+    query.add_argument('--player', type=int, required=True, help="list_sr_no")
+    query.add_argument('--since', help="YYYY-MM-DD, inclusive")
+    query.add_argument('--until', help="YYYY-MM-DD, inclusive")
+    compact = sub.add_parser('compact', help="Fold old daily partitions into monthly ones")
+    compact.add_argument('--after-days', type=int, default=COMPACT_AFTER_DAYS)
+    sub.add_parser('stats', help="Partition count and size")
+    sync = sub.add_parser('sync', help="Pull the partitions from the storage bucket and push local changes")
+    sync.add_argument('--since', help="YYYY-MM-DD; skip monthly partitions that ended before it")
+    sync.add_argument('--bucket', default=HISTORY_BUCKET)
+    args = parser.parse_args()
+
+    store = HistoryStore(args.root)
+    if args.command == 'query':
+        found = store.query(args.player, args.since, args.until)
+        for snap in found:
+            runs = [int(r) for r in snap['batting_runs'] if r != PAD]
+            wickets = [int(w) for w in snap['bowling_wickets'] if w != PAD]
+            print(f"{day_date(snap['day']).isoformat()}  price {snap['price']:>8.2f}  momentum {snap['momentum']:>+7.2%}  "
+                  f"volatility {snap['volatility']:.2f}  runs {runs}  wickets {wickets}  news {snap['news_count']}")
+        print(f"{len(found)} snapshots.")
+    elif args.command == 'compact':
+        store.compact(after_days=args.after_days)
+    elif args.command == 'sync':
+        from config import get_client
+        remote = RemoteHistory(get_client(), args.bucket)
+        remote.pull(store, since=args.since)
+        remote.push(store)
+        store.stats()
+    else:
+        store.stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import re
+import sys
+from html.parser import HTMLParser
+
+# Pulls the Bat/Bowl columns out of an ESPNcricinfo /matches page in one go.
+# The browser hands back the HTML of every table with a single script call and
+# the parsing happens here, instead of one WebDriver round trip per table,
+# header, row and cell. Works the same on a saved page, e.g.
+#   python scraper/matches_table.py saved_matches_page.html
+#
+# FIXTURES_DIR holds saved /matches pages and, in expected.json, the scores each
+# should give (null for pages without the table). --check runs them all, on the
+# whole page as the HTTP path sees it and on just its tables as TABLES_SCRIPT
+# returns them to the browser path, and exits non-zero on any difference:
+#   python scraper/matches_table.py --check
+
+# One RPC: the outer HTML of every table on the page
+TABLES_SCRIPT = "return Array.from(document.querySelectorAll('table'), t => t.outerHTML).join('');"
+
+# Scores kept per discipline
+MAX_SCORES = 10
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'matches')
+
+
+class _TableCollector(HTMLParser):
+    # Collects, for each <table>, its <th> texts and the <td> texts of each <tbody> row.
+    # Cells of nested tables belong to the nested table only.
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tables = []
+        self._open = []  # stack of open tables: {'headers', 'rows', 'tbody', 'row'}
+        self._cell = None  # text parts of the current th/td
+        self._cell_tag = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            table = {'headers': [], 'rows': [], 'tbody': 0, 'row': None}
+            self._open.append(table)
+            self.tables.append(table)
+            return
+        if not self._open:
+            return
+        table = self._open[-1]
+        if tag == 'tbody':
+            table['tbody'] += 1
+        elif tag == 'tr' and table['tbody']:
+            table['row'] = []
+            table['rows'].append(table['row'])
+        elif tag in ('th', 'td'):
+            self._cell = []
+            self._cell_tag = tag
+        elif tag == 'br' and self._cell is not None:
+            self._cell.append('\n')
+
+    def handle_endtag(self, tag):
+        if not self._open:
+            return
+        table = self._open[-1]
+        if tag in ('th', 'td') and self._cell is not None:
+            self._close_cell(table)
+        elif tag == 'tr':
+            table['row'] = None
+        elif tag == 'tbody':
+            table['tbody'] = max(0, table['tbody'] - 1)
+        elif tag == 'table':
+            if self._cell is not None:
+                self._close_cell(table)
+            self._open.pop()
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def _close_cell(self, table):
+        # Collapse whitespace the way rendered element text does
+        text = ' '.join(''.join(self._cell).split())
+        if self._cell_tag == 'th':
+            table['headers'].append(text)
+        elif table['row'] is not None:
+            table['row'].append(text)
+        self._cell = None
+        self._cell_tag = None
+
+
+def parse_tables(html):
+    collector = _TableCollector()
+    collector.feed(html)
+    collector.close()
+    return collector.tables
+
+
+def _split_scores(val):
+    # '12 & 40*' -> ['12', '40*'], dropping '--' placeholders
+    if not val or val == '--':
+        return []
+    if '&' not in val:
+        return [val]
+    return [p.strip() for p in val.split('&') if p.strip() and p.strip() != '--']
+
+
+def extract_scores(html, limit=MAX_SCORES):
+    # Returns (bat_scores, bowl_scores) from the Recent Matches table, or None if there is no
+    # table with both 'Bat' and 'Match' headers
+    for table in parse_tables(html):
+        texts = table['headers']
+        if "Bat" in texts and "Match" in texts:
+            break
+    else:
+        return None
+
+    bat_index = texts.index("Bat")
+    bowl_index = texts.index("Bowl") if "Bowl" in texts else -1
+
+    bat_scores = []
+    bowl_scores = []
+    for cols in table['rows']:
+        if len(cols) > bat_index:
+            bat_scores.extend(_split_scores(cols[bat_index]))
+        if bowl_index != -1 and len(cols) > bowl_index:
+            bowl_scores.extend(_split_scores(cols[bowl_index]))
+
+        # Test matches split into two innings, so the limit is on scores, not rows
+        bat_scores = bat_scores[:limit]
+        bowl_scores = bowl_scores[:limit]
+        if len(bat_scores) >= limit and len(bowl_scores) >= limit:
+            break
+
+    return bat_scores, bowl_scores
+
+
+def _tables_only(html):
+    # What TABLES_SCRIPT hands back: the outer HTML of each table, concatenated.
+    # Good enough for the fixtures, which have no nested tables.
+    return ''.join(re.findall(r'<table\b.*?</table>', html, re.S | re.I))
+
+
+def check_fixtures(directory=FIXTURES_DIR):
+    # Number of fixture runs whose scores differ from expected.json
+    with open(os.path.join(directory, 'expected.json'), encoding='utf-8') as f:
+        expected = json.load(f)
+    failures = 0
+    for name, want in sorted(expected.items()):
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            page = f.read()
+        want = None if want is None else (want['bat'], want['bowl'])
+        for source, html in (('page', page), ('tables', _tables_only(page))):
+            got = extract_scores(html)
+            got = None if got is None else tuple(got)
+            if got != want:
+                failures += 1
+                print(f"{name} ({source}): expected {want}, got {got}")
+    print(f"{len(expected)} fixtures, {failures} mismatches.")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract the Bat/Bowl scores from a saved /matches page.")
+    parser.add_argument('page', nargs='?', help="Saved page to read")
+    parser.add_argument('--check', action='store_true', help=f"Check every fixture in {FIXTURES_DIR} against expected.json")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        sys.exit(1 if check_fixtures() else 0)
+    if not args.page:
+        parser.error("give a saved page or --check")
+
+    with open(args.page, encoding='utf-8') as f:
+        result = extract_scores(f.read())
+    if result is None:
+        print("Could not locate Recent Matches table with 'Bat' column.")
+        sys.exit(1)
+    print(f"Bat Scores: {result[0]}")
+    print(f"Bowl Scores: {result[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,124 +1,103 @@
-import os
-import time
-import random
-from supabase import create_client, Client
-from dotenv import load_dotenv
-import undetected_chromedriver as uc
+from urllib.parse import quote_plus
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from search_results import news_results, normalize_link
+from browser_pool import PageBlocked
+import run_metrics
 
-# Load environment variables
-load_dotenv('.env')
+# The browser stack is imported where it is used, as in form.py
 
-url: str = os.environ.get("SUPABASE_PROJECT_URL")
-key: str = os.environ.get("SUPABASE_ANON_KEY")
-service_key: str = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
-
-if not url or not key:
-    print("Error: Supabase URL or Key not found.")
-    exit(1)
-
-# Initialize Supabase
-supabase: Client = create_client(url, service_key if service_key else key)
+# Google's News tab when nothing matches (it has no #rso then)
+NO_RESULTS_TEXT = "did not match any"
 
 def get_driver():
+    import undetected_chromedriver as uc
     options = uc.ChromeOptions()
     options.add_argument("--start-maximized")
     options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
     driver = uc.Chrome(options=options, use_subprocess=True) 
     return driver
 
-def scrape_news(driver, player_name):
+def scrape_news(driver, player_name, fetcher=None):
+    # Up to five {headline, link}; [] when Google has no news for the player.
+    # Errors and the unusual-traffic page raise, so they never count as a visit.
     query = f"{player_name} cricket"
     print(f"Searching news for: {query}")
+
+    if fetcher and fetcher.wants('news'):
+        # Fast path: the plain News tab, when its HTML has the result headings
+        with run_metrics.span('news.http'):
+            html = fetcher.get("https://www.google.com/search?hl=en&tbm=nws&q=" + quote_plus(query))
+        with run_metrics.span('extraction'):
+            news_items = news_results(html) if html else []
+        if news_items:
+            fetcher.record('news', 'http')
+            return news_items
     
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
     # Go directly to News tab
     url = f"https://www.google.com/search?q={query}&tbm=nws"
-    driver.get(url)
-    
-    # Random sleep
-    time.sleep(random.uniform(2, 4))
+    with run_metrics.span('news.navigation'):
+        driver.get(url)
     
     news_items = []
     
     try:
         # Wait for results
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "rso"))
-        )
+        with run_metrics.span('news.results_wait'):
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_element_located((By.ID, "rso"))
+            )
+        if fetcher:
+            fetcher.record('news', 'browser')
         
-        # Find result containers
-        # The structure of Google News results can vary, but usually they are in div#rso > div
-        # Find all headings directly
-        headings = driver.find_elements(By.CSS_SELECTOR, "div#rso div[role='heading']")
+        with run_metrics.span('extraction'):
+            # Find result containers
+            # The structure of Google News results can vary, but usually they are in div#rso > div
+            # Find all headings directly
+            headings = driver.find_elements(By.CSS_SELECTOR, "div#rso div[role='heading']")
         
-        for heading in headings:
-            try:
-                title = heading.text.strip()
-                if not title:
-                    continue
+            for heading in headings:
+                try:
+                    title = heading.text.strip()
+                    if not title:
+                        continue
                     
-                # Find parent anchor tag
-                # xpath: ancestor::a[1]
-                link_el = heading.find_element(By.XPATH, "./ancestor::a[1]")
-                link = link_el.get_attribute("href")
+                    # Find parent anchor tag
+                    # xpath: ancestor::a[1]
+                    link_el = heading.find_element(By.XPATH, "./ancestor::a[1]")
+                    link = normalize_link(link_el.get_attribute("href"))
                 
-                if link and title:
-                     # Check if we already have this link to avoid duplicates
-                    if not any(item['link'] == link for item in news_items):
-                         news_items.append({"headline": title, "link": link})
+                    if link and title:
+                         # Check if we already have this link to avoid duplicates
+                        if not any(item['link'] == link for item in news_items):
+                             news_items.append({"headline": title, "link": link})
                 
-                if len(news_items) >= 5:
-                    break
-            except Exception:
-                continue
+                    if len(news_items) >= 5:
+                        break
+                except Exception:
+                    continue
                 
     except Exception as e:
+        # Google's "unusual traffic" page lives under /sorry/; slow the domain down
+        if "/sorry/" in driver.current_url:
+            run_metrics.failure('unusual_traffic')
+            if hasattr(driver, 'mark_blocked'):
+                driver.mark_blocked(driver.current_url)
+            raise PageBlocked(f"Unusual traffic page for {player_name}") from e
+        if NO_RESULTS_TEXT in driver.page_source:
+            # The page loaded; there is just no news for this player
+            return news_items
         print(f"Error scraping news for {player_name}: {e}")
-        
-    return news_items
+        run_metrics.failure(f"news:{type(e).__name__}")
+        raise
 
-def main():
-    print("Fetching players from Supabase...")
-    try:
-        # Order by list_sr_no to be deterministic
-        response = supabase.table('players').select('list_sr_no, first_name, surname').order('list_sr_no', desc=False).execute()
-        players = response.data
-    except Exception as e:
-        print(f"Supabase error: {e}")
-        return
-
-    if not players:
-        print("No players found.")
-        return
+    return news_items
 
-    print(f"Found {len(players)} players.")
-    
-    driver = get_driver()
-    
-    try:
-        for p in players:
-            pid = p['list_sr_no']
-            name = f"{p['first_name']} {p['surname']}".strip()
-            
-            news = scrape_news(driver, name)
-            
-            if news:
-                print(f"Found {len(news)} news items for {name}.")
-                try:
-                    # Update 'news' column (JSONB)
-                    supabase.table('players').update({"news": news}).eq('list_sr_no', pid).execute()
-                    print(f"Updated DB for {name}.")
-                except Exception as e:
-                    print(f"Error updating DB: {e}")
-            else:
-                 print(f"No news found for {name}.")
-            
-            time.sleep(random.uniform(2, 5))
-            
-    finally:
-        driver.quit()
+def main(argv=None):
+    # The crawler fetches the roster, runs the browsers and writes the results
+    import crawl
+    crawl.main(stages=['news'], description="Scrape recent news headlines for every player.", argv=argv)
 
 if __name__ == "__main__":
     main()
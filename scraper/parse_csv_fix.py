@@ -1,356 +1,302 @@
+import argparse
 import csv
+import io
+import os
 import re
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+KNOWN_COUNTRIES = [
+    "New Zealand", "Australia", "India", "South Africa", "England",
+    "Sri Lanka", "West Indies", "Afghanistan", "Bangladesh", "Ireland",
+    "Zimbabwe", "Pakistan", "Scotland", "Netherlands", "Nepal", "USA", "UAE", "Namibia", "Oman"
+]
+
+KNOWN_TEAMS = ["CSK", "DC", "GT", "KKR", "LSG", "MI", "PBKS", "RCB", "RR", "SRH"]
+
+SPECIALISMS = ["BATTER", "BOWLER", "ALL-ROUNDER", "WICKETKEEPER"]
+
+BATTING_STYLES = ["LHB", "RHB"]
+
+# Output columns, in order. The second Surname column is keyed Surname_End.
+FIELDS = [
+    "List Sr. No.", "Set No.", "2026 Set", "First Name", "Surname", "Country",
+    "State Assoc", "DOB", "Age", "Specialism", "Style",
+    "Test caps", "ODI caps", "T20 caps", "IPL", "2025 Team", "2025 IPL",
+    "C/U/A", "Reserve Price", "Surname_End"
+]
+
+HEADERS = FIELDS[:-1] + ["Surname"]
+
+STATUSES = ("Capped", "Uncapped")
+
 
 def get_known_countries():
-    return [
-        "New Zealand", "Australia", "India", "South Africa", "England", 
-        "Sri Lanka", "West Indies", "Afghanistan", "Bangladesh", "Ireland",
-        "Zimbabwe", "Pakistan", "Scotland", "Netherlands", "Nepal", "USA", "UAE", "Namibia", "Oman"
-    ]
+    return list(KNOWN_COUNTRIES)
 
 def get_known_teams():
-    return ["CSK", "DC", "GT", "KKR", "LSG", "MI", "PBKS", "RCB", "RR", "SRH"]
+    return list(KNOWN_TEAMS)
 
-def parse_line_full(line):
-    # Try comma separated first (lines 1-8ish)
+
+# --- Matchers, built once at import ---
+
+# Longest country first, so "South Africa" is preferred over a shorter name
+# when a line mentions more than one
+_COUNTRIES_BY_PRIORITY = sorted(KNOWN_COUNTRIES, key=len, reverse=True)
+_COUNTRY_KEYS = [(c, c.lower()) for c in _COUNTRIES_BY_PRIORITY]
+
+# Single alternation for non-ASCII text, where lower() and IGNORECASE can disagree.
+# Group cN matches _COUNTRIES_BY_PRIORITY[N].
+_COUNTRY_RE = re.compile(
+    r'\b(?:' + '|'.join(f'(?P<c{rank}>{re.escape(c)})' for rank, c in enumerate(_COUNTRIES_BY_PRIORITY)) + r')\b',
+    re.IGNORECASE,
+)
+
+_DOB_RE = re.compile(r'\d{1,2}/\d{1,2}/\d{4}')
+
+# Token classifier for the fields after DOB
+_SPECIALISM = 1
+_STYLE = 2
+_TEAM = 3
+_TOKEN_CLASS = {}
+_TOKEN_CLASS.update((t, _SPECIALISM) for t in SPECIALISMS)
+_TOKEN_CLASS.update((t, _STYLE) for t in BATTING_STYLES)
+_TOKEN_CLASS.update((t, _TEAM) for t in KNOWN_TEAMS)
+
+
+def _is_word_char(ch):
+    # Same character class as regex \w
+    return ch.isalnum() or ch == '_'
+
+
+def _find_word(text, word):
+    # Index of the first occurrence of word in text bounded like r'\bword\b', or -1.
+    # word must start and end with word characters.
+    n = len(word)
+    i = text.find(word)
+    while i != -1:
+        j = i + n
+        if (i == 0 or not _is_word_char(text[i - 1])) and (j == len(text) or not _is_word_char(text[j])):
+            return i
+        i = text.find(word, i + 1)
+    return -1
+
+
+def _find_country(text):
+    # (index, country) of the highest priority country mentioned as whole words, case-insensitively
+    if text.isascii():
+        low = text.lower()
+        for country, key in _COUNTRY_KEYS:
+            if key in low:
+                i = _find_word(low, key)
+                if i != -1:
+                    return i, country
+        return -1, ""
+
+    best_rank = len(_COUNTRIES_BY_PRIORITY)
+    idx = -1
+    for m in _COUNTRY_RE.finditer(text):
+        rank = int(m.lastgroup[1:])
+        if rank < best_rank:
+            best_rank = rank
+            idx = m.start()
+    return (idx, _COUNTRIES_BY_PRIORITY[best_rank]) if idx != -1 else (-1, "")
+
+
+def _find_status(text):
+    # (index, status) of the first whole-word Capped/Uncapped, or (-1, "")
+    best = -1
+    status = ""
+    for word in STATUSES:
+        i = _find_word(text, word)
+        if i != -1 and (best == -1 or i < best):
+            best = i
+            status = word
+    return best, status
+
+
+def _split_csv(line):
+    # Plain lines split faster with str.split; anything csv would treat
+    # specially (quotes, embedded line breaks, NULs) goes through the csv module
+    if '"' in line or '\r' in line or '\n' in line or '\0' in line:
+        return next(csv.reader([line]))
+    return line.split(',')
+
+
+def _parse_comma_line(parts):
     # Expected: List Sr. No., Set No., 2026 Set, First Name, Surname, Country, State Assoc, DOB, Age, Specialism, Style, Test caps, ODI caps, T20 caps, IPL, 2025 Team, 2025 IPL, C/U/A,Reserve Price, Surname
-    if line.count(',') > 15:
-        parts = next(csv.reader([line]))
-        if len(parts) >= 15:
-            # Check for Bowling Style insertion at Index 11 (Test caps)
-            # If parts[11] is text (like "RIGHT ARM..."), it's likely a shift.
-            # Real test caps should be a number (or empty).
-            
-            # Helper to check if string looks like a number
-            def is_stat(s):
-                return re.match(r'^\d*$', s.strip()) is not None
-            
-            # Base indices
-            idx_test = 11
-            
-            # If Test Caps is NOT a number and has text, assume shift
-            if not is_stat(parts[idx_test]) and len(parts[idx_test].strip()) > 0:
-                # Shift indices by 1
-                shift = 1
-            else:
-                shift = 0
-                
-            idx_test += shift
-            idx_odi = 12 + shift
-            idx_t20 = 13 + shift
-            idx_ipl = 14 + shift
-            idx_team = 15 + shift
-            idx_ipl25 = 16 + shift
-            idx_status = 17 + shift
-            idx_price = 18 + shift
-            idx_surname = 19 + shift
-            
-            # Identify Status Index to realign
-            # Search for Capped/Uncapped in the remaining parts
-            remaining_parts = parts[idx_team:]
-            
-            status_idx_rel = -1
-            for i, p in enumerate(remaining_parts):
-                if p.strip() in ["Capped", "Uncapped"]:
-                    status_idx_rel = i
-                    break
-            
-            val_team = ""
-            val_ipl25 = ""
-            val_status = ""
-            val_price = ""
-            val_surname = ""
-            
-            if status_idx_rel != -1:
-                # Found status.
-                # parts[idx_team + status_idx_rel] is Status.
-                abs_status_idx = idx_team + status_idx_rel
-                val_status = parts[abs_status_idx].strip()
-                
-                # Items before Status (from idx_team to abs_status_idx)
-                # Could be (Team, IPL25) or (Team) or ()
-                between_tokens = parts[idx_team:abs_status_idx]
-                
-                if len(between_tokens) == 2:
-                    val_team = between_tokens[0].strip()
-                    val_ipl25 = between_tokens[1].strip()
-                elif len(between_tokens) == 1:
-                    # check if it looks like IPL Num or Team
-                    # Heuristic: Teams are words, IPL25 is num
-                    t = between_tokens[0].strip()
-                    if t.isdigit():
-                        val_ipl25 = t
-                    else:
-                        val_team = t
-                
-                # Items after Status
-                # Expect Price, Surname
-                post_tokens = parts[abs_status_idx+1:]
-                if len(post_tokens) >= 1: val_price = post_tokens[0].strip()
-                if len(post_tokens) >= 2: val_surname = post_tokens[1].strip()
+    n = len(parts)
+
+    def get_part(i):
+        return parts[i].strip() if i < n else ""
+
+    # A Bowling Style value in the Test caps slot means everything after it is shifted by one.
+    # Real test caps are a number (or empty).
+    test_caps = parts[11].strip()
+    shift = 1 if test_caps and not test_caps.isdecimal() else 0
+
+    idx_team = 15 + shift
+
+    val_team = ""
+    val_ipl25 = ""
+    val_status = ""
+    val_price = ""
+    val_surname = ""
+
+    # Realign on the Capped/Uncapped column, which is the most reliable anchor
+    abs_status_idx = -1
+    for i in range(idx_team, n):
+        if parts[i].strip() in STATUSES:
+            abs_status_idx = i
+            break
+
+    if abs_status_idx != -1:
+        val_status = parts[abs_status_idx].strip()
+
+        # Between team slot and status: (Team, IPL25), (Team), (IPL25) or nothing
+        between = abs_status_idx - idx_team
+        if between == 2:
+            val_team = parts[idx_team].strip()
+            val_ipl25 = parts[idx_team + 1].strip()
+        elif between == 1:
+            t = parts[idx_team].strip()
+            if t.isdigit():
+                val_ipl25 = t
             else:
-                # No status found? Fallback to fixed indexing
-                val_team = get_part(idx_team)
-                val_ipl25 = get_part(idx_ipl25)
-                val_status = get_part(idx_status)
-                val_price = get_part(idx_price)
-                val_surname = get_part(idx_surname)
-
-            return {
-                "List Sr. No.": parts[0].strip(),
-                "Set No.": parts[1].strip(),
-                "2026 Set": parts[2].strip(),
-                "First Name": parts[3].strip(),
-                "Surname": parts[4].strip(),
-                "Country": parts[5].strip(),
-                "State Assoc": parts[6].strip(),
-                "DOB": parts[7].strip(),
-                "Age": parts[8].strip(),
-                "Specialism": parts[9].strip(),
-                "Style": parts[10].strip(),
-                "Test caps": get_part(idx_test),
-                "ODI caps": get_part(idx_odi),
-                "T20 caps": get_part(idx_t20),
-                "IPL": get_part(idx_ipl),
-                "2025 Team": val_team,
-                "2025 IPL": val_ipl25,
-                "C/U/A": val_status,
-                "Reserve Price": val_price,
-                "Surname_End": val_surname
-            }
-
-    # Malformed Parsing
-    # 1. Anchors: DOB, Status
-    
-    # Clean line
+                val_team = t
+
+        # After status: Price, Surname
+        if n > abs_status_idx + 1: val_price = parts[abs_status_idx + 1].strip()
+        if n > abs_status_idx + 2: val_surname = parts[abs_status_idx + 2].strip()
+    else:
+        # No status found, fall back to fixed indexing
+        val_team = get_part(idx_team)
+        val_ipl25 = get_part(16 + shift)
+        val_status = get_part(17 + shift)
+        val_price = get_part(18 + shift)
+        val_surname = get_part(19 + shift)
+
+    return {
+        "List Sr. No.": parts[0].strip(),
+        "Set No.": parts[1].strip(),
+        "2026 Set": parts[2].strip(),
+        "First Name": parts[3].strip(),
+        "Surname": parts[4].strip(),
+        "Country": parts[5].strip(),
+        "State Assoc": parts[6].strip(),
+        "DOB": parts[7].strip(),
+        "Age": parts[8].strip(),
+        "Specialism": parts[9].strip(),
+        "Style": parts[10].strip(),
+        "Test caps": get_part(11 + shift),
+        "ODI caps": get_part(12 + shift),
+        "T20 caps": get_part(13 + shift),
+        "IPL": get_part(14 + shift),
+        "2025 Team": val_team,
+        "2025 IPL": val_ipl25,
+        "C/U/A": val_status,
+        "Reserve Price": val_price,
+        "Surname_End": val_surname
+    }
+
+
+def _parse_malformed_line(line):
+    # Anchors: DOB splits identity from stats, Status splits stats from price/surname
     line = line.strip()
-    
-    # ANCHOR: DOB (\d{1,2}/\d{1,2}/\d{4})
-    dob_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', line)
+
+    dob_match = _DOB_RE.search(line)
     if not dob_match:
         return None
-    
-    dob = dob_match.group(1)
-    pre_dob = line[:dob_match.start()].strip()
+
     post_dob = line[dob_match.end():].strip()
-    
-    # --- PART 1: Pre-DOB (Sr, Set, 2026Set, Name, Country, State) ---
-    # Heuristic: Sr, Set, 2026Set are usually distinct at start.
-    # But clean commas might be missing or partial.
-    # Text: "9, 2 AL1 Deepak Hooda India RCA"
-    # Text: "8, 2 AL1 Wanindu Hasaranga Sri Lanka"
-    
-    # Remove initial commas and split
-    pre_tokens = re.split(r'[,\s]+', pre_dob)
-    # Filter empty
-    pre_tokens = [t for t in pre_tokens if t]
-    
+    status_idx, status = _find_status(post_dob)
+    if status_idx == -1:
+        return None
+
+    # --- Pre-DOB: Sr, Set, 2026 Set, Name..., Country, [State] ---
+    # e.g. "9, 2 AL1 Deepak Hooda India RCA"
+    pre_tokens = line[:dob_match.start()].replace(',', ' ').split()
     if len(pre_tokens) < 4:
         return None
-        
-    sr_no = pre_tokens[0]
-    set_no = pre_tokens[1]
-    set_2026 = pre_tokens[2]
-    
-    # Remaining tokens: Name components + Country + [State]
-    name_geo_tokens = pre_tokens[3:]
-    name_geo_text = " ".join(name_geo_tokens)
-    
-    # Find Country from right
-    known_countries = get_known_countries()
-    sorted_countries = sorted(known_countries, key=len, reverse=True)
-    
-    country = ""
+
+    name_geo_text = " ".join(pre_tokens[3:])
+
+    country_idx, country = _find_country(name_geo_text)
+
     state_assoc = ""
     name_part = name_geo_text
-    
-    # Check for State Assoc (2-5 UPPERCASE letters at end, not Country)
-    # Assuming State is last
-    potential_state_match = re.search(r'\b([A-Z]{2,6})$', name_geo_text)
-    if potential_state_match:
-        cand_state = potential_state_match.group(1)
-        # Verify it's not a country name (USA, UAE)
-        if cand_state not in ["USA", "UAE", "OMAN"]: # rudimentary check
-             # Also check if it's part of the country name? "South Africa" -> Africa? No.
-             # Actually, if Country is "India", "RCA" is distinct.
-             # Let's try to match Country first.
-             pass
-
-    # Strategy: Find valid Country string.
-    # It might be followed by State.
-    country_found_idx = -1
-    found_country_name = ""
-    
-    for c in sorted_countries:
-        # Case insensitive regex search
-        # Match 'Country' as whole word(s)
-        # Escape for regex
-        c_esc = re.escape(c)
-        pattern = re.compile(r'\b' + c_esc + r'\b', re.IGNORECASE)
-        match = pattern.search(name_geo_text)
-        if match:
-             # If multiple matches?? Take the last one?
-             # Usually only one country.
-             country_found_idx = match.start()
-             found_country_name = c # Standardize case? Or use match?
-             # Use the actual text case to remove it properly? Or just index.
-             # Let's use clean name
-             country = c
-             break
-             
     if country:
-        # Name is before country
-        name_part = name_geo_text[:country_found_idx].strip()
-        # State is after country
-        # End of country match
-        country_end = country_found_idx + len(found_country_name) # Approx if regex matched len
-        # Actually regex match object has .end()
-        # But let's assume we grabbed it.
-        remainder_after_country = name_geo_text[country_found_idx:].replace(found_country_name, "", 1).strip()
-        # If remainder exists, it's likely State
-        state_assoc = remainder_after_country.replace(",", "").strip() # Clean commas
-    else:
-        # No country found? Fail or assume tokens?
-        pass
+        name_part = name_geo_text[:country_idx].strip()
+        # Whatever follows the country is the state association
+        state_assoc = name_geo_text[country_idx:].replace(country, "", 1).strip()
 
-    # Split Name
     name_tokens = name_part.split()
-    if len(name_tokens) > 0:
-        first_name = name_tokens[0]
-        surname = " ".join(name_tokens[1:])
-    else:
-        first_name = ""
-        surname = ""
-
-    # --- PART 2: Post-DOB (Age ... Status ... Surname) ---
-    # Text: "30 ALL-ROUNDER RHB RIGHT ARM Off Spin 10 21 125 CSK 7 Capped 75 Hooda"
-    
-    # ANCHOR: Status (Capped/Uncapped)
-    status_match = re.search(r'\b(Capped|Uncapped)\b', post_dob)
-    if not status_match:
-        return None
-        
-    status = status_match.group(1)
-    
-    # Text BEFORE Status: "30 ALL-ROUNDER ... 7 "
-    middle_text = post_dob[:status_match.start()].strip()
-    
-    # Text AFTER Status: " 75 Hooda" (Reserve Price, Surname)
-    end_text = post_dob[status_match.end():].strip()
-    end_tokens = end_text.split()
-    
-    reserve_price = ""
-    surname_end = ""
-    if len(end_tokens) >= 1:
-        reserve_price = end_tokens[0]
-        if len(end_tokens) >= 2:
-            surname_end = " ".join(end_tokens[1:])
-            
-    # Parse Middle Text
-    # "30 ALL-ROUNDER RHB RIGHT ARM Off Spin 10 21 125 CSK 7"
-    middle_tokens = middle_text.split()
-    
-    age = middle_tokens[0] if middle_tokens else ""
-    
-    # Specialism (BATTER, ALL-ROUNDER, BOWLER, WICKETKEEPER)
+    first_name = name_tokens[0] if name_tokens else ""
+    surname = " ".join(name_tokens[1:])
+
+    # --- Post-DOB: Age [Specialism] [Style] [Bowling style...] Stats... [Team] [IPL25] Status Price Surname ---
+    # e.g. "30 ALL-ROUNDER RHB RIGHT ARM Off Spin 10 21 125 CSK 7 Capped 75 Hooda"
+    end_tokens = post_dob[status_idx + len(status):].split()
+    reserve_price = end_tokens[0] if end_tokens else ""
+    surname_end = " ".join(end_tokens[1:])
+
+    tokens = post_dob[:status_idx].split()
+    n = len(tokens)
+
+    # Walk the tokens once: age -> specialism? -> style? -> bowling style words up to the first number -> stats
+    age = tokens[0] if n else ""
+    i = 1
+
     specialism = ""
-    spec_idx = 1
-    # Check if index 1 is Specialism
-    if len(middle_tokens) > 1 and middle_tokens[1] in ["BATTER", "BOWLER", "ALL-ROUNDER", "WICKETKEEPER"]:
-        specialism = middle_tokens[1]
-        spec_idx = 2
-    
-    # Style (LHB, RHB)
+    if i < n and _TOKEN_CLASS.get(tokens[i]) == _SPECIALISM:
+        specialism = tokens[i]
+        i += 1
+
     style = ""
-    style_idx = spec_idx
-    if len(middle_tokens) > style_idx and middle_tokens[style_idx] in ["LHB", "RHB"]:
-        style = middle_tokens[style_idx]
-        style_idx += 1
-        
-    # Bowling Style?
-    # Anything between Style and the first Digit?
-    # "RIGHT ARM Off Spin" -> 4 tokens.
-    # Stats (Test, ODI, T20, IPL) start with digits.
-    # Team (CSK etc) is Uppercase.
-    
-    # Consume tokens until we hit a digit (Stats)
-    next_idx = style_idx
-    while next_idx < len(middle_tokens):
-        token = middle_tokens[next_idx]
-        if re.match(r'^\d+$', token):
-            break
-        next_idx += 1
-        
-    # Consumed tokens are bowling style (ignored for specific column, but consumed)
-    
-    # Remaining: Stats + Team
-    remaining_tokens = middle_tokens[next_idx:]
-    
-    # Mapping stats is heuristic because columns can be missing/merged?
-    # "10 21 125 CSK 7" -> 5 tokens.
-    # "4 68 90 37 RR 11" -> 6 tokens.
-    # "11 6 12 1 LSG 1" -> 6 tokens.
-    # Standard: Test, ODI, T20, IPL_Caps, Team, IPL_2025_Matches?
-    # Wait, in the full CSV header: `Test caps, ODI caps, T20 caps, IPL, 2025 Team, 2025 IPL` (6 cols)
-    
-    test_caps = ""
-    odi_caps = ""
-    t20_caps = ""
-    ipl_caps = ""
+    if i < n and _TOKEN_CLASS.get(tokens[i]) == _STYLE:
+        style = tokens[i]
+        i += 1
+
+    # Bowling style words are consumed but not kept
+    while i < n and not tokens[i].isdecimal():
+        i += 1
+
+    # Stats: Test, ODI, T20, IPL caps, then 2025 Team and 2025 IPL matches
     team_2025 = ""
     ipl_2025 = ""
-    
-    known_teams = get_known_teams()
-    
-    # Identify Team index in remaining_tokens
-    team_idx = -1
-    for i, t in enumerate(remaining_tokens):
-        if t in known_teams:
-            team_idx = i
-            team_2025 = t
+    caps = tokens[i:]
+    for j in range(i, n):
+        if _TOKEN_CLASS.get(tokens[j]) == _TEAM:
+            team_2025 = tokens[j]
+            caps = tokens[i:j]
+            if j + 1 < n:
+                ipl_2025 = tokens[j + 1]
             break
-            
-    if team_idx != -1:
-        # Tokens before team are caps
-        caps_tokens = remaining_tokens[:team_idx]
-        # Tokens after team are 2025 IPL
-        post_team_tokens = remaining_tokens[team_idx+1:]
-        
-        # Populate caps from right to left? or Left to right.
-        # usually Test, ODI, T20, IPL
-        if len(caps_tokens) >= 1: test_caps = caps_tokens[0]
-        if len(caps_tokens) >= 2: odi_caps = caps_tokens[1]
-        if len(caps_tokens) >= 3: t20_caps = caps_tokens[2]
-        if len(caps_tokens) >= 4: ipl_caps = caps_tokens[3]
-        
-        if len(post_team_tokens) >= 1: ipl_2025 = post_team_tokens[0]
     else:
-        # No team found. All tokens are stats?
-        # Or maybe Team is missing?
-        caps_tokens = remaining_tokens
-        if len(caps_tokens) >= 1: test_caps = caps_tokens[0]
-        if len(caps_tokens) >= 2: odi_caps = caps_tokens[1]
-        if len(caps_tokens) >= 3: t20_caps = caps_tokens[2]
-        if len(caps_tokens) >= 4: ipl_caps = caps_tokens[3]
-        if len(caps_tokens) >= 5: ipl_2025 = caps_tokens[4] # ??
+        if len(caps) >= 5:
+            # No team; a fifth number is taken as 2025 IPL matches
+            ipl_2025 = caps[4]
+
+    if len(caps) < 4:
+        caps = caps + [""] * (4 - len(caps))
 
     return {
-        "List Sr. No.": sr_no,
-        "Set No.": set_no,
-        "2026 Set": set_2026,
+        "List Sr. No.": pre_tokens[0],
+        "Set No.": pre_tokens[1],
+        "2026 Set": pre_tokens[2],
         "First Name": first_name,
         "Surname": surname,
         "Country": country,
         "State Assoc": state_assoc,
-        "DOB": dob,
+        "DOB": dob_match.group(),
         "Age": age,
         "Specialism": specialism,
         "Style": style,
-        "Test caps": test_caps,
-        "ODI caps": odi_caps,
-        "T20 caps": t20_caps,
-        "IPL": ipl_caps,
+        "Test caps": caps[0],
+        "ODI caps": caps[1],
+        "T20 caps": caps[2],
+        "IPL": caps[3],
         "2025 Team": team_2025,
         "2025 IPL": ipl_2025,
         "C/U/A": status,
@@ -358,75 +304,98 @@ def parse_line_full(line):
         "Surname_End": surname_end
     }
 
-def main():
-    input_file = 'scraper/players.csv'
-    output_file = 'scraper/players_full.csv'
-    
-    rows = []
-    
-    with open(input_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-        
-    headers = [
-        "List Sr. No.", "Set No.", "2026 Set", "First Name", "Surname", "Country", 
-        "State Assoc", "DOB", "Age", "Specialism", "Style", 
-        "Test caps", "ODI caps", "T20 caps", "IPL", "2025 Team", "2025 IPL", 
-        "C/U/A", "Reserve Price", "Surname"
-    ]
-    
-    start_idx = 1
-    
-    for i in range(start_idx, len(lines)):
-        line = lines[i].strip()
-        if not line: continue
-        
+
+def parse_line_full(line):
+    # Well-formed lines have all their commas; anything else goes through the anchor-based parser
+    if line.count(',') > 15:
+        parts = _split_csv(line)
+        if len(parts) >= 15:
+            return _parse_comma_line(parts)
+    return _parse_malformed_line(line)
+
+
+def parse_batch(start_line_no, lines):
+    # Parse a batch of raw lines, the first of which is line start_line_no (1-based).
+    # Returns the rows as CSV text, the row count, and the line numbers that could not be parsed.
+    # Returning text keeps what goes back across the process boundary small.
+    out = io.StringIO()
+    writer = csv.writer(out)
+    count = 0
+    skipped = []
+    for line_no, line in enumerate(lines, start=start_line_no):
+        line = line.strip()
+        if not line:
+            continue
         parsed = parse_line_full(line)
         if parsed:
-            # Rename Surname_End to Surname for output?
-            # User output has two "Surname" columns? "First Name, Surname ... Surname"
-            # DictWriter keys must match headers. 
-            # We can use "Surname" twice if we construct the row as list? No, DictWriter needs distinct keys?
-            # Actually CSV allows duplicate headers.
-            # But DictWriter data dict keys are unique.
-            # We'll map "Surname_End" to the last column data.
-            # We need to write manually or use a trick.
-            
-            # Let's map to a dict that matches headers but uniqueness is an issue for DictWriter?
-            # Actually we can just write using list writer for simplicity or map keys carefully.
-            
-            # Use distinct keys internally, map to list for writing.
-            row_data = [
-                parsed.get("List Sr. No.", ""),
-                parsed.get("Set No.", ""),
-                parsed.get("2026 Set.", parsed.get("2026 Set", "")),
-                parsed.get("First Name", ""),
-                parsed.get("Surname", ""),
-                parsed.get("Country", ""),
-                parsed.get("State Assoc", ""),
-                parsed.get("DOB", ""),
-                parsed.get("Age", ""),
-                parsed.get("Specialism", ""),
-                parsed.get("Style", ""),
-                parsed.get("Test caps", ""),
-                parsed.get("ODI caps", ""),
-                parsed.get("T20 caps", ""),
-                parsed.get("IPL", ""),
-                parsed.get("2025 Team", ""),
-                parsed.get("2025 IPL", ""),
-                parsed.get("C/U/A", ""),
-                parsed.get("Reserve Price", ""),
-                parsed.get("Surname_End", "")
-            ]
-            rows.append(row_data)
+            writer.writerow([parsed[field] for field in FIELDS])
+            count += 1
         else:
-            print(f"Skipping line {i+1}: Could not parse.", file=sys.stderr)
-
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        writer.writerows(rows)
-        
-    print(f"Successfully processed {len(rows)} lines. Output saved to {output_file}")
+            skipped.append(line_no)
+    return out.getvalue(), count, skipped
+
+
+def iter_line_batches(f, batch_size):
+    # Stream the data lines (header skipped) as (first line number, lines) batches
+    start = 2
+    batch = []
+    for line_no, line in enumerate(f, start=1):
+        if line_no == 1:
+            continue
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield start, batch
+            start = line_no + 1
+            batch = []
+    if batch:
+        yield start, batch
+
+
+def iter_parsed_batches(batches, workers):
+    # Parse batches in order. With workers > 1 they run on a process pool; at most
+    # 2 * workers batches are in flight, so memory stays bounded by the batch size
+    if workers <= 1:
+        for start, lines in batches:
+            yield parse_batch(start, lines)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start, lines in batches:
+            pending.append(pool.submit(parse_batch, start, lines))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Repair the PDF-extracted auction list into a well-formed CSV.")
+    parser.add_argument('--input', default='scraper/players.csv')
+    parser.add_argument('--output', default='scraper/players_full.csv')
+    parser.add_argument('--workers', type=int, default=1, help="Parse on N processes (output order is preserved)")
+    parser.add_argument('--batch-size', type=int, default=5000, help="Lines per batch handed to a worker")
+    parser.add_argument('--dry-run', action='store_true', help="Parse and report, without writing the output file")
+    args = parser.parse_args(argv)
+    output = os.devnull if args.dry_run else args.output
+
+    count = 0
+
+    with open(args.input, 'r', encoding='utf-8') as f_in, \
+            open(output, 'w', newline='', encoding='utf-8') as f_out:
+        writer = csv.writer(f_out)
+        writer.writerow(HEADERS)
+
+        for text, rows, skipped in iter_parsed_batches(iter_line_batches(f_in, args.batch_size), args.workers):
+            f_out.write(text)
+            count += rows
+            for line_no in skipped:
+                print(f"Skipping line {line_no}: Could not parse.", file=sys.stderr)
+
+    if args.dry_run:
+        print(f"Dry run: {count} lines parsed, nothing written.")
+    else:
+        print(f"Successfully processed {count} lines. Output saved to {args.output}")
 
 if __name__ == "__main__":
     main()
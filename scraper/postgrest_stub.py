@@ -0,0 +1,436 @@
+import datetime
+import email.parser
+import email.policy
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# Minimal local stand-in for the Supabase REST API (PostgREST), enough to point
+# create_client() at for offline runs of the upload, roster and write-back paths:
+#   GET    /rest/v1/<table>   select=cols ([alias:]col[->key]), order=col.asc|desc[,...], limit, offset, filters
+#   POST   /rest/v1/<table>   bulk insert / upsert (Prefer: resolution=merge-duplicates, on_conflict, columns)
+#   PATCH  /rest/v1/<table>   update the rows matching the filters
+#   DELETE /rest/v1/<table>   delete the rows matching the filters
+# Filters are col=<op>.<value> with eq, neq, gt, gte, lt, lte, in.(a,b) and is.null,
+# any of them negated as col=not.<op>.<value>, plus or=(col.op.value,...).
+# The Storage calls the history mirror makes are there too, on in-memory objects:
+#   POST   /storage/v1/object/list/<bucket>    list one folder (prefix, limit, offset)
+#   POST   /storage/v1/object/<bucket>/<path>  upload (multipart; x-upsert to overwrite)
+#   GET    /storage/v1/object/<bucket>/<path>  download
+#   DELETE /storage/v1/object/<bucket>         remove {"prefixes": [paths]}
+# fail_rate injects 503 responses to exercise client retries; latency (seconds per
+# request) and latency_per_row (seconds per row read or written) stand in for the
+# network and the database; connections caps how many requests the "database"
+# serves at once, the way a connection pool would.
+#
+#   with PostgrestStub(fail_rate=0.2, latency=0.02) as stub:
+#       client = create_client(stub.url, 'stub-key')
+
+
+class PostgrestStub:
+    def __init__(self, primary_key='list_sr_no', fail_rate=0.0, max_body_bytes=None, seed=None, host='127.0.0.1', port=0,
+                 latency=0.0, latency_per_row=0.0, connections=None):
+        self.primary_key = primary_key
+        self.fail_rate = fail_rate
+        self.max_body_bytes = max_body_bytes
+        self.latency = latency
+        self.latency_per_row = latency_per_row
+        self._connections = threading.BoundedSemaphore(connections) if connections else None
+        self.tables = {}  # table -> {primary key value: row}
+        self.objects = {}  # (bucket, path) -> (bytes, updated_at)
+        self.requests = 0
+        self.injected_failures = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='postgrest-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def rows(self, table):
+        with self._lock:
+            return list(self.tables.get(table, {}).values())
+
+    def load(self, table, rows):
+        # Seed a table directly, bypassing HTTP
+        with self._lock:
+            store = self.tables.setdefault(table, {})
+            for row in rows:
+                store[row[self.primary_key]] = dict(row)
+
+    def delay(self, rows=0):
+        wait = self.latency + self.latency_per_row * rows
+        if not wait:
+            return
+        if self._connections:
+            with self._connections:
+                time.sleep(wait)
+        else:
+            time.sleep(wait)
+
+    def should_fail(self):
+        with self._lock:
+            self.requests += 1
+            if self.fail_rate and self._random.random() < self.fail_rate:
+                self.injected_failures += 1
+                return True
+            return False
+
+    def write(self, table, rows, key, merge, columns):
+        with self._lock:
+            store = self.tables.setdefault(table, {})
+            if columns:
+                # Bulk requests fill keys missing from a row with NULL, like PostgREST
+                rows = [{col: row.get(col) for col in columns} for row in rows]
+            # All or nothing, like the single statement PostgREST runs
+            if not merge and any(row.get(key) in store for row in rows):
+                return False
+            for row in rows:
+                store.setdefault(row.get(key), {}).update(row)
+            return True
+
+    def select(self, table, matches, columns, order, limit, offset):
+        with self._lock:
+            found = [row for row in self.tables.get(table, {}).values() if matches(row)]
+        for col, desc in reversed(order):
+            # NULLs last, as PostgREST does for ascending order
+            found.sort(key=lambda row: (row.get(col) is None, row.get(col) if row.get(col) is not None else 0),
+                       reverse=desc)
+        found = found[offset:offset + limit if limit is not None else None]
+        if columns:
+            found = [dict(_project(row, col) for col in columns) for row in found]
+        else:
+            found = [dict(row) for row in found]
+        return found
+
+    def update(self, table, matches, updates):
+        with self._lock:
+            changed = []
+            for row in self.tables.get(table, {}).values():
+                if matches(row):
+                    row.update(updates)
+                    changed.append(dict(row))
+            return changed
+
+    def delete(self, table, matches):
+        with self._lock:
+            store = self.tables.get(table, {})
+            doomed = [pk for pk, row in store.items() if matches(row)]
+            return [store.pop(pk) for pk in doomed]
+
+    def put_object(self, bucket, path, data, upsert):
+        with self._lock:
+            if not upsert and (bucket, path) in self.objects:
+                return False
+            updated = datetime.datetime.now(datetime.timezone.utc).isoformat().replace('+00:00', 'Z')
+            self.objects[(bucket, path)] = (bytes(data), updated)
+            return True
+
+    def list_objects(self, bucket, prefix, limit, offset):
+        # Files directly inside the folder prefix, by name, the way Storage lists one level
+        folder = prefix.strip('/')
+        with self._lock:
+            found = sorted((path.rpartition('/')[2], data, updated) for (b, path), (data, updated) in self.objects.items()
+                           if b == bucket and path.rpartition('/')[0] == folder)
+        return [{'name': name, 'id': f"{bucket}/{folder}/{name}", 'updated_at': updated,
+                 'metadata': {'size': len(data)}} for name, data, updated in found[offset:offset + limit]]
+
+
+_COMPARISONS = {
+    'gt': lambda a, b: a > b,
+    'gte': lambda a, b: a >= b,
+    'lt': lambda a, b: a < b,
+    'lte': lambda a, b: a <= b,
+}
+
+# Query parameters that are not column filters
+def _project(row, spec):
+    # One select entry -> (name, value): col, alias:col, or a JSON key as [alias:]col->key
+    alias, _, path = spec.rpartition(':') if ':' in spec else ('', '', spec)
+    col, _, key = path.partition('->')
+    value = row.get(col)
+    if key:
+        value = value.get(key) if isinstance(value, dict) else None
+    return alias or key or col, value
+
+
+_RESERVED_PARAMS = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns'}
+
+
+def _coerce(value, arg):
+    # Compare numbers as numbers and everything else (text, ISO timestamps) as text
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        try:
+            return value, float(arg)
+        except ValueError:
+            pass
+    return str(value), arg
+
+
+def _parse_filter(expr):
+    # 'eq.5', 'gt.100', 'in.(1,2,3)', 'is.null', 'not.is.null' -> predicate on a row value
+    if expr.startswith('not.'):
+        inner = _parse_filter(expr[4:])
+        return lambda v: not inner(v)
+    op, _, arg = expr.partition('.')
+    if op == 'eq':
+        return lambda v: str(v) == arg
+    if op == 'neq':
+        return lambda v: v is not None and str(v) != arg
+    if op == 'in':
+        values = set(arg.strip('()').split(',')) if arg.strip('()') else set()
+        return lambda v: str(v) in values
+    if op == 'is':
+        if arg == 'null':
+            return lambda v: v is None
+        if arg == 'not.null':
+            return lambda v: v is not None
+    if op in _COMPARISONS:
+        compare = _COMPARISONS[op]
+        return lambda v: v is not None and compare(*_coerce(v, arg))
+    raise ValueError(f"unsupported filter operator: {op}")
+
+
+def _split_top_level(text):
+    # 'a.eq.1,b.in.(1,2)' -> ['a.eq.1', 'b.in.(1,2)']
+    parts, depth, current = [], 0, ''
+    for ch in text:
+        if ch == ',' and depth == 0:
+            parts.append(current)
+            current = ''
+            continue
+        depth += (ch == '(') - (ch == ')')
+        current += ch
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _parse_or(expr):
+    # '(a.is.null,b.lt.5)' -> predicate on a whole row
+    branches = []
+    for part in _split_top_level(expr.strip()[1:-1]):
+        col, _, rest = part.partition('.')
+        branches.append((col, _parse_filter(rest)))
+    return lambda row: any(pred(row.get(col)) for col, pred in branches)
+
+
+def _parse_order(expr):
+    # 'list_sr_no.asc,name.desc' -> [('list_sr_no', False), ('name', True)]
+    order = []
+    for part in filter(None, expr.split(',')):
+        col, _, rest = part.partition('.')
+        order.append((col.strip('"'), rest.split('.')[0] == 'desc'))
+    return order
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.send_response(status)
+        if body:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, code, message):
+        self._send_json(status, {"code": code, "message": message, "details": None, "hint": None})
+
+    def _storage(self, method):
+        # Storage requests, answered without the PostgREST preamble; False if self.path is not one
+        prefix = '/storage/v1/object/'
+        path = urlsplit(self.path).path
+        if not path.startswith(prefix):
+            return False
+        stub = self.server.stub
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        if stub.should_fail():
+            self._send_json(503, {'statusCode': '503', 'error': 'ServiceUnavailable', 'message': 'Injected failure'})
+            return True
+        rest = path[len(prefix):]
+        if method == 'POST' and rest.startswith('list/'):
+            options = json.loads(body or b'{}')
+            self._send_json(200, stub.list_objects(rest[len('list/'):], options.get('prefix', ''),
+                                                   int(options.get('limit', 100)), int(options.get('offset', 0))))
+            return True
+        bucket, _, key = rest.partition('/')
+        if method == 'POST':
+            form = email.parser.BytesParser(policy=email.policy.default).parsebytes(
+                b'Content-Type: ' + self.headers['Content-Type'].encode() + b'\r\n\r\n' + body)
+            data = next(part.get_payload(decode=True) for part in form.iter_parts()
+                        if part.get_param('name', header='content-disposition') == 'file')
+            if not stub.put_object(bucket, key, data, (self.headers.get('x-upsert') or '').lower() == 'true'):
+                self._send_json(400, {'statusCode': '409', 'error': 'Duplicate', 'message': 'The resource already exists'})
+            else:
+                self._send_json(200, {'Key': f"{bucket}/{key}"})
+        elif method == 'GET':
+            with stub._lock:
+                found = stub.objects.get((bucket, key))
+            if found is None:
+                self._send_json(400, {'statusCode': '404', 'error': 'not_found', 'message': 'Object not found'})
+                return True
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(len(found[0])))
+            self.end_headers()
+            self.wfile.write(found[0])
+        elif method == 'DELETE':
+            removed = []
+            with stub._lock:
+                for key in json.loads(body or b'{}').get('prefixes', []):
+                    if stub.objects.pop((bucket, key), None) is not None:
+                        removed.append({'name': key})
+            self._send_json(200, removed)
+        else:
+            self._send_json(405, {'statusCode': '405', 'error': 'MethodNotAllowed', 'message': method})
+        return True
+
+    def _route(self):
+        parts = urlsplit(self.path)
+        prefix = '/rest/v1/'
+        if not parts.path.startswith(prefix):
+            return None, {}
+        params = {k: v[-1] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+        return parts.path[len(prefix):], params
+
+    def _begin(self):
+        # Common request preamble; returns (table, params) or None if a response was already sent
+        stub = self.server.stub
+        table, params = self._route()
+        length = int(self.headers.get('Content-Length') or 0)
+        self._body = self.rfile.read(length) if length else b''
+        if table is None:
+            self._send_error(404, 'PGRST125', 'Invalid path')
+            return None
+        if stub.should_fail():
+            self._send_error(503, 'PGRST000', 'Injected failure')
+            return None
+        if stub.max_body_bytes and len(self._body) > stub.max_body_bytes:
+            self._send_json(413, None)
+            return None
+        return table, params
+
+    def _wants_rows(self):
+        return 'return=representation' in (self.headers.get('Prefer') or '')
+
+    def _filters(self, params):
+        # Predicate for the filter params, or None after sending a 400
+        filters = []
+        for col, expr in params.items():
+            if col in _RESERVED_PARAMS:
+                continue
+            try:
+                if col == 'or':
+                    filters.append(_parse_or(expr))
+                else:
+                    filters.append(lambda row, col=col, pred=_parse_filter(expr): pred(row.get(col)))
+            except ValueError as e:
+                self._send_error(400, 'PGRST100', str(e))
+                return None
+        return lambda row: all(match(row) for match in filters)
+
+    def do_GET(self):
+        if self._storage('GET'):
+            return
+        begun = self._begin()
+        if begun is None:
+            return
+        table, params = begun
+        stub = self.server.stub
+
+        matches = self._filters(params)
+        if matches is None:
+            return
+        select = params.get('select', '*')
+        columns = None if select.strip() == '*' else [c.strip().strip('"') for c in select.split(',') if c.strip()]
+        limit = int(params['limit']) if params.get('limit') else None
+        offset = int(params.get('offset') or 0)
+        rows = stub.select(table, matches, columns, _parse_order(params.get('order', '')), limit, offset)
+        stub.delay(len(rows))
+        self._send_json(200, rows)
+
+    def do_PATCH(self):
+        begun = self._begin()
+        if begun is None:
+            return
+        table, params = begun
+        stub = self.server.stub
+
+        matches = self._filters(params)
+        if matches is None:
+            return
+        updates = json.loads(self._body or b'{}')
+        changed = stub.update(table, matches, updates)
+        stub.delay(len(changed))
+        if self._wants_rows():
+            self._send_json(200, changed)
+        else:
+            self._send_json(204, None)
+
+    def do_POST(self):
+        if self._storage('POST'):
+            return
+        begun = self._begin()
+        if begun is None:
+            return
+        table, params = begun
+        stub = self.server.stub
+
+        payload = json.loads(self._body or b'[]')
+        rows = payload if isinstance(payload, list) else [payload]
+        columns = [c.strip('"') for c in params['columns'].split(',')] if params.get('columns') else None
+        merge = 'resolution=merge-duplicates' in (self.headers.get('Prefer') or '')
+        key = params.get('on_conflict') or stub.primary_key
+
+        if not stub.write(table, rows, key, merge, columns):
+            self._send_error(409, '23505', 'duplicate key value violates unique constraint')
+            return
+        stub.delay(len(rows))
+        self._send_json(201, rows if self._wants_rows() else None)
+
+    def do_DELETE(self):
+        if self._storage('DELETE'):
+            return
+        begun = self._begin()
+        if begun is None:
+            return
+        table, params = begun
+
+        matches = self._filters(params)
+        if matches is None:
+            return
+        deleted = self.server.stub.delete(table, matches)
+        self.server.stub.delay(len(deleted))
+        if self._wants_rows():
+            self._send_json(200, deleted)
+        else:
+            self._send_json(204, None)
@@ -0,0 +1,76 @@
+import json
+import os
+import threading
+import time
+
+# Remembers each player's ESPNcricinfo profile URL between runs, keyed by list_sr_no,
+# so a scrape can go straight to <profile>/matches instead of searching Google first.
+# An entry is only stored once its /matches page has produced the scores table, expires
+# after ttl_days, and is dropped as soon as a scrape through it fails.
+#
+#   {"123": {"url": "https://www.espncricinfo.com/cricketers/...", "verified_at": 1718000000.0}}
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.profile_cache.json')
+DEFAULT_TTL_DAYS = 30
+
+
+class ProfileCache:
+    def __init__(self, path=CACHE_PATH, ttl_days=DEFAULT_TTL_DAYS):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            # A damaged cache only costs some searches; start over
+            print(f"Ignoring unreadable profile cache {self.path}: {e}")
+            self.entries = {}
+
+    def get(self, pid):
+        with self._lock:
+            entry = self.entries.get(str(pid))
+            if entry and time.time() - entry.get('verified_at', 0) < self.ttl:
+                self.hits += 1
+                return entry['url']
+            self.misses += 1
+            return None
+
+    def put(self, pid, url):
+        with self._lock:
+            self.entries[str(pid)] = {'url': url, 'verified_at': time.time()}
+            self._dirty = True
+
+    def invalidate(self, pid):
+        with self._lock:
+            if self.entries.pop(str(pid), None) is not None:
+                self.invalidated += 1
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            # Drop expired entries and write atomically so a killed run never leaves half a file
+            now = time.time()
+            entries = {k: v for k, v in self.entries.items() if now - v.get('verified_at', 0) < self.ttl}
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=0, sort_keys=True)
+            os.replace(tmp, self.path)
+            self.entries = entries
+            self._dirty = False
+
+    def report(self):
+        print(f"Profile cache: {self.hits} hits, {self.misses} misses, {self.invalidated} invalidated, "
+              f"{len(self.entries)} entries.")
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Decides which players a scrape run visits, and in what order.
+# For every player the job remembers when it was last scraped and when its
+# scraped data last changed, in scraper/.refresh_<job>.json:
+#
+#   {"123": {"scraped_at": 1718000000.0, "changed_at": 1717400000.0, "digest": "9f2c..."}}
+#
+# A player is due again after its refresh interval: one day for players in the
+# current season (a 2025 team or 2025 IPL matches) or whose data changed in the
+# last RECENT_CHANGE_DAYS, and longer the longer their data has stayed the same,
+# up to MAX_INTERVAL_DAYS. Due players are visited most-overdue first, active
+# players weighted up, so a run cut short by its time budget has spent it on the
+# players whose numbers move. Players never scraped come first of all.
+# Each crawl stage (form, news, ...) keeps its own schedule; plan() combines them.
+
+STATE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+RECENT_CHANGE_DAYS = 7
+MAX_INTERVAL_DAYS = 14
+# An unchanged player waits one more day for every QUIET_DAYS_PER_DAY days it has been quiet
+QUIET_DAYS_PER_DAY = 4
+ACTIVE_WEIGHT = 2.0
+# Daily runs drift by the length of the run; count a player as due slightly early
+DUE_SLACK_DAYS = 0.25
+
+DAY = 86400.0
+
+
+def state_path(job):
+    return os.path.join(STATE_DIR, f'.refresh_{job}.json')
+
+
+def is_active(player):
+    # In the current season: signed to a 2025 team or played 2025 IPL matches
+    return bool(player.get('team_2025')) or (player.get('ipl_2025') or 0) > 0
+
+
+def result_digest(result):
+    return hashlib.sha1(json.dumps(result, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class RefreshSchedule:
+    def __init__(self, job, path=None):
+        self.job = job
+        self.path = path or state_path(job)
+        self.entries = {}
+        self.changed = 0
+        self.unchanged = 0
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError) as e:
+            # Without history every player is simply due
+            print(f"Ignoring unreadable refresh state {self.path}: {e}")
+            self.entries = {}
+
+    def interval_days(self, player, entry, now):
+        quiet_days = (now - entry.get('changed_at', 0)) / DAY
+        if is_active(player) or quiet_days < RECENT_CHANGE_DAYS:
+            return 1.0
+        return min(float(MAX_INTERVAL_DAYS), max(1.0, quiet_days / QUIET_DAYS_PER_DAY))
+
+    def priority(self, player, now=None):
+        # How overdue the player is, in refresh intervals; >= 1 means due
+        now = time.time() if now is None else now
+        entry = self.entries.get(str(player['list_sr_no']))
+        if not entry:
+            return float('inf')
+        age_days = (now - entry['scraped_at']) / DAY + DUE_SLACK_DAYS
+        return age_days / self.interval_days(player, entry, now)
+
+    def weighted_priority(self, player, now=None):
+        score = self.priority(player, now)
+        return score * ACTIVE_WEIGHT if is_active(player) else score
+
+    def record(self, pid, result):
+        # Call once a scrape's data is stored, or there was nothing to store. A None
+        # result (nothing found) still counts as a visit but says nothing about
+        # whether the player's data changed.
+        now = time.time()
+        with self._lock:
+            entry = self.entries.setdefault(str(pid), {'changed_at': now})
+            entry['scraped_at'] = now
+            if result is None:
+                return
+            digest = result_digest(result)
+            if digest != entry.get('digest'):
+                entry['digest'] = digest
+                entry['changed_at'] = now
+                self.changed += 1
+            else:
+                self.unchanged += 1
+
+    def save(self):
+        with self._lock:
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, indent=0, sort_keys=True)
+            os.replace(tmp, self.path)
+        print(f"Refresh state ({self.job}): {self.changed} players changed, {self.unchanged} unchanged.")
+
+
+def due_stages(player, schedules, include_all=False, now=None):
+    # Names of the stages due for one player
+    now = time.time() if now is None else now
+    return [name for name, schedule in schedules.items() if include_all or schedule.priority(player, now) >= 1]
+
+
+def plan(players, schedules, include_all=False, now=None):
+    # Players to visit this run as (player, names of the stages due for them), highest
+    # priority of any due stage first (list_sr_no breaks ties). schedules maps stage
+    # name -> RefreshSchedule. include_all runs every stage for every player, with
+    # players not due yet at the back of the queue.
+    now = time.time() if now is None else now
+    scored = []
+    for p in players:
+        due = due_stages(p, schedules, include_all, now)
+        if not due:
+            continue
+        score = max(schedules[name].weighted_priority(p, now) for name in due)
+        scored.append((-score, p['list_sr_no'], p, due))
+    scored.sort(key=lambda t: (t[0], t[1]))
+    planned = [(p, due) for _, _, p, due in scored]
+    print(f"Refresh plan: {len(planned)} of {len(players)} players queued, "
+          f"{sum(1 for p, _ in planned if is_active(p))} active this season.")
+    return planned
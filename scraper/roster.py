@@ -0,0 +1,117 @@
+import csv
+import os
+import run_metrics
+
+# Streams the players table in keyset pages: each request asks for the next
+# page_size rows with list_sr_no above the last one seen, so nothing is cut off
+# at the server's max-rows limit, no page costs more than the first (unlike
+# offset paging), and callers can start on the first page while the rest are
+# still on the server.
+#
+#   for p in iter_roster(supabase, 'list_sr_no, first_name, surname',
+#                        where=[('team_2025', 'not.is.null'), ('or', 'valued_at.is.null,valued_at.lt.2026-10-01')]):
+#       ...
+#
+# where holds PostgREST filters applied server-side, as (column, 'op.value')
+# pairs; column 'or' takes a comma-separated list of 'column.op.value'.
+#
+# iter_csv_roster reads the same rows from the auction CSV upload_players.py
+# uploads, with the standard csv module, for --dry-run paths that must not need
+# the network (or pandas).
+
+PAGE_SIZE = 500
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'players.csv')
+
+# DB column -> (CSV column, kind). Order matches the record layout.
+# 'int' columns are coerced like int(float(val)), anything unparseable -> None
+# 'text' columns are passed through as-is, NaN -> None
+# 'name' columns are stripped strings, NaN -> ''
+# The CSV has two 'Surname' headers; 'Surname' is the first one.
+CSV_COLUMNS = {
+    "list_sr_no": ('List Sr. No.', 'int'),
+    "set_no": ('Set No.', 'int'),
+    "set_2026": ('2026 Set', 'text'),
+    "first_name": ('First Name', 'name'),
+    "surname": ('Surname', 'name'),
+    "country": ('Country', 'text'),
+    "state_assoc": ('State Assoc', 'text'),
+    "dob": ('DOB', 'text'),
+    "age": ('Age', 'int'),
+    "specialism": ('Specialism', 'text'),
+    "batting_style": ('Batting Style', 'text'),
+    "bowling_style": ('Bowling Style', 'text'),
+    "test_caps": ('Test caps', 'int'),
+    "odi_caps": ('ODI caps', 'int'),
+    "t20_caps": ('T20 caps', 'int'),
+    "ipl": ('IPL', 'int'),
+    "team_2025": ('2025 Team', 'text'),
+    "ipl_2025": ('2025 IPL', 'int'),
+    "cua": ('C/U/A', 'text'),
+    "reserve_price": ('Reserve Price', 'text'),
+}
+
+
+def parse_where(spec):
+    # 'COLUMN=OP.VALUE' from the command line -> ('COLUMN', 'OP.VALUE')
+    column, sep, expr = spec.partition('=')
+    if not sep or not column.strip() or '.' not in expr:
+        raise ValueError(f"expected COLUMN=OP.VALUE (e.g. team_2025=not.is.null), got {spec!r}")
+    return column.strip(), expr.strip()
+
+
+def _apply(query, column, expr):
+    if column == 'or':
+        return query.or_(expr.strip('()'))
+    # 'not.is.null' -> operator 'not.is', value 'null'
+    parts = expr.split('.', 2 if expr.startswith('not.') else 1)
+    return query.filter(column, '.'.join(parts[:-1]), parts[-1])
+
+
+def iter_roster(supabase, columns, where=(), page_size=PAGE_SIZE, after=None, table='players'):
+    # Rows in list_sr_no order, one page request at a time as the caller consumes them
+    last_seen = after
+    while True:
+        query = supabase.table(table).select(columns)
+        for column, expr in where:
+            query = _apply(query, column, expr)
+        if last_seen is not None:
+            query = query.gt('list_sr_no', last_seen)
+        with run_metrics.span('roster_page'):
+            page = query.order('list_sr_no').limit(page_size).execute().data
+        yield from page
+        if len(page) < page_size:
+            return
+        last_seen = page[-1]['list_sr_no']
+
+
+def _csv_value(raw, kind):
+    if kind == 'name':
+        return raw.strip()
+    if raw == '':
+        return None
+    if kind == 'int':
+        try:
+            return int(float(raw))
+        except ValueError:
+            return None
+    return raw
+
+
+def iter_csv_roster(path=CSV_PATH, columns=None):
+    # Rows of the roster CSV as upload records (only the given DB columns), in file order
+    columns = [c.strip() for c in columns.split(',')] if isinstance(columns, str) else columns or list(CSV_COLUMNS)
+    known = [c for c in columns if c in CSV_COLUMNS]
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        # First occurrence of each header, like pandas keeps it
+        positions = {}
+        for i, name in enumerate(header):
+            positions.setdefault(name, i)
+        fields = [(c, positions[CSV_COLUMNS[c][0]], CSV_COLUMNS[c][1]) for c in known]
+        for line in reader:
+            row = {c: _csv_value(line[i] if i < len(line) else '', kind) for c, i, kind in fields}
+            # Like the table, no row without a key
+            if row.get('list_sr_no', 0) is not None:
+                yield row
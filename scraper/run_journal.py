@@ -0,0 +1,94 @@
+import json
+import os
+import threading
+import time
+
+# Append-only progress journal for a scrape job, one JSON line per finished player:
+#
+#   {"pid": 123, "outcome": "written", "at": 1718000000.0}
+#
+# Outcomes:
+#   written   the player's update is in the database (logged by the DB writer)
+#   no_data   the pages loaded with nothing to write (no scores table, no news)
+#   unchanged scraped, but identical to what is already stored, so not rewritten
+#   failed    a stage errored or hit a block page, or the DB write failed; retried
+#             on resume. A player with a failed stage is never journaled written,
+#             even when the stages that did load were stored
+#
+# Each line is flushed and fsynced before record() returns, so a crashed or killed
+# run loses at most the line being written. With --resume, players whose last
+# outcome inside the run window is written, no_data or unchanged are skipped.
+
+JOURNAL_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WINDOW_HOURS = 20
+
+DONE_OUTCOMES = ('written', 'no_data', 'unchanged')
+
+
+def journal_path(job):
+    return os.path.join(JOURNAL_DIR, f'.journal_{job}.jsonl')
+
+
+class RunJournal:
+    def __init__(self, job, path=None, window_hours=DEFAULT_WINDOW_HOURS):
+        self.path = path or journal_path(job)
+        self.window = window_hours * 3600
+        self.outcomes = {}  # pid -> last outcome inside the window
+        self._lock = threading.Lock()
+        self._compact()
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def _compact(self):
+        # Read the window's entries back and drop everything older, so the file stays small.
+        # A torn last line from a crash is skipped.
+        if not os.path.exists(self.path):
+            return
+        cutoff = time.time() - self.window
+        kept = []
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get('at', 0) >= cutoff:
+                    kept.append(entry)
+                    self.outcomes[entry['pid']] = entry['outcome']
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for entry in kept:
+                f.write(json.dumps(entry) + '\n')
+        os.replace(tmp, self.path)
+
+    def completed(self):
+        return {pid for pid, outcome in self.outcomes.items() if outcome in DONE_OUTCOMES}
+
+    def skip_completed(self, players):
+        done = self.completed()
+        remaining = [p for p in players if p['list_sr_no'] not in done]
+        print(f"Resuming: {len(players) - len(remaining)} players already done in this run window, "
+              f"{len(remaining)} left.")
+        return remaining
+
+    def record(self, pid, outcome, error=None):
+        entry = {'pid': pid, 'outcome': outcome, 'at': time.time()}
+        if error:
+            entry['error'] = str(error)
+        self._append([entry])
+
+    def record_written(self, pids):
+        # BatchWriter on_written callback: one fsync for the whole batch
+        now = time.time()
+        self._append([{'pid': pid, 'outcome': 'written', 'at': now} for pid in pids])
+
+    def _append(self, entries):
+        with self._lock:
+            self._file.write(''.join(json.dumps(e) + '\n' for e in entries))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            for e in entries:
+                self.outcomes[e['pid']] = e['outcome']
+
+    def close(self):
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,170 @@
+import cProfile
+import json
+import math
+import os
+import pstats
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# Where a scrape run spends its time. Code under measurement wraps each step in
+#
+#   with run_metrics.span('table_wait'):
+#       ...
+#
+# and counts pages and failures with run_metrics.page() / run_metrics.failure().
+# Spans from every worker thread land in one process-wide RunMetrics; at the end
+# of a run crawl.py writes its summary as JSON (per-span count, total, p50, p95
+# and max seconds, pages per minute by backend, failures by type) and prints it.
+# Spans nest freely: 'player' covers a whole visit, the step spans inside it
+# cover its parts, so totals are not meant to add up.
+
+METRICS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.run_metrics.json')
+
+
+def _percentile(sorted_values, q):
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class RunMetrics:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.started_at = time.time()
+        self.spans = defaultdict(list)  # name -> durations (s)
+        self.pages = Counter()  # backend -> pages
+        self.failures = Counter()  # kind -> count
+        self.players = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.spans[name].append(seconds)
+
+    def page(self, backend):
+        with self._lock:
+            self.pages[backend] += 1
+
+    def failure(self, kind):
+        with self._lock:
+            self.failures[kind] += 1
+
+    def player_done(self):
+        with self._lock:
+            self.players += 1
+
+    def summary(self):
+        with self._lock:
+            elapsed = time.monotonic() - self.started
+            minutes = elapsed / 60 if elapsed else 0.0
+            stages = {}
+            for name, durations in self.spans.items():
+                values = sorted(durations)
+                stages[name] = {
+                    'count': len(values),
+                    'total_s': round(sum(values), 4),
+                    'p50_s': round(_percentile(values, 0.5), 4),
+                    'p95_s': round(_percentile(values, 0.95), 4),
+                    'max_s': round(values[-1], 4),
+                }
+            pages = sum(self.pages.values())
+            return {
+                'started_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(self.started_at)),
+                'elapsed_s': round(elapsed, 2),
+                'players': self.players,
+                'pages': {'total': pages, **dict(self.pages)},
+                'pages_per_minute': round(pages / minutes, 2) if minutes else 0.0,
+                'stages': dict(sorted(stages.items(), key=lambda kv: -kv[1]['total_s'])),
+                'failures': dict(self.failures.most_common()),
+            }
+
+    def write(self, path=METRICS_PATH):
+        summary = self.summary()
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        os.replace(tmp, path)
+        return summary
+
+    def report(self, summary=None):
+        summary = summary or self.summary()
+        print(f"Run metrics: {summary['players']} players, {summary['pages']['total']} pages "
+              f"({summary['pages_per_minute']:.1f}/min) in {summary['elapsed_s'] / 60:.1f} min.")
+        print(f"  {'span':<18}{'count':>7}{'total s':>10}{'p50 s':>9}{'p95 s':>9}{'max s':>9}")
+        for name, s in summary['stages'].items():
+            print(f"  {name:<18}{s['count']:>7}{s['total_s']:>10.1f}{s['p50_s']:>9.2f}{s['p95_s']:>9.2f}{s['max_s']:>9.2f}")
+        if summary['failures']:
+            print("  Failures: " + ', '.join(f"{kind} {n}" for kind, n in summary['failures'].items()))
+
+
+class ThreadProfiler:
+    # cProfile only sees the thread that enabled it, so each thread that runs
+    # profiled() gets its own profile; save() merges them into one stats file
+
+    def __init__(self):
+        self.profiles = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def profiled(self):
+        profile = getattr(self._local, 'profile', None)
+        if profile is None:
+            profile = self._local.profile = cProfile.Profile()
+            with self._lock:
+                self.profiles.append(profile)
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+
+    def save(self, path):
+        with self._lock:
+            profiles = list(self.profiles)
+        if not profiles:
+            return
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(path)
+        print(f"Wrote cProfile stats to {path} (python -m pstats {path})")
+
+
+# The process-wide metrics every instrumented module reports into
+_metrics = RunMetrics()
+
+
+def current():
+    return _metrics
+
+
+def reset():
+    # Start a fresh run (crawl.main calls this first)
+    global _metrics
+    _metrics = RunMetrics()
+    return _metrics
+
+
+def span(name):
+    return _metrics.span(name)
+
+
+def page(backend):
+    _metrics.page(backend)
+
+
+def failure(kind):
+    _metrics.failure(kind)
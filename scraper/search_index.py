@@ -0,0 +1,170 @@
+import argparse
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+
+# Prebuilt name index for the search autocomplete, written by upload_players.py
+# from the same records it uploads and imported by src/app/api/search/route.ts,
+# so a keystroke is a dictionary lookup instead of an ilike '%term%' table scan.
+#
+# Names are normalized (accents stripped, lowercased, punctuation to spaces) and
+# every player gets several keys: the full name, the name from each later word
+# on (so 'kohli' finds 'virat kohli'), initial + surname ('v kohli'), initials
+# ('vk') and any aliases from ALIASES_PATH. Two maps are built:
+#
+#   prefixes  every prefix of every key, MIN_PREFIX..MAX_PREFIX characters long,
+#             -> the PREFIX_LIMIT most popular players it starts
+#   trigrams  every 3-gram of every key -> the TRIGRAM_LIMIT most popular players
+#             containing it, for queries that match no prefix (typos, infixes)
+#
+# Players are stored once, most popular first (caps, IPL caps weighted up, plus
+# a bonus for a 2025 team), and the maps hold their positions, so lower is better.
+# Queries longer than MAX_PREFIX are looked up by their first MAX_PREFIX characters,
+# and a hit only counts for players with a key starting with the whole query (each
+# player carries its keys longer than MAX_PREFIX for that check). When the start
+# matches names but the whole query matches none, there are no results, as with
+# the old ilike: the trigram fallback is for queries whose start matches nothing.
+#
+# The lists are capped, so past those sizes lookups favour popular players: a
+# prefix shared by more than PREFIX_LIMIT players only returns the top ones (fine,
+# the route shows RESULT_LIMIT), and a trigram shared by more than TRIGRAM_LIMIT
+# players drops the rest, so on a roster of tens of thousands an infix or typo
+# query made only of common trigrams can miss an obscure player. Type more of the
+# name (a prefix) to reach them. On 20,000 synthetic players (bench_search.py),
+# 1000 instead of 200 finds the misspelt player for 350 of 500 one-letter typos
+# instead of 238, for about 15% more index; the other 150 are typos after the
+# MAX_PREFIX-th character, which find nothing.
+#
+#   python scraper/search_index.py kohli      # query the built index like the route does
+
+INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'data', 'search_index.json')
+# Optional {list_sr_no: [alias, ...]} for nicknames the names do not contain
+ALIASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'aliases.json')
+
+MIN_PREFIX = 1
+MAX_PREFIX = 12
+PREFIX_LIMIT = 20
+TRIGRAM_LIMIT = 1000
+RESULT_LIMIT = 10
+
+CAP_WEIGHTS = {'test_caps': 1.0, 'odi_caps': 1.0, 't20_caps': 1.0, 'ipl': 1.5}
+ACTIVE_BONUS = 50
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text).split())
+
+
+def name_keys(first_name, surname, aliases=()):
+    # Every normalized string a player should be found by
+    words = normalize(f"{first_name} {surname}").split()
+    keys = set()
+    for i in range(len(words)):
+        keys.add(' '.join(words[i:]))
+    if len(words) > 1:
+        keys.add(f"{words[0][0]} {' '.join(words[1:])}")
+        keys.add(''.join(word[0] for word in words))
+    keys.update(filter(None, (normalize(alias) for alias in aliases)))
+    keys.discard('')
+    return keys
+
+
+def trigrams(text):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def popularity(record):
+    score = sum(weight * (record.get(col) or 0) for col, weight in CAP_WEIGHTS.items())
+    if record.get('team_2025'):
+        score += ACTIVE_BONUS
+    return score
+
+
+def load_aliases(path=ALIASES_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return {int(pid): aliases for pid, aliases in json.load(f).items()}
+
+
+def build_index(records, aliases=None):
+    aliases = aliases if aliases is not None else load_aliases()
+    records = [r for r in records if r.get('list_sr_no') is not None]
+    records.sort(key=lambda r: (-popularity(r), r.get('name') or '', r['list_sr_no']))
+
+    prefixes = defaultdict(list)
+    grams = defaultdict(list)
+    players = []
+    for pos, record in enumerate(records):
+        keys = name_keys(record.get('first_name'), record.get('surname'), aliases.get(record['list_sr_no'], ()))
+        players.append([record['list_sr_no'], record.get('name'), record.get('team_2025'), record.get('country'),
+                        sorted(key for key in keys if len(key) > MAX_PREFIX)])
+        # Players arrive most popular first, so appending keeps every list ranked
+        starts = {key[:n] for key in keys for n in range(MIN_PREFIX, min(len(key), MAX_PREFIX) + 1)}
+        for prefix in starts:
+            if len(prefixes[prefix]) < PREFIX_LIMIT:
+                prefixes[prefix].append(pos)
+        for gram in set().union(*(trigrams(key) for key in keys)) if keys else ():
+            if len(grams[gram]) < TRIGRAM_LIMIT:
+                grams[gram].append(pos)
+
+    return {
+        'version': 2,
+        'built_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'max_prefix': MAX_PREFIX,
+        'players': players,
+        'prefixes': dict(sorted(prefixes.items())),
+        'trigrams': dict(sorted(grams.items())),
+    }
+
+
+def write_index(index, path=INDEX_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp, path)
+    print(f"Search index: {len(index['players'])} players, {len(index['prefixes'])} prefixes, "
+          f"{len(index['trigrams'])} trigrams, {os.path.getsize(path) / 1024:.0f} KB in {path}")
+
+
+def search(index, term, limit=RESULT_LIMIT):
+    # The lookup the API route does: prefix hit if there is one, else best trigram overlap
+    query = normalize(term)
+    if not query:
+        return []
+    found = index['prefixes'].get(query[:index['max_prefix']])
+    if found and len(query) > index['max_prefix']:
+        # The prefix map only saw the first max_prefix characters; check the rest
+        return [index['players'][pos][:4] for pos in found
+                if any(key.startswith(query) for key in index['players'][pos][4])][:limit]
+    if not found:
+        votes = Counter()
+        for gram in trigrams(query):
+            votes.update(index['trigrams'].get(gram, ()))
+        # At least half the query's trigrams, most shared first, then popularity (lower position)
+        needed = max(1, len(trigrams(query)) // 2)
+        found = sorted((pos for pos, n in votes.items() if n >= needed), key=lambda pos: (-votes[pos], pos))
+    return [index['players'][pos][:4] for pos in found[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the prebuilt player search index.")
+    parser.add_argument('term')
+    parser.add_argument('--index', default=INDEX_PATH)
+    args = parser.parse_args()
+
+    with open(args.index, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    for pid, name, team, country in search(index, args.term):
+        print(f"{pid:>5}  {name}  {team or '-'}  {country or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import sys
+from html.parser import HTMLParser
+from urllib.parse import urlsplit, urlunsplit, parse_qs, parse_qsl, urlencode
+
+# Reads Google result pages from raw HTML, looking for the same elements the
+# browser code in form.py and news.py waits for:
+#   first_result_link   href of the first <a> wrapping an <h3> (web search)
+#   news_results        div#rso div[role=heading] inside an <a> (News tab)
+# Both return nothing when the markup is not there (consent page, script-only
+# page, block), which is the cue to load the page in the browser instead.
+#
+#   python scraper/search_results.py saved_results_page.html
+
+MAX_NEWS = 5
+# Query parameters that only track the click, dropped by normalize_link
+TRACKING_PARAMS = {'ved', 'usg', 'sa', 'ei', 'sca_esv', 'gclid', 'fbclid', 'ocid', 'cmpid', 'ref', 'source'}
+
+
+class _ResultCollector(HTMLParser):
+    # Collects every <a> with its href, whether it wraps an <h3>, and the text of
+    # any role=heading div inside it that sits under div#rso
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []  # {'href', 'h3', 'heading'}
+        self._anchors = []  # open <a> entries
+        self._div_depth = 0
+        self._rso_depth = None  # div depth of div#rso while inside it
+        self._heading_depth = None  # div depth of the heading being read
+        self._heading = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            link = {'href': dict(attrs).get('href') or '', 'h3': False, 'heading': None}
+            self._anchors.append(link)
+            self.links.append(link)
+        elif tag == 'h3' and self._anchors:
+            self._anchors[-1]['h3'] = True
+        elif tag == 'div':
+            self._div_depth += 1
+            attrs = dict(attrs)
+            if attrs.get('id') == 'rso' and self._rso_depth is None:
+                self._rso_depth = self._div_depth
+            elif (attrs.get('role') == 'heading' and self._rso_depth is not None
+                  and self._anchors and self._heading is None):
+                self._heading_depth = self._div_depth
+                self._heading = []
+        elif tag == 'br' and self._heading is not None:
+            self._heading.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag == 'a' and self._anchors:
+            self._anchors.pop()
+        elif tag == 'div':
+            if self._heading is not None and self._div_depth == self._heading_depth:
+                if self._anchors:
+                    self._anchors[-1]['heading'] = ' '.join(''.join(self._heading).split())
+                self._heading = None
+                self._heading_depth = None
+            if self._rso_depth is not None and self._div_depth == self._rso_depth:
+                self._rso_depth = None
+            self._div_depth = max(0, self._div_depth - 1)
+
+    def handle_data(self, data):
+        if self._heading is not None:
+            self._heading.append(data)
+
+
+def _collect(html):
+    collector = _ResultCollector()
+    collector.feed(html)
+    collector.close()
+    return collector.links
+
+
+def _result_url(href):
+    # Script-free result pages wrap targets as /url?q=<target>&...
+    if href.startswith('/url?'):
+        query = parse_qs(urlsplit(href).query)
+        return (query.get('q') or query.get('url') or [''])[0]
+    return href
+
+
+def normalize_link(url):
+    # One spelling per article: unwrapped, lowercase host, no fragment, no
+    # tracking parameters, no trailing slash, so the same story compares equal
+    # from day to day whichever path fetched it
+    parts = urlsplit(_result_url(url or '').strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if k not in TRACKING_PARAMS and not k.startswith('utm_')]
+    path = parts.path.rstrip('/') if parts.path != '/' else parts.path
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+
+def first_result_link(html):
+    for link in _collect(html):
+        if link['h3'] and link['href']:
+            return _result_url(link['href'])
+    return None
+
+
+def news_results(html, limit=MAX_NEWS):
+    items = []
+    for link in _collect(html):
+        title = link['heading']
+        href = normalize_link(link['href'])
+        if not title or not href:
+            continue
+        if not any(item['link'] == href for item in items):
+            items.append({"headline": title, "link": href})
+        if len(items) >= limit:
+            break
+    return items
+
+
+if __name__ == "__main__":
+    with open(sys.argv[1], encoding='utf-8') as f:
+        html = f.read()
+    print(f"First result: {first_result_link(html)}")
+    for item in news_results(html):
+        print(f"News: {item['headline']} -> {item['link']}")
@@ -0,0 +1,209 @@
+import argparse
+import datetime
+import json
+import math
+import sys
+import numpy as np
+from db_writer import BatchWriter
+from history_store import HistoryStore, RemoteHistory, day_date
+import valuation
+
+# Builds the document /api/stats returns for every player, once per run instead
+# of once per page view, and stores it in players.stats_doc (jsonb). The route
+# then reads that one column by list_sr_no. Same keys as the route used to
+# assemble itself (overview, trends, stats, info, form), from real data:
+#
+#   overview   0-100 roster percentiles: batting average and wickets per innings
+#              over recent form, caps (Experience), low volatility (Consistency),
+#              momentum and price (Value)
+#   trends     the last TREND_DAYS daily prices from the history store, each next
+#              to that day's roster median; just today's price for a player the
+#              history has not seen, and the stored trends kept when it holds nothing
+#   stats      matches (all caps), then innings, runs, not outs and wickets over recent form
+#   info       the profile fields, news and IPL status, formatted as before
+#   form       the raw batting_form / bowling_form strings the FORM chart parses
+#
+# The route reads info and form from the live columns next to stats_doc, so
+# uploads and form or news scrapes show up before the next materialize; the
+# document's copies are for --show. Runs after valuation in the daily workflow.
+#
+#   python scraper/stats_docs.py             # materialize every player
+#   python scraper/stats_docs.py --show 12   # print one player's document, write nothing
+
+TREND_DAYS = 10
+
+DOC_COLUMNS = ('list_sr_no, age, specialism, batting_style, bowling_style, news, cua, team_2025, '
+               'reserve_price, test_caps, odi_caps, t20_caps, ipl, '
+               'batting_form, bowling_form, batting_runs, batting_not_out, bowling_wickets, bowling_runs, '
+               'price, momentum, volatility')
+
+
+def _percentile_scores(values, valid):
+    # 0-100 share of the valid players at or below each value; 0 for invalid ones
+    scores = np.zeros(len(values))
+    if valid.any():
+        ranked = np.sort(values[valid])
+        scores[valid] = 100 * np.searchsorted(ranked, values[valid], side='right') / len(ranked)
+    return np.round(scores).astype(int)
+
+
+def _number(value):
+    # JSON has no NaN
+    return None if value is None or (isinstance(value, float) and math.isnan(value)) else value
+
+
+def _trends(rows, history, today, previous=None):
+    # pid -> [{match, value, average}] over the last TREND_DAYS days of history,
+    # or just today's price for players the history has not seen yet. With no
+    # history at all (an empty cache and bucket), previous (pid -> trends) wins
+    prices = valuation.numeric_column(rows, 'price')
+    median = round(float(np.nanmedian(prices)), 2) if not np.isnan(prices).all() else None
+    label = today.strftime('%b %d')
+    trends = {row['list_sr_no']: [{'match': label, 'value': row['price'], 'average': median}]
+              for row in rows if row.get('price') is not None}
+
+    found = history.query(start=today - datetime.timedelta(days=TREND_DAYS * 3)) if history else []
+    if not len(found):
+        return {**trends, **(previous or {})}
+    medians = {}
+    for day in np.unique(found['day']):
+        day_prices = found['price'][found['day'] == day]
+        medians[int(day)] = round(float(np.nanmedian(day_prices)), 2) if not np.isnan(day_prices).all() else None
+
+    pids, starts = np.unique(found['list_sr_no'], return_index=True)
+    ends = list(starts[1:]) + [len(found)]
+    for pid, start, end in zip(pids.tolist(), starts, ends):
+        trends[pid] = [{'match': day_date(snap['day']).strftime('%b %d'),
+                        'value': _number(round(float(snap['price']), 2)),
+                        'average': medians[int(snap['day'])]} for snap in found[start:end][-TREND_DAYS:]]
+    return trends
+
+
+def build_documents(rows, history=None, today=None, previous=None):
+    # list_sr_no -> stats document, for every row at once
+    today = today or datetime.date.today()
+    bat_runs, not_out, wickets, conceded = valuation.typed_lists(rows)
+    runs, bat_mask = valuation.form_matrix(bat_runs)
+    flags, _ = valuation.form_matrix(not_out)
+    wkts, bowl_mask = valuation.form_matrix(wickets)
+
+    innings = bat_mask.sum(axis=1)
+    total_runs = (runs * bat_mask).sum(axis=1)
+    not_outs = (flags * bat_mask).sum(axis=1)
+    outs = innings - not_outs
+    average = np.divide(total_runs, outs, out=total_runs.astype(float), where=outs > 0)
+    bowled = bowl_mask.sum(axis=1)
+    total_wickets = (wkts * bowl_mask).sum(axis=1)
+    strike = np.divide(total_wickets, bowled, out=np.zeros(len(rows)), where=bowled > 0)
+
+    caps = sum(weight * np.nan_to_num(valuation.numeric_column(rows, col))
+               for col, weight in valuation.CAP_WEIGHTS.items())
+    price = valuation.numeric_column(rows, 'price')
+    momentum = valuation.numeric_column(rows, 'momentum')
+    volatility = valuation.numeric_column(rows, 'volatility')
+    steady = (innings + bowled > 1) & ~np.isnan(volatility)
+
+    overview = {
+        'Batting': _percentile_scores(average, innings > 0),
+        'Bowling': _percentile_scores(strike, bowled > 0),
+        'Experience': _percentile_scores(caps, caps > 0),
+        'Consistency': _percentile_scores(-np.nan_to_num(volatility), steady),
+        'Momentum': _percentile_scores(np.nan_to_num(momentum), steady),
+        'Value': _percentile_scores(np.nan_to_num(price), ~np.isnan(price)),
+    }
+    trends = _trends(rows, history, today, previous)
+
+    documents = {}
+    for i, row in enumerate(rows):
+        matches = sum(row.get(col) or 0 for col in ('test_caps', 'odi_caps', 't20_caps', 'ipl'))
+        documents[row['list_sr_no']] = {
+            'overview': [{'subject': subject, 'A': int(scores[i]), 'fullMark': 100} for subject, scores in overview.items()],
+            'trends': trends.get(row['list_sr_no'], []),
+            'stats': [
+                {'name': 'Matches', 'value': matches},
+                {'name': 'Innings', 'value': int(innings[i])},
+                {'name': 'Runs', 'value': int(total_runs[i])},
+                {'name': 'Not Outs', 'value': int(not_outs[i])},
+                {'name': 'Wickets', 'value': int(total_wickets[i])},
+            ],
+            'info': {
+                'age': row.get('age'),
+                'specialism': row.get('specialism'),
+                'batting_style': row.get('batting_style'),
+                'bowling_style': row.get('bowling_style'),
+                'news': row.get('news') or [],
+                'caps': {
+                    'test': row.get('test_caps') or 0,
+                    'odi': row.get('odi_caps') or 0,
+                    't20': row.get('t20_caps') or 0,
+                },
+                'ipl': {
+                    'team_2025': row.get('team_2025') or 'DNP',
+                    'status_2025': 'AUCTION',
+                    'cua_status': row.get('cua'),
+                    'reserve_price': f"₹{row['reserve_price']} Lakh" if row.get('reserve_price') else 'N/A',
+                },
+            },
+            'form': {
+                'batting': row.get('batting_form'),
+                'bowling': row.get('bowling_form'),
+            },
+            'valuation': {
+                'price': _number(row.get('price')),
+                'momentum': _number(row.get('momentum')),
+                'volatility': _number(row.get('volatility')),
+            },
+        }
+    return documents
+
+
+def recent_history(supabase, today=None):
+    # The local history store, with the partitions the trends read pulled from storage
+    store = HistoryStore()
+    RemoteHistory(supabase).pull(store, since=(today or datetime.date.today()) - datetime.timedelta(days=TREND_DAYS * 3))
+    return store
+
+
+def _stored_trends(supabase):
+    # pid -> the trends in the current stats documents
+    rows = valuation.load_roster(supabase, 'list_sr_no, trends:stats_doc->trends')
+    return {row['list_sr_no']: row['trends'] for row in rows if len(row.get('trends') or []) > 1}
+
+
+def materialize(supabase, history=None):
+    rows = valuation.load_roster(supabase, DOC_COLUMNS)
+    history = history if history is not None else recent_history(supabase)
+    previous = None
+    if not len(history.query(start=datetime.date.today() - datetime.timedelta(days=TREND_DAYS * 3))):
+        # Never replace real trends with a single point because this machine has no history
+        print("No price history found; keeping the stored trends.")
+        previous = _stored_trends(supabase)
+    documents = build_documents(rows, history, previous=previous)
+    with BatchWriter(supabase) as writer:
+        for pid, document in documents.items():
+            writer.put(pid, {'stats_doc': document})
+    if writer.failures:
+        # Players left with a stale or missing document; fail the job so it is rerun
+        print(f"Stats documents failed for {len(writer.failures)} of {len(documents)} players.")
+        sys.exit(1)
+    print(f"Materialized stats documents for {len(documents)} players.")
+    return documents
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the /api/stats document for every player.")
+    parser.add_argument('--show', type=int, metavar='LIST_SR_NO', help="Print one player's document instead of writing")
+    args = parser.parse_args(argv)
+
+    from config import get_client
+    supabase = get_client()
+    if args.show is None:
+        materialize(supabase)
+        return
+    rows = valuation.load_roster(supabase, DOC_COLUMNS)
+    document = build_documents(rows, recent_history(supabase)).get(args.show)
+    print(json.dumps(document, indent=2, ensure_ascii=False) if document else f"No player {args.show}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+# HTTP statuses and PostgREST codes worth retrying; anything else
+# (constraint violations, bad columns, auth) will fail the same way again
+TRANSIENT_CODES = {'408', '429', '500', '502', '503', '504', '520', 'PGRST000', 'PGRST001', 'PGRST002', 'PGRST003'}
+
+
+def is_transient(error):
+    if isinstance(error, APIError):
+        return str(error.code) in TRANSIENT_CODES
+    # Timeouts, refused or dropped connections (httpx.TimeoutException is one too).
+    # Anything else is a bug (a bad row, an unserialisable value) and fails at once.
+    return isinstance(error, httpx.TransportError)
+
+
+def is_too_large(error):
+    return isinstance(error, APIError) and str(error.code) == '413'
+
+
+def iter_chunks(records, max_rows, max_bytes):
+    # Split records into chunks bounded by row count and encoded JSON size,
+    # so wide rows (long news arrays, etc.) get smaller chunks automatically
+    chunk = []
+    size = 2  # the enclosing []
+    for record in records:
+        record_size = len(json.dumps(record, default=str)) + 1
+        if chunk and (len(chunk) >= max_rows or size + record_size > max_bytes):
+            yield chunk
+            chunk = []
+            size = 2
+        chunk.append(record)
+        size += record_size
+    if chunk:
+        yield chunk
+
+
+class ChunkUploader:
+    # Concurrent bulk upserter.
+    # submit() splits records into chunks and hands them to a thread pool with
+    # at most max_in_flight requests running; submit blocks once a few more
+    # chunks than that are queued, so a streaming producer stays bounded.
+    # Failed chunks are retried with exponential backoff (transient errors
+    # only), and a chunk rejected as too large is split in half.
+
+    def __init__(self, client, table='players', on_conflict='', max_in_flight=4, max_rows=500,
+                 max_bytes=256 * 1024, retries=5, backoff=0.5, max_backoff=30.0):
+        self.client = client
+        self.table = table
+        self.on_conflict = on_conflict
+        self.max_in_flight = max_in_flight
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.rows_sent = 0
+        self.chunks_sent = 0
+        self.retried = 0
+        self.failed = []  # (records, error message)
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_in_flight * 2)
+        self._pool = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='uploader')
+        self._started = time.perf_counter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def submit(self, records):
+        for chunk in iter_chunks(records, self.max_rows, self.max_bytes):
+            self._slots.acquire()
+            future = self._pool.submit(self._send, chunk)
+            future.add_done_callback(lambda _: self._slots.release())
+
+    def close(self):
+        self._pool.shutdown(wait=True)
+        self.report()
+        return self.failed
+
+    def failed_records(self):
+        return [record for chunk, _ in self.failed for record in chunk]
+
+    def report(self):
+        elapsed = time.perf_counter() - self._started
+        rate = self.rows_sent / elapsed if elapsed > 0 else 0.0
+        failed_rows = sum(len(chunk) for chunk, _ in self.failed)
+        print(f"Uploaded {self.rows_sent} rows in {self.chunks_sent} chunks over {elapsed:.1f}s "
+              f"({rate:.0f} rows/s, {self.max_in_flight} in flight, {self.retried} retries, {failed_rows} rows failed).")
+        for chunk, err in self.failed:
+            print(f"  Failed chunk of {len(chunk)} rows: {err}")
+
+    def _send(self, chunk):
+        attempt = 0
+        while True:
+            try:
+                self.client.table(self.table).upsert(chunk, on_conflict=self.on_conflict, returning=ReturnMethod.minimal).execute()
+                with self._lock:
+                    self.rows_sent += len(chunk)
+                    self.chunks_sent += 1
+                return
+            except Exception as e:
+                if is_too_large(e) and len(chunk) > 1:
+                    half = len(chunk) // 2
+                    self._send(chunk[:half])
+                    self._send(chunk[half:])
+                    return
+                if attempt >= self.retries or not is_transient(e):
+                    with self._lock:
+                        self.failed.append((chunk, str(e)))
+                    return
+
+                # Jitter keeps parallel retries from hitting the server in lockstep
+                delay = min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                attempt += 1
+                with self._lock:
+                    self.retried += 1
+                time.sleep(delay)
@@ -0,0 +1,239 @@
+import argparse
+import sys
+import time
+import numpy as np
+from form_records import parse_batting, parse_bowling
+from matches_table import MAX_SCORES
+import history_store
+from roster import iter_roster, iter_csv_roster, CSV_PATH
+
+# Prices every player as a stock from their recent form, their caps and their
+# auction reserve price, for the whole roster at once. Form is packed into
+# (players x MAX_SCORES) NumPy arrays, most recent innings first, and every
+# figure below is a column operation over them; no per-player Python math.
+#
+#   points      two series, each innings floored at 0: batting is runs + NOT_OUT_BONUS
+#               if not out; bowling is WICKET_POINTS per wicket + (CONCEDED_PAR - runs
+#               conceded) * CONCEDED_WEIGHT. DNB and '-' innings are dropped from their
+#               own series, so position i of one is not the same match as position i of
+#               the other: each series is summarised on its own and the summaries added
+#   price       reserve price (Lakh) * form_index ** FORM_ELASTICITY * experience, where
+#               form_index is the recency-weighted batting plus bowling points over the
+#               roster median and experience grows with log caps (IPL caps weighted up)
+#   momentum    mean points of each series' last RECENT_INNINGS over the mean of its ones
+#               before, added over the series that have both, minus 1 (0.25 = scoring
+#               25% more lately); 0 without enough innings
+#   volatility  standard deviation of batting plus bowling points (the two series taken
+#               as independent) over their mean; 0 under two innings in both series
+#
+# Results go back as chunked upserts of price, momentum, volatility and valued_at,
+# and the day's snapshot of every player is added to the history store (synced
+# with its storage bucket).
+#
+#   python scraper/valuation.py              # value everyone and write
+#   python scraper/valuation.py --no-write   # print the top of the table, write nothing
+#   python scraper/valuation.py --dry-run    # same from the roster CSV (caps and reserve
+#                                            # price only, no form), without the network
+
+FORM_WINDOW = MAX_SCORES
+RECENCY_DECAY = 0.85
+RECENT_INNINGS = 3
+
+NOT_OUT_BONUS = 10
+WICKET_POINTS = 25
+CONCEDED_PAR = 30
+CONCEDED_WEIGHT = 0.5
+
+FORM_ELASTICITY = 0.5
+FORM_INDEX_RANGE = (0.25, 4.0)
+EXPERIENCE_WEIGHT = 0.5
+CAP_WEIGHTS = {'test_caps': 1.0, 'odi_caps': 1.0, 't20_caps': 1.0, 'ipl': 1.5}
+# Lakh; the lowest slab, used when a reserve price is missing or unreadable
+MIN_RESERVE = 30.0
+
+ROSTER_COLUMNS = ('list_sr_no, reserve_price, test_caps, odi_caps, t20_caps, ipl, '
+                  'batting_form, bowling_form, batting_runs, batting_not_out, bowling_wickets, bowling_runs, news')
+
+
+def load_roster(supabase, columns=ROSTER_COLUMNS):
+    return list(iter_roster(supabase, columns))
+
+
+def typed_lists(rows):
+    # Typed form per player, parsing the raw strings only for rows scraped before
+    # the typed columns existed
+    bat_runs, not_out, wickets, conceded = [], [], [], []
+    for row in rows:
+        if row.get('batting_runs') is None:
+            runs, flags = parse_batting(row.get('batting_form'))
+        else:
+            runs, flags = row['batting_runs'], row.get('batting_not_out') or []
+        if row.get('bowling_wickets') is None:
+            wkts, given = parse_bowling(row.get('bowling_form'))
+        else:
+            wkts, given = row['bowling_wickets'], row.get('bowling_runs') or []
+        bat_runs.append(runs)
+        not_out.append(flags)
+        wickets.append(wkts)
+        conceded.append(given)
+    return bat_runs, not_out, wickets, conceded
+
+
+def form_matrix(arrays, width=FORM_WINDOW):
+    # Ragged lists -> (len(arrays), width) float matrix, left-aligned, plus its fill mask
+    lengths = np.fromiter((min(len(a), width) for a in arrays), dtype=np.int64, count=len(arrays))
+    values = np.zeros((len(arrays), width))
+    mask = np.zeros((len(arrays), width), dtype=bool)
+    total = int(lengths.sum())
+    if total:
+        flat = np.fromiter((v for a in arrays for v in a[:width]), dtype=np.float64, count=total)
+        rows = np.repeat(np.arange(len(arrays)), lengths)
+        cols = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        values[rows, cols] = flat
+        mask[rows, cols] = True
+    return values, mask
+
+
+def _masked_mean(values, mask, weights=None):
+    w = mask if weights is None else mask * weights
+    total = w.sum(axis=1)
+    return np.divide((values * w).sum(axis=1), total, out=np.zeros(len(values)), where=total > 0), total
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def numeric_column(rows, name):
+    # Anything unparseable (None, '', 'TBD') -> NaN
+    return np.fromiter((_number(row.get(name)) for row in rows), dtype=np.float64, count=len(rows))
+
+
+def innings_points(bat_runs, not_out, wickets, conceded):
+    # [(points, mask)] for the batting and the bowling series, each (players x innings)
+    runs, bat_mask = form_matrix(bat_runs)
+    flags, _ = form_matrix(not_out)
+    wkts, bowl_mask = form_matrix(wickets)
+    given, _ = form_matrix(conceded)
+
+    batting = np.where(bat_mask, np.maximum(runs + NOT_OUT_BONUS * flags, 0.0), 0.0)
+    bowling = np.where(bowl_mask, np.maximum(WICKET_POINTS * wkts + (CONCEDED_PAR - given) * CONCEDED_WEIGHT, 0.0), 0.0)
+    return [(batting, bat_mask), (bowling, bowl_mask)]
+
+
+def value(series, reserve, caps):
+    # price, momentum, volatility for every player from the [(points, mask)] series
+    players = len(reserve)
+    recency = RECENCY_DECAY ** np.arange(FORM_WINDOW)
+    form = np.zeros(players)
+    mean = np.zeros(players)
+    variance = np.zeros(players)
+    recent = np.zeros(players)
+    older = np.zeros(players)
+    played = np.zeros(players, dtype=np.int64)
+    spread_known = np.zeros(players, dtype=bool)
+    for points, mask in series:
+        weighted, _ = _masked_mean(points, mask, recency[:points.shape[1]])
+        form += weighted
+        series_mean, count = _masked_mean(points, mask)
+        mean += series_mean
+        variance += _masked_mean((points - series_mean[:, None]) ** 2, mask)[0]
+        played += count.astype(np.int64)
+        spread_known |= count > 1
+
+        recent_mask = mask.copy()
+        recent_mask[:, RECENT_INNINGS:] = False
+        series_recent, recent_n = _masked_mean(points, recent_mask)
+        series_older, older_n = _masked_mean(points, mask & ~recent_mask)
+        both = (recent_n > 0) & (older_n > 0)
+        recent += np.where(both, series_recent, 0.0)
+        older += np.where(both, series_older, 0.0)
+
+    has_form = played > 0
+    median = np.median(form[has_form]) if has_form.any() else 0.0
+    form_index = np.ones(players)
+    if median > 0:
+        form_index[has_form] = np.clip(form[has_form] / median, *FORM_INDEX_RANGE)
+
+    experience = np.log1p(caps)
+    if experience.max(initial=0.0) > 0:
+        experience /= experience.max()
+    price = reserve * form_index ** FORM_ELASTICITY * (1 + EXPERIENCE_WEIGHT * experience)
+
+    momentum = np.divide(recent, older, out=np.ones(players), where=older > 0) - 1
+    volatility = np.divide(np.sqrt(variance), mean, out=np.zeros(players), where=spread_known & (mean > 0))
+
+    return price, momentum, volatility
+
+
+def valuate(rows):
+    # One result row per player: list_sr_no, price, momentum, volatility
+    series = innings_points(*typed_lists(rows))
+
+    reserve = numeric_column(rows, 'reserve_price')
+    reserve = np.where(np.isnan(reserve) | (reserve <= 0), MIN_RESERVE, reserve)
+    caps = sum(weight * np.nan_to_num(numeric_column(rows, col)) for col, weight in CAP_WEIGHTS.items())
+
+    price, momentum, volatility = value(series, reserve, caps)
+    return [
+        {'list_sr_no': pid, 'price': p, 'momentum': m, 'volatility': v}
+        for pid, p, m, v in zip([row['list_sr_no'] for row in rows],
+                                np.round(price, 2).tolist(), np.round(momentum, 4).tolist(),
+                                np.round(volatility, 4).tolist())
+    ]
+
+
+def write(supabase, results):
+    # Chunked upserts with retries on transient errors; returns the rows that still failed
+    from uploader import ChunkUploader
+    valued_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    with ChunkUploader(supabase, 'players', on_conflict='list_sr_no') as uploader:
+        uploader.submit({**result, 'valued_at': valued_at} for result in results)
+    return uploader.failed_records()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Price every player from form, caps and reserve price.")
+    parser.add_argument('--no-write', action='store_true', help="Print the valuations instead of writing them")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Value the roster CSV (no form) and print it; no network, nothing written")
+    parser.add_argument('--csv', default=CSV_PATH, help="Roster CSV read by --dry-run")
+    parser.add_argument('--no-history', action='store_true', help="Do not add today's snapshot to the history store")
+    parser.add_argument('--top', type=int, default=10, help="Players to show, by price")
+    args = parser.parse_args(argv)
+    write_results = not (args.dry_run or args.no_write)
+
+    started = time.perf_counter()
+    if args.dry_run:
+        rows = list(iter_csv_roster(args.csv, ROSTER_COLUMNS))
+    else:
+        from config import get_client
+        supabase = get_client()
+        rows = load_roster(supabase)
+    loaded = time.perf_counter()
+    results = valuate(rows)
+    valued = time.perf_counter()
+    failed = []
+    if write_results:
+        failed = write(supabase, results)
+    written = time.perf_counter()
+    if write_results and not args.no_history:
+        history_store.record_day([{**row, **result} for row, result in zip(rows, results)],
+                                 remote=history_store.RemoteHistory(supabase))
+
+    print(f"Valued {len(results)} players: load {loaded - started:.2f}s, "
+          f"compute {valued - loaded:.3f}s, write {written - valued:.2f}s.")
+    for result in sorted(results, key=lambda r: -r['price'])[:args.top]:
+        print(f"  {result['list_sr_no']:>5}  price {result['price']:>8.2f}  "
+              f"momentum {result['momentum']:>+7.2%}  volatility {result['volatility']:.2f}")
+    if failed:
+        # Those players keep yesterday's price; fail the job so stats is not built on it
+        print(f"Valuations failed to write for {len(failed)} of {len(results)} players.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
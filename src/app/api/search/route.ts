@@ -1,5 +1,67 @@
 import { NextResponse } from 'next/server';
-import { supabase } from '@/lib/supabase';
+import searchIndex from '@/data/search_index.json';
+
+// Prebuilt by upload_players.py (scraper/search_index.py): players most popular first
+// (with their name keys longer than max_prefix), prefix -> ranked player positions,
+// trigram -> ranked player positions
+type SearchIndex = {
+    max_prefix: number;
+    players: [number, string | null, string | null, string | null, string[]][];
+    prefixes: Record<string, number[]>;
+    trigrams: Record<string, number[]>;
+};
+
+const index = searchIndex as unknown as SearchIndex;
+const RESULT_LIMIT = 10;
+
+// Same normalization as search_index.normalize: accents stripped, lowercase, punctuation to spaces
+function normalize(text: string): string {
+    return text
+        .normalize('NFKD')
+        .replace(/\p{M}/gu, '')
+        .toLowerCase()
+        .replace(/[^a-z0-9]+/g, ' ')
+        .trim();
+}
+
+function trigrams(text: string): Set<string> {
+    const padded = ` ${text} `;
+    const grams = new Set<string>();
+    for (let i = 0; i < padded.length - 2; i++) {
+        grams.add(padded.slice(i, i + 3));
+    }
+    return grams;
+}
+
+function search(term: string): number[] {
+    const query = normalize(term);
+    if (!query) return [];
+
+    const byPrefix = index.prefixes[query.slice(0, index.max_prefix)];
+    if (byPrefix && query.length > index.max_prefix) {
+        // The prefix map only saw the first max_prefix characters; check the rest.
+        // Names that start like the query but do not contain all of it are no match.
+        return byPrefix
+            .filter(pos => index.players[pos][4].some(key => key.startsWith(query)))
+            .slice(0, RESULT_LIMIT);
+    }
+    if (byPrefix) return byPrefix.slice(0, RESULT_LIMIT);
+
+    // No prefix match (typo or infix): players sharing at least half the query's trigrams
+    const grams = trigrams(query);
+    const votes = new Map<number, number>();
+    grams.forEach(gram => {
+        for (const pos of index.trigrams[gram] || []) {
+            votes.set(pos, (votes.get(pos) || 0) + 1);
+        }
+    });
+    const needed = Math.max(1, Math.floor(grams.size / 2));
+    return Array.from(votes.entries())
+        .filter(([, n]) => n >= needed)
+        .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+        .slice(0, RESULT_LIMIT)
+        .map(([pos]) => pos);
+}
 
 export async function GET(request: Request) {
     const { searchParams } = new URL(request.url);
@@ -9,32 +71,10 @@ export async function GET(request: Request) {
         return NextResponse.json({ error: 'Missing or invalid term parameter' }, { status: 400 });
     }
 
-    if (!supabase) {
-        return NextResponse.json({ error: 'Supabase client not initialized' }, { status: 500 });
-    }
+    const results = search(term).map(pos => {
+        const [id, name, team, country] = index.players[pos];
+        return { id, name, team, country };
+    });
 
-    try {
-        const { data, error } = await supabase
-            .from('players')
-            .select('list_sr_no, name, country, team_2025')
-            .ilike('name', `%${term}%`)
-            .limit(10);
-
-        if (error) {
-            console.error('Supabase error:', error);
-            return NextResponse.json({ error: error.message }, { status: 500 });
-        }
-
-        const results = data?.map((player: any) => ({
-            id: player.list_sr_no,
-            name: player.name,
-            team: player.team_2025,
-            country: player.country,
-        })) || [];
-
-        return NextResponse.json({ results });
-    } catch (err) {
-        console.error('Unexpected error:', err);
-        return NextResponse.json({ error: 'Internal Server Error' }, { status: 500 });
-    }
+    return NextResponse.json({ results });
 }
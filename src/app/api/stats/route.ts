@@ -14,7 +14,12 @@ export async function GET(request: Request) {
         return NextResponse.json({ error: 'Supabase client not initialized' }, { status: 500 });
     }
 
-    let dbQuery = supabase.from('players').select('*');
+    // Overview, trends and stats are precomputed by scraper/stats_docs.py into stats_doc. Info and
+    // form come from the live columns beside it, so uploads and form or news scrapes show at once.
+    let dbQuery = supabase.from('players').select(
+        'list_sr_no, stats_doc, age, specialism, batting_style, bowling_style, news, test_caps, odi_caps, ' +
+        't20_caps, ipl, team_2025, cua, reserve_price, batting_form, bowling_form'
+    );
     if (id) {
         dbQuery = dbQuery.eq('list_sr_no', id);
     } else if (name) {
@@ -27,57 +32,41 @@ export async function GET(request: Request) {
         return NextResponse.json({ error: 'Player not found' }, { status: 404 });
     }
 
-    // Mock Data Generator for Graphs (preserving existing visualization logic)
-    const seed = player.list_sr_no || 12345;
-    const rand = (min: number, max: number) => {
-        const x = Math.sin(seed + min + max) * 10000;
-        return Math.floor((x - Math.floor(x)) * (max - min + 1)) + min;
-    };
-
-    const mockData = {
-        overview: [
-            { subject: 'Batting', A: rand(60, 95), fullMark: 100 },
-            { subject: 'Bowling', A: rand(40, 90), fullMark: 100 },
-            { subject: 'Fielding', A: rand(50, 99), fullMark: 100 },
-            { subject: 'Fitness', A: rand(70, 95), fullMark: 100 },
-            { subject: 'Experience', A: rand(30, 100), fullMark: 100 },
-            { subject: 'Consistency', A: rand(50, 90), fullMark: 100 },
-        ],
-        trends: Array.from({ length: 10 }).map((_, i) => ({
-            match: `M${i + 1}`,
-            value: rand(10, 100),
-            average: 50 + rand(-5, 5)
-        })),
+    // Not materialized yet (a player added since the last run): the live parts, no charts
+    const doc = player.stats_doc || {
+        overview: [],
+        trends: [],
         stats: [
             { name: 'Matches', value: (player.test_caps || 0) + (player.odi_caps || 0) + (player.t20_caps || 0) + (player.ipl || 0) },
-            { name: 'Runs', value: rand(1000, 5000) }, // Runs not in CSV
-            { name: 'Wickets', value: rand(10, 150) }, // Wickets not in CSV
-            { name: 'Catches', value: rand(20, 100) },
-            { name: 'Stumpings', value: rand(0, 20) },
         ],
-        info: {
-            age: player.age,
-            specialism: player.specialism,
-            batting_style: player.batting_style,
-            bowling_style: player.bowling_style,
-            news: player.news || [],
-            caps: {
-                test: player.test_caps || 0,
-                odi: player.odi_caps || 0,
-                t20: player.t20_caps || 0
+        valuation: null,
+    };
+
+    return NextResponse.json({
+        data: {
+            ...doc,
+            info: {
+                age: player.age,
+                specialism: player.specialism,
+                batting_style: player.batting_style,
+                bowling_style: player.bowling_style,
+                news: player.news || [],
+                caps: {
+                    test: player.test_caps || 0,
+                    odi: player.odi_caps || 0,
+                    t20: player.t20_caps || 0
+                },
+                ipl: {
+                    team_2025: player.team_2025 || 'DNP',
+                    status_2025: 'AUCTION',
+                    cua_status: player.cua,
+                    reserve_price: player.reserve_price ? `₹${player.reserve_price} Lakh` : 'N/A'
+                }
             },
-            ipl: {
-                team_2025: player.team_2025 || 'DNP',
-                status_2025: 'AUCTION',
-                cua_status: player.cua,
-                reserve_price: player.reserve_price ? `₹${player.reserve_price} Lakh` : 'N/A'
+            form: {
+                batting: player.batting_form,
+                bowling: player.bowling_form
             }
-        },
-        form: {
-            batting: player.batting_form,
-            bowling: player.bowling_form
         }
-    };
-
-    return NextResponse.json({ data: mockData });
+    });
 }
@@ -0,0 +1,8 @@
+-- Typed form arrays, written next to the raw batting_form / bowling_form strings
+-- (scraper/form_records.py). One entry per innings actually played; the two
+-- batting arrays are aligned with each other, as are the two bowling arrays.
+alter table players
+    add column if not exists batting_runs integer[],
+    add column if not exists batting_not_out smallint[],
+    add column if not exists bowling_wickets smallint[],
+    add column if not exists bowling_runs integer[];
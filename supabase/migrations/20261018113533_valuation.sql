@@ -0,0 +1,6 @@
+-- Written by scraper/valuation.py in one bulk upsert per run
+alter table players
+    add column if not exists price double precision,
+    add column if not exists momentum double precision,
+    add column if not exists volatility double precision,
+    add column if not exists valued_at timestamptz;
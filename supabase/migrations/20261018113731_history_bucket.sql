@@ -0,0 +1,6 @@
+-- Durable copy of scraper/.history (history_store.RemoteHistory): one private
+-- bucket holding daily/YYYY-MM-DD.npy and monthly/YYYY-MM.npy. The pipeline
+-- writes with the service role key, which bypasses storage policies.
+insert into storage.buckets (id, name, public)
+values ('player-history', 'player-history', false)
+on conflict (id) do nothing;
@@ -0,0 +1,3 @@
+-- The precomputed /api/stats document, written by scraper/stats_docs.py
+alter table players
+    add column if not exists stats_doc jsonb;
@@ -1,88 +1,220 @@
 import os
+import sys
+import argparse
+import hashlib
+import json
+import numpy as np
 import pandas as pd
-from supabase import create_client, Client
-from dotenv import load_dotenv
 
-# Load environment variables from .env.local
-load_dotenv('.env.local')
+# Shared pipeline modules live next to the scrapers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scraper'))
+from config import get_client
+from roster import CSV_COLUMNS
+import search_index
 
-url: str = os.environ.get("NEXT_PUBLIC_SUPABASE_URL") or os.environ.get("SUPABASE_PROJECT_URL")
-key: str = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY") or os.environ.get("SUPABASE_ANON_KEY")
-service_key: str = os.environ.get("SUPABASE_SERVICE_ROLE_KEY") # Ideally use service role for writes if RLS is on, but anon might work if policy allows or if just testing
+CSV_PATH = 'scraper/players.csv'
 
-if not url or not key:
-    print("Error: Supabase URL or Key not found in environment variables.")
-    exit(1)
+# Rows read from the CSV per pandas chunk; each chunk is cleaned and uploaded
+# before the next one is read, so memory stays flat for large auction lists
+CSV_CHUNK_ROWS = 5000
 
-# Use service key if available, else fall back to anon key (anon key might not have write permissions depending on policies)
-# Given the user context, we will try with the available key. If it fails, user might need to adjust policies.
-supabase: Client = create_client(url, service_key if service_key else key)
+# Upsert chunks are capped by rows and by encoded payload size, to avoid payload limits
+UPLOAD_CHUNK_SIZE = 100
+UPLOAD_CHUNK_BYTES = 256 * 1024
 
-def upload_players():
-    csv_path = 'scraper/players.csv'
+# Chunks uploading at the same time
+UPLOAD_CONCURRENCY = 4
+
+# Local record of what the last successful upload sent: list_sr_no -> record hash.
+# Used by --delta to skip rows whose content has not changed.
+MANIFEST_PATH = '.upload_manifest.json'
+
+def _int_column(col):
+    # Whole-column equivalent of int(float(val)): numeric coercion, truncation towards zero
+    nums = np.trunc(pd.to_numeric(col, errors='coerce'))
+    return nums.astype('Int64').astype(object).where(nums.notna(), None)
+
+
+def _text_column(col):
+    return col.astype(object).where(col.notna(), None)
+
+
+def _name_column(col):
+    return col.where(col.notna(), '').astype(str).str.strip().astype(object)
+
+
+def build_records(df):
+    # Clean one DataFrame of CSV rows into upload records using column operations only.
+    # Column layout and coercion rules are roster.CSV_COLUMNS; pandas renames the
+    # second 'Surname' header to 'Surname.1', so 'Surname' is the first one.
+    cleaners = {'int': _int_column, 'text': _text_column, 'name': _name_column}
+    columns = {db_col: cleaners[kind](df[csv_col]) for db_col, (csv_col, kind) in CSV_COLUMNS.items()}
+    columns["name"] = (columns["first_name"] + " " + columns["surname"]).str.strip().astype(object)
+
+    # Columns already hold plain Python values, so zip them straight into dicts
+    # (DataFrame.to_dict re-boxes every cell and costs more than the cleanup)
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*(col.tolist() for col in columns.values()))]
+
+
+def iter_record_batches(csv_path=CSV_PATH, chunk_rows=CSV_CHUNK_ROWS):
+    # Stream the CSV in chunks, yielding cleaned records as each chunk is ready
+    for df in pd.read_csv(csv_path, chunksize=chunk_rows):
+        yield build_records(df)
+
+
+def record_hash(record):
+    # Stable content hash of a normalized record (key order and whitespace independent)
+    payload = json.dumps(record, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    # Write to a temp file first so an interrupted run never leaves a truncated manifest
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def filter_changed(records, manifest, seen):
+    # Keep only records that are new or differ from the manifest.
+    # Every record's hash is stored in seen, which becomes the next manifest.
+    changed = []
+    for record in records:
+        pid = record["list_sr_no"]
+        if pid is None:
+            # No key to track it by, always send
+            changed.append(record)
+            continue
+        digest = record_hash(record)
+        seen[str(pid)] = digest
+        if manifest.get(str(pid)) != digest:
+            changed.append(record)
+    return changed
+
+
+def upload_players(csv_path=CSV_PATH, delta=False, prune=False, manifest_path=MANIFEST_PATH,
+                   concurrency=UPLOAD_CONCURRENCY, chunk_size=UPLOAD_CHUNK_SIZE, chunk_bytes=UPLOAD_CHUNK_BYTES, retries=5, index=True):
     if not os.path.exists(csv_path):
         print(f"Error: {csv_path} not found.")
         return
 
-    # Read CSV
-    df = pd.read_csv(csv_path)
-
-    # Helper to safely convert to int, handling NaNs and floats
-    def safe_int(val):
-        if pd.isna(val) or val == '':
-            return None
-        try:
-            return int(float(val))
-        except (ValueError, TypeError):
-            return None
-
-    # Clean and Prepare Data
-    records = []
-    for index, row in df.iterrows():
-        # Handle duplicate Surname column in CSV manually by picking indices or just letting pandas handle it (pandas usually suffixes duplicates)
-        # The CSV header has 'Surname' twice. Pandas usually renames the second one to 'Surname.1'.
-        
-        # Construct Name
-        first_name = str(row['First Name']).strip() if pd.notna(row['First Name']) else ''
-        surname = str(row['Surname']).strip() if pd.notna(row['Surname']) else ''
-        name = f"{first_name} {surname}".strip()
-
-        record = {
-            "list_sr_no": safe_int(row['List Sr. No.']),
-            "set_no": safe_int(row['Set No.']),
-            "set_2026": row['2026 Set'] if pd.notna(row['2026 Set']) else None,
-            "first_name": first_name,
-            "surname": surname,
-            "country": row['Country'] if pd.notna(row['Country']) else None,
-            "state_assoc": row['State Assoc'] if pd.notna(row['State Assoc']) else None,
-            "dob": row['DOB'] if pd.notna(row['DOB']) else None,
-            "age": safe_int(row['Age']),
-            "specialism": row['Specialism'] if pd.notna(row['Specialism']) else None,
-            "batting_style": row['Batting Style'] if pd.notna(row['Batting Style']) else None,
-            "bowling_style": row['Bowling Style'] if pd.notna(row['Bowling Style']) else None,
-            "test_caps": safe_int(row['Test caps']),
-            "odi_caps": safe_int(row['ODI caps']),
-            "t20_caps": safe_int(row['T20 caps']),
-            "ipl": safe_int(row['IPL']),
-            "team_2025": row['2025 Team'] if pd.notna(row['2025 Team']) else None,
-            "ipl_2025": safe_int(row['2025 IPL']),
-            "cua": row['C/U/A'] if pd.notna(row['C/U/A']) else None,
-            "reserve_price": row['Reserve Price'] if pd.notna(row['Reserve Price']) else None,
-            "name": name
-        }
-        records.append(record)
-
-    # Insert into Supabase
-    print(f"Uploading {len(records)} records to 'players' table...")
-    
-    # Upload in chunks to avoid payload limits
-    chunk_size = 100
-    for i in range(0, len(records), chunk_size):
-        chunk = records[i:i + chunk_size]
-        data, count = supabase.table('players').upsert(chunk).execute()
-        print(f"Uploaded batch {i // chunk_size + 1}")
-
-    print("Upload complete!")
+    # The client library (and postgrest) only load for a real upload
+    from uploader import ChunkUploader
+    supabase = get_client()
+
+    manifest = load_manifest(manifest_path) if delta else {}
+    if delta:
+        print(f"Delta mode: {len(manifest)} players in manifest {manifest_path}")
+
+    print(f"Uploading records from {csv_path} to 'players' table...")
+
+    total = 0
+    queued = 0
+    seen = {}
+    # Every player, changed or not, goes into the search index
+    index_rows = []
+    uploader = ChunkUploader(supabase, 'players', max_in_flight=concurrency, max_rows=chunk_size,
+                             max_bytes=chunk_bytes, retries=retries)
+    try:
+        for records in iter_record_batches(csv_path):
+            total += len(records)
+            if index:
+                index_rows.extend(records)
+            if delta:
+                records = filter_changed(records, manifest, seen)
+            queued += len(records)
+            uploader.submit(records)
+    finally:
+        uploader.close()
+
+    failed = uploader.failed_records()
+    sent = queued - len(failed)
+
+    if delta:
+        print(f"{queued} of {total} records were new or changed.")
+
+        # Players uploaded last time but no longer in the CSV
+        removed = sorted((pid for pid in manifest if pid not in seen), key=int)
+        if removed and prune:
+            for i in range(0, len(removed), UPLOAD_CHUNK_SIZE):
+                ids = [int(pid) for pid in removed[i:i + UPLOAD_CHUNK_SIZE]]
+                supabase.table('players').delete().in_('list_sr_no', ids).execute()
+            print(f"Deleted {len(removed)} players no longer in the CSV: {', '.join(removed)}")
+        elif removed:
+            print(f"{len(removed)} players are no longer in the CSV (use --prune to delete): {', '.join(removed)}")
+            # Still in the table, so keep tracking them for a later --prune
+            for pid in removed:
+                seen[pid] = manifest[pid]
+
+        # Rows that failed are left out of the manifest so the next delta run resends them
+        for record in failed:
+            seen.pop(str(record["list_sr_no"]), None)
+        save_manifest(seen, manifest_path)
+
+    if failed:
+        print(f"Upload finished with errors: {sent} records sent, {len(failed)} failed.")
+        exit(1)
+
+    print(f"Upload complete! {sent} records sent.")
+
+    if index:
+        search_index.write_index(search_index.build_index(index_rows))
+
+def preview_upload(csv_path=CSV_PATH, delta=False, manifest_path=MANIFEST_PATH):
+    # What upload_players would send, from the CSV and manifest alone: no client, nothing written
+    if not os.path.exists(csv_path):
+        print(f"Error: {csv_path} not found.")
+        return
+    manifest = load_manifest(manifest_path) if delta else {}
+    total = 0
+    queued = 0
+    seen = {}
+    for records in iter_record_batches(csv_path):
+        total += len(records)
+        queued += len(filter_changed(records, manifest, seen) if delta else records)
+    print(f"Dry run: {queued} of {total} records from {csv_path} would be sent.")
+    if delta:
+        removed = sum(1 for pid in manifest if pid not in seen)
+        print(f"{removed} players in {manifest_path} are no longer in the CSV.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Upload scraper/players.csv to the Supabase 'players' table.")
+    parser.add_argument('--csv', default=CSV_PATH, help="Roster CSV to upload")
+    parser.add_argument('--delta', action='store_true', help="Only send rows that are new or changed since the last upload")
+    parser.add_argument('--prune', action='store_true', help="With --delta, delete players that were removed from the CSV")
+    parser.add_argument('--manifest', default=MANIFEST_PATH, help="Manifest file used by --delta")
+    parser.add_argument('--concurrency', type=int, default=UPLOAD_CONCURRENCY, help="Chunks uploading at the same time")
+    parser.add_argument('--chunk-size', type=int, default=UPLOAD_CHUNK_SIZE, help="Maximum rows per upsert")
+    parser.add_argument('--chunk-bytes', type=int, default=UPLOAD_CHUNK_BYTES, help="Maximum JSON payload bytes per upsert")
+    parser.add_argument('--retries', type=int, default=5, help="Retries per failed chunk")
+    parser.add_argument('--no-index', action='store_true', help="Skip rebuilding the search index")
+    parser.add_argument('--index-only', action='store_true', help="Rebuild the search index from the CSV and upload nothing")
+    parser.add_argument('--dry-run', action='store_true', help="Report what would be sent, without connecting or writing anything")
+    args = parser.parse_args(argv)
+
+    if args.dry_run:
+        preview_upload(args.csv, delta=args.delta or args.prune, manifest_path=args.manifest)
+        return
+
+    if args.index_only:
+        records = [record for batch in iter_record_batches(args.csv) for record in batch]
+        search_index.write_index(search_index.build_index(records))
+        return
+
+    upload_players(args.csv, delta=args.delta or args.prune, prune=args.prune, manifest_path=args.manifest,
+                   concurrency=args.concurrency, chunk_size=args.chunk_size, chunk_bytes=args.chunk_bytes,
+                   retries=args.retries, index=not args.no_index)
+
 
 if __name__ == "__main__":
-    upload_players()
+    main()